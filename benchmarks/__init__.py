@@ -0,0 +1,3 @@
+"""
+Servidor GitLab simulado e benchmarks de desempenho da aplicação
+"""
\ No newline at end of file
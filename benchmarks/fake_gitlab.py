@@ -0,0 +1,493 @@
+"""
+Servidor HTTP local que simula a API do GitLab usada pelo GitLabAPI
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+class FakeGitLabDataset:
+    """
+    Dados em memória servidos pelo FakeGitLabServer
+    
+    Um único projeto com a quantidade de branches pedida, algumas delas protegidas,
+    mais projetos de preenchimento para a listagem de projetos. Cada branch aponta
+    para um commit próprio, então comparações entre branches distintas sempre têm
+    diferenças, e um merge faz o destino passar a apontar para o commit da origem.
+    """
+    
+    # ID do projeto com as branches
+    PROJECT_ID = 1
+    
+    # Padrões de branches protegidas
+    PROTECTED_PATTERNS = ('main', 'develop', 'release/*')
+    
+    def __init__(self, branch_count=100, project_count=50):
+        """
+        Gera o conjunto de dados
+        
+        Args:
+            branch_count (int): Quantidade de branches do projeto
+            project_count (int): Quantidade de projetos na listagem
+        """
+        self.lock = threading.Lock()
+        self.projects = [
+            {
+                'id': project_id,
+                'name': f'projeto-{project_id:05d}',
+                'path_with_namespace': f'grupo/projeto-{project_id:05d}',
+                'archived': False
+            }
+            for project_id in range(1, project_count + 1)
+        ]
+        
+        # Nomes agrupados por prefixo, como em projetos reais (feature/, bugfix/, ...)
+        prefixes = ('feature', 'bugfix', 'hotfix', 'release', 'chore')
+        names = ['main', 'develop']
+        for index in range(max(0, branch_count - len(names))):
+            names.append(f'{prefixes[index % len(prefixes)]}/tarefa-{index:06d}')
+            
+        # {nome: sha}
+        self.branches = {name: self._sha(name) for name in names}
+        
+        # {iid: dados do MR}
+        self.merge_requests = {}
+        self.next_iid = 1
+        
+        # Listagem ordenada e SHAs conhecidos, recalculados só após alterações
+        self._listing = None
+        self._known_shas = None
+        
+    def touch(self):
+        """
+        Descarta os dados derivados após uma alteração nas branches
+        """
+        self._listing = None
+        self._known_shas = None
+        
+    def listing(self):
+        """
+        Retorna o JSON de todas as branches, em ordem alfabética
+        
+        Returns:
+            list: Dados de cada branch
+        """
+        if self._listing is None:
+            self._listing = [self.branch_json(name) for name in sorted(self.branches)]
+        return self._listing
+        
+    def resolve(self, ref):
+        """
+        Converte um nome de branch ou SHA no SHA correspondente
+        
+        Args:
+            ref (str): Nome da branch ou SHA de um commit
+            
+        Returns:
+            str ou None: SHA do commit, ou None se a referência não existir
+        """
+        if ref in self.branches:
+            return self.branches[ref]
+        if self._known_shas is None:
+            self._known_shas = set(self.branches.values())
+        return ref if ref in self._known_shas else None
+        
+    @staticmethod
+    def _sha(seed):
+        """
+        Gera um SHA determinístico
+        
+        Returns:
+            str: SHA-1 em hexadecimal
+        """
+        return hashlib.sha1(seed.encode('utf-8')).hexdigest()
+        
+    def is_protected(self, name):
+        """
+        Verifica se uma branch é protegida
+        
+        Returns:
+            bool: True se o nome corresponde a algum padrão protegido
+        """
+        for pattern in self.PROTECTED_PATTERNS:
+            if pattern.endswith('*') and name.startswith(pattern[:-1]) or name == pattern:
+                return True
+        return False
+        
+    def branch_json(self, name):
+        """
+        Monta o JSON de uma branch no formato da API
+        
+        Returns:
+            dict: Dados da branch
+        """
+        return {
+            'name': name,
+            'protected': self.is_protected(name),
+            'merged': False,
+            'default': name == 'main',
+            'commit': {'id': self.branches[name], 'committed_date': '2024-01-01T00:00:00.000Z'}
+        }
+
+
+class FakeGitLabServer:
+    """
+    Servidor local com os endpoints usados pelo GitLabAPI
+    
+    Implementa usuário, versão, projetos, branches (com ETag/304 e cabeçalho Link),
+    branches protegidas, comparação, merge requests e merge. Cada requisição espera
+    a latência configurada antes de responder, e as respostas trazem cabeçalhos
+    RateLimit-* para que o controle de ritmo do cliente se comporte como em produção.
+    """
+    
+    def __init__(self, dataset=None, latency=0.0, host='127.0.0.1', port=0):
+        """
+        Inicializa o servidor (sem iniciá-lo)
+        
+        Args:
+            dataset (FakeGitLabDataset): Dados servidos (opcional, cria um padrão)
+            latency (float): Atraso, em segundos, aplicado a cada requisição
+            host (str): Endereço de escuta
+            port (int): Porta de escuta (0 escolhe uma porta livre)
+        """
+        self.dataset = dataset or FakeGitLabDataset()
+        self.latency = latency
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+        
+    @property
+    def url(self):
+        """
+        URL base do servidor
+        
+        Returns:
+            str: URL no formato http://host:porta
+        """
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+        
+    def start(self):
+        """
+        Inicia o servidor em uma thread própria
+        
+        Returns:
+            FakeGitLabServer: O próprio servidor
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        """
+        Encerra o servidor
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        
+    def __enter__(self):
+        return self.start()
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+        
+    def _handler_class(self):
+        """
+        Cria a classe de tratamento de requisições ligada a este servidor
+        
+        Returns:
+            type: Subclasse de BaseHTTPRequestHandler
+        """
+        server = self
+        
+        class Handler(_FakeGitLabHandler):
+            fake = server
+            
+        return Handler
+
+
+class _FakeGitLabHandler(BaseHTTPRequestHandler):
+    """
+    Tratamento das requisições do FakeGitLabServer
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    fake = None
+    
+    # Rotas: (método, expressão do caminho, nome do método de tratamento)
+    ROUTES = (
+        ('GET', r'/api/v4/user', '_get_user'),
+        ('GET', r'/api/v4/version', '_get_version'),
+        ('GET', r'/api/v4/projects', '_list_projects'),
+        ('GET', r'/api/v4/projects/(?P<project>[^/]+)', '_get_project'),
+        ('GET', r'/api/v4/projects/(?P<project>[^/]+)/repository/branches', '_list_branches'),
+        ('GET', r'/api/v4/projects/(?P<project>[^/]+)/repository/branches/(?P<branch>.+)', '_get_branch'),
+        ('DELETE', r'/api/v4/projects/(?P<project>[^/]+)/repository/branches/(?P<branch>.+)', '_delete_branch'),
+        ('GET', r'/api/v4/projects/(?P<project>[^/]+)/protected_branches', '_list_protected_branches'),
+        ('GET', r'/api/v4/projects/(?P<project>[^/]+)/repository/compare', '_compare'),
+        ('GET', r'/api/v4/projects/(?P<project>[^/]+)/merge_requests', '_list_merge_requests'),
+        ('POST', r'/api/v4/projects/(?P<project>[^/]+)/merge_requests', '_create_merge_request'),
+        ('GET', r'/api/v4/projects/(?P<project>[^/]+)/merge_requests/(?P<iid>\d+)', '_get_merge_request'),
+        ('PUT', r'/api/v4/projects/(?P<project>[^/]+)/merge_requests/(?P<iid>\d+)', '_update_merge_request'),
+        ('DELETE', r'/api/v4/projects/(?P<project>[^/]+)/merge_requests/(?P<iid>\d+)', '_delete_merge_request'),
+        ('PUT', r'/api/v4/projects/(?P<project>[^/]+)/merge_requests/(?P<iid>\d+)/merge', '_merge'),
+    )
+    COMPILED_ROUTES = tuple((method, re.compile(pattern + r'\Z'), handler) for method, pattern, handler in ROUTES)
+    
+    def log_message(self, format, *args):
+        """Silencia o log padrão de cada requisição"""
+        
+    def do_GET(self):
+        self._dispatch('GET')
+        
+    def do_POST(self):
+        self._dispatch('POST')
+        
+    def do_PUT(self):
+        self._dispatch('PUT')
+        
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+        
+    def _dispatch(self, method):
+        """
+        Encaminha a requisição para o tratamento da rota correspondente
+        
+        Args:
+            method (str): Método HTTP
+        """
+        with self.fake._count_lock:
+            self.fake.request_count += 1
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+            
+        parts = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.body = self._read_body()
+        
+        for route_method, pattern, handler in self.COMPILED_ROUTES:
+            match = pattern.match(parts.path)
+            if route_method == method and match:
+                params = {key: unquote(value) for key, value in match.groupdict().items()}
+                if 'project' in params and params['project'] != str(FakeGitLabDataset.PROJECT_ID):
+                    if handler != '_get_project':
+                        return self._send(404, {'message': '404 Project Not Found'})
+                with self.fake.dataset.lock:
+                    return getattr(self, handler)(**params)
+                    
+        self._send(404, {'message': '404 Not Found'})
+        
+    def _read_body(self):
+        """
+        Lê o corpo da requisição (JSON ou formulário)
+        
+        Returns:
+            dict: Dados enviados
+        """
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        raw = self.rfile.read(length).decode('utf-8')
+        if 'json' in (self.headers.get('Content-Type') or ''):
+            return json.loads(raw or '{}')
+        return {key: values[-1] for key, values in parse_qs(raw).items()}
+        
+    def _send(self, status, payload=None, headers=None):
+        """
+        Envia uma resposta JSON
+        
+        Args:
+            status (int): Status HTTP
+            payload: Conteúdo serializável (None envia corpo vazio)
+            headers (dict): Cabeçalhos adicionais
+        """
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        # Orçamento amplo: o cliente usa a taxa máxima permitida pelo seu controle de ritmo
+        self.send_header('RateLimit-Limit', '1000000')
+        self.send_header('RateLimit-Remaining', '1000000')
+        self.send_header('RateLimit-Reset', str(int(time.time()) + 60))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+            
+    def _send_page(self, items, per_page_default=20):
+        """
+        Envia uma página de uma listagem, com cabeçalhos de paginação e ETag
+        
+        Args:
+            items (list): Todos os itens da listagem
+            per_page_default (int): Itens por página quando não informado
+        """
+        page = int(self.query.get('page', 1))
+        per_page = int(self.query.get('per_page', per_page_default))
+        total_pages = max(1, -(-len(items) // per_page))
+        payload = items[(page - 1) * per_page:page * per_page]
+        
+        body = json.dumps(payload).encode('utf-8')
+        etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+        headers = {
+            'ETag': etag,
+            'X-Page': str(page),
+            'X-Per-Page': str(per_page),
+            'X-Total': str(len(items)),
+            'X-Total-Pages': str(total_pages)
+        }
+        if page < total_pages:
+            headers['X-Next-Page'] = str(page + 1)
+            query = dict(self.query, page=page + 1, per_page=per_page)
+            query_string = '&'.join(f'{key}={value}' for key, value in query.items())
+            headers['Link'] = f'<{self.fake.url}{urlsplit(self.path).path}?{query_string}>; rel="next"'
+            
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, payload, headers)
+        
+    # Usuário e versão
+    
+    def _get_user(self):
+        self._send(200, {'id': 1, 'username': 'benchmark', 'name': 'Benchmark'})
+        
+    def _get_version(self):
+        self._send(200, {'version': '16.0.0', 'revision': 'fake'})
+        
+    # Projetos
+    
+    def _list_projects(self):
+        self._send_page(self.fake.dataset.projects)
+        
+    def _get_project(self, project):
+        for item in self.fake.dataset.projects:
+            if str(item['id']) == project or item['path_with_namespace'] == project:
+                return self._send(200, item)
+        self._send(404, {'message': '404 Project Not Found'})
+        
+    # Branches
+    
+    def _list_branches(self, project):
+        self._send_page(self.fake.dataset.listing())
+        
+    def _get_branch(self, project, branch):
+        if branch not in self.fake.dataset.branches:
+            return self._send(404, {'message': '404 Branch Not Found'})
+        self._send(200, self.fake.dataset.branch_json(branch))
+        
+    def _delete_branch(self, project, branch):
+        dataset = self.fake.dataset
+        if branch not in dataset.branches:
+            return self._send(404, {'message': '404 Branch Not Found'})
+        if dataset.is_protected(branch):
+            return self._send(403, {'message': '403 Forbidden'})
+        del dataset.branches[branch]
+        dataset.touch()
+        self._send(204)
+        
+    def _list_protected_branches(self, project):
+        patterns = FakeGitLabDataset.PROTECTED_PATTERNS
+        self._send_page([{'id': index, 'name': name} for index, name in enumerate(patterns, 1)])
+        
+    def _compare(self, project):
+        dataset = self.fake.dataset
+        source = dataset.resolve(self.query.get('to'))
+        target = dataset.resolve(self.query.get('from'))
+        if source is None or target is None:
+            return self._send(404, {'message': '404 Ref Not Found'})
+        if source == target:
+            return self._send(200, {'commits': [], 'diffs': [], 'compare_same_ref': True})
+        self._send(200, {
+            'commit': {'id': source},
+            'commits': [{'id': source, 'title': 'Alteração'}],
+            'diffs': [{'old_path': 'arquivo.txt', 'new_path': 'arquivo.txt', 'diff': '@@ -1 +1 @@'}],
+            'compare_same_ref': False
+        })
+        
+    # Merge requests
+    
+    def _merge_request_json(self, mr):
+        return dict(mr, id=mr['iid'])
+        
+    def _list_merge_requests(self, project):
+        state = self.query.get('state')
+        source = self.query.get('source_branch')
+        target = self.query.get('target_branch')
+        mrs = [
+            self._merge_request_json(mr) for mr in self.fake.dataset.merge_requests.values()
+            if (not state or mr['state'] == state)
+            and (not source or mr['source_branch'] == source)
+            and (not target or mr['target_branch'] == target)
+        ]
+        self._send_page(mrs)
+        
+    def _create_merge_request(self, project):
+        dataset = self.fake.dataset
+        source = self.body.get('source_branch')
+        target = self.body.get('target_branch')
+        if source not in dataset.branches or target not in dataset.branches:
+            return self._send(404, {'message': '404 Branch Not Found'})
+        for mr in dataset.merge_requests.values():
+            if mr['state'] == 'opened' and mr['source_branch'] == source and mr['target_branch'] == target:
+                return self._send(409, {'message': ['Another open merge request already exists for this source branch']})
+                
+        iid = dataset.next_iid
+        dataset.next_iid += 1
+        mr = {
+            'iid': iid,
+            'project_id': FakeGitLabDataset.PROJECT_ID,
+            'title': self.body.get('title', ''),
+            'source_branch': source,
+            'target_branch': target,
+            'state': 'opened',
+            'squash': str(self.body.get('squash', False)).lower() == 'true',
+            'has_conflicts': False,
+            'merge_status': 'can_be_merged',
+            'detailed_merge_status': 'mergeable'
+        }
+        dataset.merge_requests[iid] = mr
+        self._send(201, self._merge_request_json(mr))
+        
+    def _get_merge_request(self, project, iid):
+        mr = self.fake.dataset.merge_requests.get(int(iid))
+        if mr is None:
+            return self._send(404, {'message': '404 Not Found'})
+        self._send(200, self._merge_request_json(mr))
+        
+    def _update_merge_request(self, project, iid):
+        mr = self.fake.dataset.merge_requests.get(int(iid))
+        if mr is None:
+            return self._send(404, {'message': '404 Not Found'})
+        if 'squash' in self.body:
+            mr['squash'] = str(self.body['squash']).lower() == 'true'
+        if self.body.get('state_event') == 'close' and mr['state'] == 'opened':
+            mr['state'] = 'closed'
+        self._send(200, self._merge_request_json(mr))
+        
+    def _delete_merge_request(self, project, iid):
+        if self.fake.dataset.merge_requests.pop(int(iid), None) is None:
+            return self._send(404, {'message': '404 Not Found'})
+        self._send(204, None)
+        
+    def _merge(self, project, iid):
+        dataset = self.fake.dataset
+        mr = dataset.merge_requests.get(int(iid))
+        if mr is None:
+            return self._send(404, {'message': '404 Not Found'})
+        if mr['state'] != 'opened':
+            return self._send(405, {'message': '405 Method Not Allowed'})
+        dataset.branches[mr['target_branch']] = dataset.branches[mr['source_branch']]
+        dataset.touch()
+        mr['state'] = 'merged'
+        self._send(200, self._merge_request_json(mr))
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Benchmarks das operações do GitLabAPI contra o servidor local FakeGitLabServer
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 100,10000 --latency 0.02 --json resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_gitlab import FakeGitLabDataset, FakeGitLabServer
+from models.branch_cache import BranchCache
+from models.branch_deleter import BranchDeleter
+from models.gitlab_api import GitLabAPI
+from models.merge_pipeline import MergePipeline
+
+# Quantidades de branches medidas por padrão
+DEFAULT_SIZES = (100, 10000, 50000)
+
+# Latência padrão (em segundos) de cada requisição ao servidor local
+DEFAULT_LATENCY = 0.01
+
+# Branches removidas no benchmark de deleção em lote
+DEFAULT_DELETE_COUNT = 200
+
+# Destinos do benchmark de merge em vários destinos
+DEFAULT_MERGE_TARGETS = 20
+
+
+def run_size(branch_count, latency, delete_count, merge_targets):
+    """
+    Executa todos os benchmarks para uma quantidade de branches
+    
+    Cada quantidade usa um servidor e um GitLabAPI novos, com cache persistente em
+    um diretório temporário, para que as medidas não dependam da execução anterior.
+    
+    Args:
+        branch_count (int): Quantidade de branches do projeto
+        latency (float): Latência de cada requisição, em segundos
+        delete_count (int): Branches removidas no benchmark de deleção
+        merge_targets (int): Destinos do benchmark de merge
+        
+    Returns:
+        list: Resultados, um dicionário por benchmark
+    """
+    results = []
+    dataset = FakeGitLabDataset(branch_count)
+    project_id = FakeGitLabDataset.PROJECT_ID
+    
+    # O cache fica aberto até o fim do processo, então a remoção do diretório ignora erros
+    cache_dir = tempfile.mkdtemp(prefix='branch_benchmark_')
+    try:
+        with FakeGitLabServer(dataset, latency) as server:
+            cache = BranchCache(os.path.join(cache_dir, 'branch_cache.sqlite3'))
+            api = GitLabAPI(cache=cache)
+            success, message = api.login(server.url, 'token-de-benchmark')
+            if not success:
+                raise RuntimeError(message)
+                
+            def measure(name, operation, items=None):
+                # Mede uma operação e a quantidade de requisições que ela fez ao servidor
+                requests_before = server.request_count
+                start_time = time.perf_counter()
+                detail = operation()
+                elapsed = time.perf_counter() - start_time
+                count = items if items is not None else 1
+                result = {
+                    'benchmark': name,
+                    'branches': branch_count,
+                    'items': count,
+                    'seconds': round(elapsed, 4),
+                    'items_per_second': round(count / elapsed, 2) if elapsed else None,
+                    'requests': server.request_count - requests_before
+                }
+                result.update(detail or {})
+                results.append(result)
+                return result
+                
+            # Abertura do projeto: branches protegidas + branches (mesmo caminho da tela de proteção)
+            def open_project():
+                protected_ok, protected = api.get_protected_branches(project_id)
+                branches_ok, branches = api.get_branches(project_id)
+                if not (protected_ok and branches_ok):
+                    raise RuntimeError(f"Falha ao abrir o projeto: {protected if not protected_ok else branches}")
+                return {'loaded': len(branches)}
+                
+            measure('project_open_cold', open_project)
+            
+            # Segunda abertura: as páginas em cache são revalidadas com requisições condicionais
+            api.invalidate_reads()
+            measure('project_open_warm', open_project)
+            
+            # Carregamento em streaming: tempo até a primeira página e até a última
+            def load_branches():
+                api.invalidate_reads()
+                start_time = time.perf_counter()
+                first_page = None
+                loaded = 0
+                for page in api.iter_branches(project_id):
+                    if first_page is None:
+                        first_page = time.perf_counter() - start_time
+                    loaded += len(page)
+                return {'loaded': loaded, 'first_page_seconds': round(first_page or 0, 4)}
+                
+            measure('branch_load', load_branches, branch_count)
+            
+            # A origem e os destinos do merge são reservados antes da deleção, para que
+            # continuem existindo mesmo quando a deleção alcança todas as demais branches
+            unprotected = [name for name in sorted(dataset.branches) if not dataset.is_protected(name)]
+            source_branch = unprotected[0]
+            targets = unprotected[1:merge_targets + 1]
+            
+            # Deleção em lote das primeiras branches não protegidas restantes
+            deletable = unprotected[len(targets) + 1:]
+            to_delete = deletable[:delete_count]
+            
+            def bulk_delete():
+                results_by_branch = BranchDeleter(api).delete_branches(project_id, to_delete)
+                failures = sum(1 for success, _ in results_by_branch.values() if not success)
+                return {'failures': failures}
+                
+            measure('bulk_delete', bulk_delete, len(to_delete))
+            
+            # Merge de uma branch de origem em vários destinos
+            def multi_target_merge():
+                pipeline = MergePipeline(api, project_id, source_branch, targets)
+                overall_success = pipeline.run()
+                return {
+                    'success': overall_success,
+                    'failures': len(pipeline.failed_merges),
+                    'skipped': len(pipeline.skipped_merges)
+                }
+                
+            measure('multi_target_merge', multi_target_merge, len(targets))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def format_table(results):
+    """
+    Formata os resultados como uma tabela de texto
+    
+    Args:
+        results (list): Resultados de run_size
+        
+    Returns:
+        str: Tabela com uma linha por benchmark
+    """
+    header = f"{'benchmark':<20} {'branches':>9} {'itens':>7} {'segundos':>9} {'itens/s':>10} {'requisições':>12}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['benchmark']:<20} {result['branches']:>9} {result['items']:>7} "
+            f"{result['seconds']:>9.3f} {result['items_per_second'] or 0:>10.1f} {result['requests']:>12}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """
+    Executa os benchmarks a partir da linha de comando
+    
+    Args:
+        argv (list): Argumentos (opcional, usa sys.argv)
+        
+    Returns:
+        int: Código de saída
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks do Gerenciador de Branches contra um GitLab simulado")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Quantidades de branches, separadas por vírgula")
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY,
+                        help="Latência de cada requisição, em segundos")
+    parser.add_argument('--delete-count', type=int, default=DEFAULT_DELETE_COUNT,
+                        help="Branches removidas no benchmark de deleção")
+    parser.add_argument('--merge-targets', type=int, default=DEFAULT_MERGE_TARGETS,
+                        help="Destinos do benchmark de merge")
+    parser.add_argument('--json', dest='json_path', help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+    
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = []
+    for branch_count in sizes:
+        print(f"Executando benchmarks com {branch_count} branches...", file=sys.stderr)
+        results.extend(run_size(branch_count, args.latency, args.delete_count, args.merge_targets))
+        
+    print(f"Python {platform.python_version()} — latência simulada {args.latency * 1000:.0f} ms")
+    print(format_table(results))
+    
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'latency': args.latency,
+                'results': results
+            }, file, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gerenciador de Branches GitLab - linha de comando
+----------------------------
+Interface sem janela para listar, remover e mesclar branches em lote, pensada
+para rotinas agendadas (por exemplo, a limpeza noturna de branches antigas).
+Não importa o PyQt6, de modo que a inicialização leva apenas milissegundos.
+
+Exemplos:
+    python cli.py --url https://gitlab.example.com --token TOKEN list 42 --merged
+    python cli.py delete 42 43 --pattern "feature/*" --merged --protect release --json
+    python cli.py merge 42 --source hotfix/1.2.3 --target develop --target release/1.2
+
+A URL e o token também podem ser informados pelas variáveis GITLAB_URL e GITLAB_TOKEN.
+
+Autor: Allan
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+
+from models.branch_deleter import BranchDeleter
+from models.gitlab_api import GitLabAPI
+from models.merge_pipeline import MergePipeline
+from utils.branch_protection import ProtectionMatcher, is_branch_protected, split_protected
+
+# Códigos de saída
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_ERROR = 2
+
+
+def build_parser():
+    """
+    Cria o parser dos argumentos da linha de comando
+    
+    Returns:
+        argparse.ArgumentParser: Parser com os subcomandos list, delete e merge
+    """
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="Gerenciador de Branches GitLab (linha de comando)"
+    )
+    parser.add_argument('--url', default=os.environ.get('GITLAB_URL'),
+                        help="URL da instância do GitLab (padrão: $GITLAB_URL)")
+    parser.add_argument('--token', default=os.environ.get('GITLAB_TOKEN'),
+                        help="Token de acesso à API (padrão: $GITLAB_TOKEN)")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    
+    # Opções comuns aos subcomandos
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--protect', action='append', default=[], metavar='NOME',
+                        help="Nome ou parte de caminho protegido, além das proteções do GitLab (repetível)")
+                        
+    # Filtros de seleção de branches, usados por list e delete
+    selection = argparse.ArgumentParser(add_help=False)
+    selection.add_argument('--pattern', action='append', default=[], metavar='GLOB',
+                           help="Seleciona as branches cujo nome corresponde ao padrão (repetível)")
+    selection.add_argument('--merged', action='store_true',
+                           help="Seleciona apenas branches já mescladas na branch padrão")
+                           
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    list_parser = subparsers.add_parser('list', parents=[common, selection], help="Lista as branches")
+    list_parser.add_argument('projects', nargs='+', type=int, metavar='PROJETO', help="IDs dos projetos")
+    list_parser.add_argument('--include-protected', action='store_true',
+                             help="Inclui as branches protegidas na listagem")
+                             
+    delete_parser = subparsers.add_parser('delete', parents=[common, selection], help="Remove branches")
+    delete_parser.add_argument('projects', nargs='+', type=int, metavar='PROJETO', help="IDs dos projetos")
+    delete_parser.add_argument('--branch', action='append', default=[], metavar='NOME',
+                               help="Nome exato de uma branch a remover (repetível)")
+    delete_parser.add_argument('--workers', type=int, default=None,
+                               help="Número máximo de deleções simultâneas")
+    delete_parser.add_argument('--local-repo', metavar='CAMINHO',
+                               help="Também remove as branches deste repositório Git local")
+    delete_parser.add_argument('--dry-run', action='store_true',
+                               help="Apenas mostra o que seria removido")
+                               
+    merge_parser = subparsers.add_parser('merge', parents=[common], help="Mescla uma branch em vários destinos")
+    merge_parser.add_argument('projects', nargs='+', type=int, metavar='PROJETO', help="IDs dos projetos")
+    merge_parser.add_argument('--source', required=True, help="Branch de origem")
+    merge_parser.add_argument('--target', action='append', required=True, metavar='NOME',
+                              help="Branch de destino (repetível)")
+    merge_parser.add_argument('--squash', action='store_true', help="Combina os commits em um único")
+    merge_parser.add_argument('--check-workers', type=int, default=None,
+                              help="Número máximo de verificações simultâneas")
+    merge_parser.add_argument('--merge-workers', type=int, default=None,
+                              help="Número máximo de merges simultâneos")
+                              
+    return parser
+
+
+def load_branches(gitlab_api, project_id, protected_names):
+    """
+    Carrega as branches de um projeto e as regras de proteção compiladas
+    
+    As regras combinam os nomes informados pelo usuário com as regras de proteção
+    do GitLab (inclusive padrões como "release/*") e a branch padrão do projeto,
+    que nunca deve ser removida.
+    
+    Args:
+        gitlab_api (GitLabAPI): API autenticada
+        project_id (int): ID do projeto
+        protected_names (list): Nomes protegidos informados pelo usuário
+        
+    Returns:
+        tuple: (sucesso, (branches, ProtectionMatcher) ou mensagem de erro)
+    """
+    success, branches = gitlab_api.get_branches(project_id)
+    if not success:
+        return False, branches
+        
+    success, gitlab_protected = gitlab_api.get_protected_branches(project_id)
+    if not success:
+        return False, gitlab_protected
+        
+    protected = set(protected_names) | set(gitlab_protected)
+    protected.update(branch.name for branch in branches if branch.default)
+    return True, (branches, ProtectionMatcher(sorted(protected)))
+
+
+def select_branches(branches, patterns=(), merged_only=False, names=()):
+    """
+    Filtra as branches pelos critérios da linha de comando
+    
+    Args:
+        branches (list): Lista de BranchRecord
+        patterns (list): Padrões glob; a branch precisa corresponder a pelo menos um
+        merged_only (bool): Se True, mantém apenas branches mescladas
+        names (list): Nomes exatos; a branch é mantida se estiver na lista
+        
+    Returns:
+        list: BranchRecord selecionados, na ordem original
+    """
+    wanted = set(names)
+    selected = []
+    for branch in branches:
+        if merged_only and not branch.merged:
+            continue
+        if wanted or patterns:
+            if branch.name not in wanted and not any(fnmatch.fnmatchcase(branch.name, p) for p in patterns):
+                continue
+        selected.append(branch)
+    return selected
+
+
+def command_list(gitlab_api, args):
+    """
+    Executa o subcomando list
+    
+    Args:
+        gitlab_api (GitLabAPI): API autenticada
+        args (argparse.Namespace): Argumentos da linha de comando
+        
+    Returns:
+        tuple: (código de saída, resultado por projeto)
+    """
+    results = []
+    exit_code = EXIT_OK
+    for project_id in args.projects:
+        success, loaded = load_branches(gitlab_api, project_id, args.protect)
+        if not success:
+            results.append({'project_id': project_id, 'error': loaded})
+            exit_code = EXIT_FAILURES
+            continue
+            
+        branches, protected = loaded
+        items = []
+        for branch in select_branches(branches, args.pattern, args.merged):
+            is_protected = is_branch_protected(branch.name, protected, branch)
+            if is_protected and not args.include_protected:
+                continue
+            items.append({
+                'name': branch.name,
+                'protected': is_protected,
+                'merged': branch.merged,
+                'default': branch.default,
+                'commit_sha': branch.commit_sha,
+                'committed_date': branch.committed_date
+            })
+        results.append({'project_id': project_id, 'branches': items})
+    return exit_code, results
+
+
+def command_delete(gitlab_api, args):
+    """
+    Executa o subcomando delete
+    
+    As branches protegidas nunca são removidas, mesmo quando informadas pelo nome.
+    
+    Args:
+        gitlab_api (GitLabAPI): API autenticada
+        args (argparse.Namespace): Argumentos da linha de comando
+        
+    Returns:
+        tuple: (código de saída, resultado por projeto)
+    """
+    if not (args.branch or args.pattern or args.merged):
+        raise ValueError("Informe --branch, --pattern ou --merged para selecionar as branches")
+        
+    git_repo = None
+    if args.local_repo:
+        # Importado apenas quando necessário: o GitPython é a dependência mais lenta de carregar
+        from models.git_repo import GitRepo
+        git_repo = GitRepo(args.local_repo)
+        if not git_repo.is_valid():
+            raise ValueError(f"Repositório Git inválido: {args.local_repo}")
+            
+    results = []
+    exit_code = EXIT_OK
+    deleter = BranchDeleter(gitlab_api, args.workers)
+    for project_id in args.projects:
+        success, loaded = load_branches(gitlab_api, project_id, args.protect)
+        if not success:
+            results.append({'project_id': project_id, 'error': loaded})
+            exit_code = EXIT_FAILURES
+            continue
+            
+        branches, protected = loaded
+        selected = select_branches(branches, args.pattern, args.merged, args.branch)
+        branches_by_name = {branch.name: branch for branch in selected}
+        skipped, to_delete = split_protected(list(branches_by_name), protected, branches_by_name)
+        
+        # Nomes pedidos explicitamente que não existem no projeto
+        existing = {branch.name for branch in branches}
+        missing = [name for name in args.branch if name not in existing]
+        
+        project_result = {
+            'project_id': project_id,
+            'deleted': [],
+            'failed': [{'name': name, 'error': "Branch não encontrada"} for name in missing],
+            'skipped_protected': skipped
+        }
+        if args.dry_run:
+            project_result['deleted'] = to_delete
+            project_result['dry_run'] = True
+        else:
+            for name, (deleted, message) in deleter.delete_branches(project_id, to_delete).items():
+                if deleted and git_repo is not None:
+                    local_success, local_message = git_repo.delete_branch(name)
+                    if not local_success and "não encontrada" not in local_message:
+                        deleted, message = False, f"Branch remota deletada, mas falha ao deletar localmente: {local_message}"
+                if deleted:
+                    project_result['deleted'].append(name)
+                else:
+                    project_result['failed'].append({'name': name, 'error': message})
+            project_result['deleted'].sort()
+            
+        if project_result['failed']:
+            exit_code = EXIT_FAILURES
+        results.append(project_result)
+    return exit_code, results
+
+
+def command_merge(gitlab_api, args):
+    """
+    Executa o subcomando merge
+    
+    Destinos protegidos são recusados, como na aba de merge da interface gráfica.
+    
+    Args:
+        gitlab_api (GitLabAPI): API autenticada
+        args (argparse.Namespace): Argumentos da linha de comando
+        
+    Returns:
+        tuple: (código de saída, resultado por projeto)
+    """
+    results = []
+    exit_code = EXIT_OK
+    for project_id in args.projects:
+        success, loaded = load_branches(gitlab_api, project_id, args.protect)
+        if not success:
+            results.append({'project_id': project_id, 'error': loaded})
+            exit_code = EXIT_FAILURES
+            continue
+            
+        branches, protected = loaded
+        branches_by_name = {branch.name: branch for branch in branches}
+        if args.source not in branches_by_name:
+            results.append({'project_id': project_id, 'error': f"Branch de origem '{args.source}' não encontrada"})
+            exit_code = EXIT_FAILURES
+            continue
+            
+        refused, targets = split_protected(args.target, protected, branches_by_name)
+        pipeline = MergePipeline(
+            gitlab_api,
+            project_id,
+            args.source,
+            targets,
+            squash=args.squash,
+            check_workers=args.check_workers,
+            merge_workers=args.merge_workers
+        )
+        
+        completed = []
+        
+        def on_completed(target_branch, merged):
+            if merged:
+                completed.append(target_branch)
+                
+        overall_success = pipeline.run(on_completed=on_completed)
+        skipped = {target for target, _ in pipeline.skipped_merges}
+        
+        results.append({
+            'project_id': project_id,
+            'source': args.source,
+            'merged': sorted(target for target in completed if target not in skipped),
+            'skipped': [{'name': target, 'reason': reason} for target, reason in pipeline.skipped_merges],
+            'failed': [{'name': target, 'error': reason} for target, reason in pipeline.failed_merges],
+            'refused_protected': refused
+        })
+        if not overall_success or refused:
+            exit_code = EXIT_FAILURES
+    return exit_code, results
+
+
+def print_text(command, results):
+    """
+    Imprime o resultado em formato de texto
+    
+    Args:
+        command (str): Subcomando executado
+        results (list): Resultado por projeto
+    """
+    for result in results:
+        print(f"Projeto {result['project_id']}:")
+        if 'error' in result:
+            print(f"  erro: {result['error']}")
+            continue
+            
+        if command == 'list':
+            for branch in result['branches']:
+                flags = [flag for flag in ('protected', 'merged', 'default') if branch[flag]]
+                print(f"  {branch['name']}" + (f"  [{', '.join(flags)}]" if flags else ""))
+            print(f"  {len(result['branches'])} branch(es)")
+        elif command == 'delete':
+            label = "seria removida" if result.get('dry_run') else "removida"
+            for name in result['deleted']:
+                print(f"  {label}: {name}")
+            for name in result['skipped_protected']:
+                print(f"  protegida (ignorada): {name}")
+            for failure in result['failed']:
+                print(f"  falha: {failure['name']}: {failure['error']}")
+        else:
+            for name in result['merged']:
+                print(f"  mesclada: {result['source']} -> {name}")
+            for skipped in result['skipped']:
+                print(f"  pulada: {skipped['name']}: {skipped['reason']}")
+            for name in result['refused_protected']:
+                print(f"  protegida (recusada): {name}")
+            for failure in result['failed']:
+                print(f"  falha: {failure['name']}: {failure['error']}")
+
+
+def main(argv=None):
+    """
+    Função principal da linha de comando
+    
+    Args:
+        argv (list): Argumentos (opcional, usa sys.argv)
+        
+    Returns:
+        int: Código de saída (0 sucesso, 1 alguma operação falhou, 2 erro de uso ou de autenticação)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    gitlab_api = GitLabAPI()
+    success, message = gitlab_api.login(args.url, args.token)
+    if not success:
+        print(message, file=sys.stderr)
+        return EXIT_ERROR
+        
+    commands = {'list': command_list, 'delete': command_delete, 'merge': command_merge}
+    try:
+        exit_code, results = commands[args.command](gitlab_api, args)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_ERROR
+        
+    if args.json:
+        json.dump({'command': args.command, 'results': results}, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_text(args.command, results)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
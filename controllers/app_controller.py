@@ -1,23 +1,91 @@
 """
 Controller principal da aplicação
 """
-from PyQt6.QtWidgets import QMainWindow, QTabWidget, QStatusBar, QMessageBox, QWidget
-from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QMainWindow, QTabWidget, QStatusBar, QMessageBox, QWidget, QPushButton, QFileDialog
+from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
 
+from models.branch_cache import BranchCache
+from models.branch_diff import diff_branches
 from models.gitlab_api import GitLabAPI
+from models.gitlab_async_api import AsyncGitLabBackend
 from models.git_repo import GitRepo
 from models.ldap_auth import LDAPAuth
+from utils.metrics import registry as metrics_registry
 from views.login_tab_view import LoginTabView
 from views.projects_view import ProjectsView
 from views.branches_view import BranchesView
 from views.protected_branches_view import ProtectedBranchesView
 from views.merge_branches_view import MergeBranchesView
+from views.diagnostics_view import DiagnosticsView
 from controllers.login_controller import LoginController
 from controllers.ldap_login_controller import LDAPLoginController
 from controllers.project_controller import ProjectController
 from controllers.branch_controller import BranchController
+from controllers.branch_refresh_service import BranchRefreshService
 from controllers.merge_controller import MergeController
 
+class RevalidateProjectCacheThread(QThread):
+    """
+    Thread para revalidar com o GitLab as branches exibidas a partir do cache local
+    """
+    # (project_id, branches protegidas ou None, branches ou None)
+    revalidated = pyqtSignal(object, object, object)
+    
+    def __init__(self, gitlab_api, project_id, parent=None):
+        """
+        Inicializa a thread
+        
+        Args:
+            gitlab_api: Instância da API do GitLab
+            project_id: ID do projeto no GitLab
+            parent: Objeto pai (opcional)
+        """
+        super().__init__(parent)
+        self.gitlab_api = gitlab_api
+        self.project_id = project_id
+        
+    def run(self):
+        """
+        Executa as requisições condicionais; listagens sem alteração vêm do próprio cache
+        """
+        success, protected_branches = self.gitlab_api.get_protected_branches(self.project_id)
+        if not success:
+            protected_branches = None
+            
+        success, branches = self.gitlab_api.get_branches(self.project_id)
+        if not success:
+            branches = None
+            
+        self.revalidated.emit(self.project_id, protected_branches, branches)
+
+class LoadProjectOverviewThread(QThread):
+    """
+    Thread para carregar branches e branches protegidas de um projeto pela API GraphQL
+    """
+    overview_loaded = pyqtSignal(object, bool, object)  # (project_id, sucesso, resultado)
+    
+    def __init__(self, gitlab_api, project_id, parent=None):
+        """
+        Inicializa a thread
+        
+        Args:
+            gitlab_api: Instância da API do GitLab
+            project_id: ID do projeto no GitLab
+            parent: Objeto pai (opcional)
+        """
+        super().__init__(parent)
+        self.gitlab_api = gitlab_api
+        self.project_id = project_id
+        
+    def run(self):
+        """Executa a consulta da visão geral do projeto"""
+        try:
+            success, result = self.gitlab_api.get_project_overview(self.project_id)
+        except Exception as e:
+            success, result = False, str(e)
+        self.overview_loaded.emit(self.project_id, success, result)
+
 class AppController(QObject):
     """
     Controller principal responsável por coordenar a aplicação
@@ -42,6 +110,8 @@ class AppController(QObject):
         # Conectar sinais internos
         self.protected_branches_loaded_signal.connect(self._on_gitlab_protected_branches_loaded)
         self.branches_loaded_signal.connect(self._on_project_branches_loaded)
+        self.branch_refresh_service.branches_refreshed.connect(self._on_branches_refreshed)
+        self.branch_refresh_service.refresh_failed.connect(self._on_branches_refresh_failed)
         
         # Iniciar na tela de login
         self.show_login()
@@ -58,6 +128,15 @@ class AppController(QObject):
         self.status_bar = QStatusBar()
         self.window.setStatusBar(self.status_bar)
         
+        # Acesso ao painel de diagnóstico (botão na barra de status e Ctrl+Shift+D)
+        self.diagnostics_view = None
+        self.diagnostics_button = QPushButton("Diagnóstico")
+        self.diagnostics_button.setFlat(True)
+        self.diagnostics_button.clicked.connect(self.show_diagnostics)
+        self.status_bar.addPermanentWidget(self.diagnostics_button)
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self.window)
+        self.diagnostics_shortcut.activated.connect(self.show_diagnostics)
+        
         # Criar as views
         self.login_tab_view = LoginTabView()
         self.projects_view = ProjectsView()
@@ -81,10 +160,18 @@ class AppController(QObject):
         """
         Configura os models da aplicação
         """
-        self.gitlab_api = GitLabAPI()
+        self.branch_cache = BranchCache()
+        self.gitlab_api = GitLabAPI(cache=self.branch_cache)
         self.git_repo = GitRepo()
         self.ldap_auth = LDAPAuth()
         
+        # Serviço único para recarregar branches fora da thread da interface
+        self.branch_refresh_service = BranchRefreshService(self.gitlab_api, self)
+        self._awaiting_protected_view_branches = None
+        
+        # Backend assíncrono opcional (GITLAB_ASYNC_BACKEND=1), criado após o login
+        self.async_backend = None
+        
     def setup_controllers(self):
         """
         Configura os controllers específicos
@@ -124,6 +211,54 @@ class AppController(QObject):
             self
         )
         
+    def show_diagnostics(self):
+        """
+        Exibe o painel de diagnóstico com as métricas coletadas
+        """
+        if self.diagnostics_view is None:
+            self.diagnostics_view = DiagnosticsView(self.window)
+            self.diagnostics_view.refresh_requested.connect(self._refresh_diagnostics)
+            self.diagnostics_view.reset_requested.connect(self._reset_diagnostics)
+            self.diagnostics_view.export_requested.connect(self._export_diagnostics)
+            
+        self._refresh_diagnostics()
+        self.diagnostics_view.show()
+        self.diagnostics_view.raise_()
+        
+    def _refresh_diagnostics(self):
+        """Atualiza o painel de diagnóstico com as métricas atuais"""
+        self.diagnostics_view.set_snapshot(metrics_registry.snapshot())
+        
+    def _reset_diagnostics(self):
+        """Descarta as métricas coletadas e atualiza o painel"""
+        metrics_registry.reset()
+        self._refresh_diagnostics()
+        
+    def _export_diagnostics(self, export_format):
+        """
+        Exporta as métricas para um arquivo escolhido pelo usuário
+        
+        Args:
+            export_format (str): 'json' ou 'prometheus'
+        """
+        if export_format == 'json':
+            default_name, file_filter = "metricas.json", "JSON (*.json)"
+            content = metrics_registry.to_json()
+        else:
+            default_name, file_filter = "metricas.prom", "Prometheus (*.prom *.txt)"
+            content = metrics_registry.to_prometheus()
+            
+        path, _ = QFileDialog.getSaveFileName(self.diagnostics_view, "Exportar métricas", default_name, file_filter)
+        if not path:
+            return
+            
+        try:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(content)
+            self.window.statusBar().showMessage(f"Métricas exportadas para {path}")
+        except OSError as e:
+            QMessageBox.critical(self.diagnostics_view, "Erro", f"Falha ao exportar métricas: {str(e)}")
+        
     def show_login(self):
         """
         Exibe a tela de login
@@ -157,8 +292,111 @@ class AppController(QObject):
         self.tab_widget.clear()
         self.tab_widget.addTab(self.protected_branches_view, "Configurar Branches Protegidas")
         
+        # Exibir imediatamente a cópia em cache, se houver, e revalidá-la em segundo plano
+        if self._show_cached_project_branches():
+            self._revalidate_project_cache()
+            return
+        
         # Carregar dados utilizando threads seguras
-        self._load_protected_branches()
+        if self.gitlab_api.GRAPHQL_ENABLED:
+            self._load_project_overview()
+        else:
+            self._load_protected_branches()
+        
+    def _load_project_overview(self):
+        """Carrega branches e branches protegidas em poucas consultas GraphQL"""
+        self.overview_thread = LoadProjectOverviewThread(self.gitlab_api, self.current_project_id)
+        self.overview_thread.overview_loaded.connect(self._on_project_overview_loaded)
+        self.overview_thread.start()
+        
+    @pyqtSlot(object, bool, object)
+    def _on_project_overview_loaded(self, project_id, success, result):
+        """
+        Slot chamado na thread principal quando a consulta GraphQL termina
+        
+        Args:
+            project_id: ID do projeto consultado
+            success: True se a consulta foi bem-sucedida
+            result: Dicionário da visão geral ou mensagem de erro
+        """
+        if project_id != getattr(self, 'current_project_id', None):
+            return
+            
+        if not success:
+            # Servidor sem suporte aos campos usados: seguir pelas listagens REST
+            self.window.statusBar().showMessage("Consulta GraphQL indisponível. Carregando branches pela API REST...")
+            self._load_protected_branches()
+            return
+            
+        self.gitlab_protected_branches = result['protected_branches']
+        self.branches_loaded_signal.emit(result['branches'])
+        
+    def _show_cached_project_branches(self):
+        """
+        Exibe as branches do projeto atual a partir do cache local
+        
+        Returns:
+            bool: True se havia branches e branches protegidas em cache
+        """
+        cached_protected = self.gitlab_api.get_cached_protected_branches(self.current_project_id)
+        cached_branches = self.gitlab_api.get_cached_branches(self.current_project_id)
+        if cached_protected is None or cached_branches is None:
+            return False
+            
+        self.gitlab_protected_branches = cached_protected
+        self._on_project_branches_loaded(cached_branches)
+        self.window.statusBar().showMessage("Branches exibidas a partir do cache local. Verificando atualizações...")
+        return True
+        
+    def _revalidate_project_cache(self):
+        """
+        Inicia a revalidação em segundo plano das branches exibidas a partir do cache
+        """
+        self.revalidate_thread = RevalidateProjectCacheThread(self.gitlab_api, self.current_project_id)
+        self.revalidate_thread.revalidated.connect(self._on_project_cache_revalidated)
+        self.revalidate_thread.start()
+        
+    @pyqtSlot(object, object, object)
+    def _on_project_cache_revalidated(self, project_id, protected_branches, branches):
+        """
+        Slot chamado na thread principal quando a revalidação do cache termina
+        
+        Args:
+            project_id: ID do projeto revalidado
+            protected_branches (list): Branches protegidas atuais (None em caso de falha)
+            branches (list): BranchRecord atuais (None em caso de falha)
+        """
+        # O usuário pode ter trocado de projeto durante a revalidação
+        if project_id != getattr(self, 'current_project_id', None):
+            return
+            
+        changed = False
+        if protected_branches is not None and protected_branches != self.gitlab_protected_branches:
+            self.gitlab_protected_branches = protected_branches
+            changed = True
+            
+        protected_changed = changed
+        delta = None
+        if branches is not None:
+            delta = diff_branches(self.project_branches, branches)
+            changed = changed or bool(delta)
+            self.project_branches = branches
+            
+        if not changed:
+            self.window.statusBar().showMessage("Branches em cache já estão atualizadas")
+            return
+            
+        # Atualizar apenas se o usuário ainda está escolhendo as branches protegidas;
+        # as demais telas carregam as branches do servidor ao serem abertas
+        if self.tab_widget.currentWidget() is self.protected_branches_view:
+            if protected_changed:
+                self.protected_branches_view.refresh_branches(
+                    [branch.name for branch in self.project_branches],
+                    self.gitlab_protected_branches
+                )
+            elif delta is not None and delta.names_changed:
+                self.protected_branches_view.apply_branch_changes(delta.added_names, delta.removed)
+        self.window.statusBar().showMessage("Branches atualizadas a partir do GitLab")
         
     def _load_protected_branches(self):
         """Inicia o carregamento das branches protegidas pelo GitLab de forma segura"""
@@ -178,20 +416,7 @@ class AppController(QObject):
                     self.protected_branches_view.set_loading_state(True, "Carregando branches do projeto...")
                     
                     # Agora carregar todas as branches do projeto
-                    def on_branches_loaded(success, result):
-                        if success:
-                            # Emitir sinal para processar na thread principal
-                            self.branches_loaded_signal.emit(result)
-                        else:
-                            # Exibir mensagem de erro na thread principal
-                            self.window.statusBar().showMessage(f"Erro ao carregar branches: {result}")
-                            QMessageBox.critical(self.window, "Erro", f"Falha ao carregar branches: {result}")
-                            # Esconder indicador de carregamento em caso de erro
-                            self.protected_branches_view.set_loading_state(False)
-                    
-                    # Chamar diretamente a API para obter as branches
-                    success, result = self.gitlab_api.get_branches(self.current_project_id)
-                    on_branches_loaded(success, result)
+                    self._request_protected_view_branches()
                 else:
                     # Outros tipos de erro - mostrar mensagem
                     self.window.statusBar().showMessage(f"Erro ao carregar branches protegidas: {result}")
@@ -209,20 +434,78 @@ class AppController(QObject):
         self.protected_branches_view.set_loading_state(True, "Carregando todas as branches do projeto...")
         
         # Agora carregar todas as branches do projeto
-        def on_branches_loaded(success, result):
-            if success:
-                # Emitir sinal para processar na thread principal
-                self.branches_loaded_signal.emit(result)
+        self._request_protected_view_branches()
+    
+    def _request_protected_view_branches(self):
+        """Solicita em segundo plano as branches do projeto para a tela de branches protegidas"""
+        self._awaiting_protected_view_branches = self.current_project_id
+        self.branch_refresh_service.refresh(self.current_project_id)
+    
+    @pyqtSlot(object, list)
+    def _on_branches_refreshed(self, project_id, branches):
+        """
+        Slot chamado na thread principal quando o serviço de atualização entrega as branches
+        
+        Args:
+            project_id: ID do projeto recarregado
+            branches: Lista de BranchRecord
+        """
+        if project_id != getattr(self, 'current_project_id', None):
+            return
+        
+        # Branches aguardadas pela tela de branches protegidas
+        if self._awaiting_protected_view_branches == project_id:
+            self._awaiting_protected_view_branches = None
+            self.branches_loaded_signal.emit(branches)
+            return
+        
+        delta = diff_branches(getattr(self, 'project_branches', []), branches)
+        self.project_branches = branches
+        
+        # As listas de merge e de branches protegidas exibem apenas nomes: aplicar somente
+        # as branches que entraram ou saíram, preservando as seleções do usuário
+        if delta.names_changed:
+            self._apply_branch_delta(delta)
+            
+    def _apply_branch_delta(self, delta):
+        """
+        Aplica às telas de merge e de branches protegidas as branches que entraram ou saíram
+        
+        Args:
+            delta (BranchDelta): Diferenças em relação à listagem anterior
+        """
+        if hasattr(self, 'selected_protected_branches') and hasattr(self, 'merge_controller'):
+            if hasattr(self.merge_branches_view, 'original_branches'):
+                self.merge_controller.apply_branch_changes(delta.added_names, delta.removed)
             else:
-                # Exibir mensagem de erro na thread principal
-                self.window.statusBar().showMessage(f"Erro ao carregar branches: {result}")
-                QMessageBox.critical(self.window, "Erro", f"Falha ao carregar branches: {result}")
-                # Esconder indicador de carregamento em caso de erro
-                self.protected_branches_view.set_loading_state(False)
-        
-        # Chamar diretamente a API para obter as branches
-        success, result = self.gitlab_api.get_branches(self.current_project_id)
-        on_branches_loaded(success, result)
+                self._apply_branches_to_merge_tab()
+                
+        # A tela de branches protegidas só é atualizada se já exibe as branches do projeto
+        if self.protected_branches_view.checkboxes:
+            self.protected_branches_view.apply_branch_changes(delta.added_names, delta.removed)
+    
+    @pyqtSlot(object, str)
+    def _on_branches_refresh_failed(self, project_id, error_message):
+        """
+        Slot chamado na thread principal quando o serviço de atualização falha
+        
+        Args:
+            project_id: ID do projeto
+            error_message: Mensagem de erro
+        """
+        if project_id != getattr(self, 'current_project_id', None):
+            return
+        
+        if self._awaiting_protected_view_branches == project_id:
+            self._awaiting_protected_view_branches = None
+            
+            # Exibir mensagem de erro
+            self.window.statusBar().showMessage(f"Erro ao carregar branches: {error_message}")
+            QMessageBox.critical(self.window, "Erro", f"Falha ao carregar branches: {error_message}")
+            # Esconder indicador de carregamento em caso de erro
+            self.protected_branches_view.set_loading_state(False)
+        else:
+            self.window.statusBar().showMessage(f"Erro ao atualizar branches: {error_message}")
     
     @pyqtSlot(list)
     def _on_project_branches_loaded(self, branches):
@@ -325,41 +608,40 @@ class AppController(QObject):
     def update_merge_tab_branches(self):
         """
         Atualiza a lista de branches na aba de merge
+        
+        A aba recebe imediatamente as branches já conhecidas e é atualizada de novo,
+        se necessário, quando a busca em segundo plano terminar.
         """
         if hasattr(self, 'project_branches') and hasattr(self, 'selected_protected_branches'):
             # Verificar se o controller de merge existe e está inicializado
             if hasattr(self, 'merge_controller'):
-                # SOLUÇÃO MAIS AGRESSIVA: Forçar recarregamento direto da API do GitLab
-                # para garantir dados atualizados
+                self._apply_branches_to_merge_tab()
+                
+                # Recarregar branches da API em segundo plano para garantir dados atualizados
                 if hasattr(self, 'current_project_id'):
-                    # Recarregar branches diretamente da API
-                    success, result = self.gitlab_api.get_branches(self.current_project_id)
-                    if success:
-                        # Atualizar o modelo interno
-                        self.project_branches = result
-                        
-                        # Atualizar o controller de merge com as branches atualizadas
-                        self.merge_controller.set_project(
-                            self.current_project_id, 
-                            self.current_project_name,
-                            [b.name for b in result],
-                            self.selected_protected_branches
-                        )
-                        
-                        # Forçar refresh da visualização se estiver na aba de merge
-                        current_tab = self.tab_widget.currentWidget()
-                        if current_tab == self.merge_branches_view:
-                            # Forçar atualização visual se a aba estiver visível
-                            if hasattr(self.merge_branches_view, 'refresh_branches_display'):
-                                self.merge_branches_view.refresh_branches_display()
-                else:
-                    # Usar os dados atuais se não for possível recarregar da API
-                    self.merge_controller.set_project(
-                        self.current_project_id, 
-                        self.current_project_name,
-                        [b.name for b in self.project_branches],
-                        self.selected_protected_branches
-                    )
+                    self.branch_refresh_service.refresh(self.current_project_id)
+    
+    def _apply_branches_to_merge_tab(self):
+        """
+        Configura a aba de merge com as branches atuais do projeto
+        """
+        if not hasattr(self, 'selected_protected_branches') or not hasattr(self, 'merge_controller'):
+            return
+        
+        # Atualizar o controller de merge com as branches atualizadas
+        self.merge_controller.set_project(
+            self.current_project_id, 
+            self.current_project_name,
+            [b.name for b in self.project_branches],
+            self.selected_protected_branches
+        )
+        
+        # Forçar refresh da visualização se estiver na aba de merge
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab == self.merge_branches_view:
+            # Forçar atualização visual se a aba estiver visível
+            if hasattr(self.merge_branches_view, 'refresh_branches_display'):
+                self.merge_branches_view.refresh_branches_display()
         
     def show_branches_with_tabs(self):
         """
@@ -434,6 +716,11 @@ class AppController(QObject):
         Args:
             username (str): Nome do usuário logado
         """
+        # Recriar o backend assíncrono com as credenciais da nova sessão
+        if self.async_backend:
+            self.async_backend.close()
+        self.async_backend = AsyncGitLabBackend.from_environment(self.gitlab_api)
+        
         # Carregar lista de projetos e mostrar a tela
         self.project_controller.load_projects()
         self.show_projects()
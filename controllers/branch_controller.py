@@ -1,36 +1,59 @@
 """
 Controller para gerenciar as branches do GitLab e repositório local
 """
-from PyQt6.QtWidgets import QMessageBox, QTreeWidgetItem, QDialog, QVBoxLayout, QHBoxLayout, QLabel
+from PyQt6.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QHBoxLayout, QLabel
 from PyQt6.QtWidgets import QPushButton, QScrollArea, QWidget, QCheckBox, QFrame, QDialogButtonBox, QSizePolicy
 from PyQt6.QtCore import QThread, pyqtSignal, QObject, Qt, QSize
 from PyQt6.QtGui import QIcon, QColor, QPalette
+from models.branch_deleter import BranchDeleter
 from models.gitlab_api import GitLabAPI
-import time
+from utils import tracing
+from models.branch_diff import diff_branches
+from utils.branch_protection import ProtectionMatcher, is_branch_protected, split_protected
+from concurrent.futures import as_completed
 
 class LoadBranchesThread(QThread):
     """
     Thread para carregar branches do GitLab sem bloquear a interface
     """
-    branches_loaded = pyqtSignal(list)  # Sinal emitido quando as branches são carregadas
-    branches_failed = pyqtSignal(str)   # Sinal emitido em caso de falha
+    branches_loaded = pyqtSignal(list)       # Sinal emitido quando as branches são carregadas
+    branches_page_loaded = pyqtSignal(list)  # Sinal emitido a cada página carregada (modo streaming)
+    branches_failed = pyqtSignal(str)        # Sinal emitido em caso de falha
     
-    def __init__(self, gitlab_api, project_id, parent=None):
+    def __init__(self, gitlab_api, project_id, stream=False, parent=None):
         """
         Inicializa a thread
         
         Args:
             gitlab_api: Instância do GitLabAPI
             project_id: ID do projeto a ser carregado
+            stream: Se True, emite branches_page_loaded para cada página recebida
             parent: Objeto pai
         """
         super().__init__(parent)
         self.gitlab_api = gitlab_api
         self.project_id = project_id
+        self.stream = stream
+        
+        # Span da ação que criou a thread, usado como pai das chamadas feitas nela
+        self.trace_parent = tracing.current_span()
         
     def run(self):
         """Executa a thread para carregar as branches"""
+        with tracing.activate(self.trace_parent):
+            self._load()
+            
+    def _load(self):
+        """Carrega as branches, emitindo os sinais de resultado"""
         try:
+            if self.stream:
+                branches = []
+                for page in self.gitlab_api.iter_branches(self.project_id):
+                    branches.extend(page)
+                    self.branches_page_loaded.emit(page)
+                self.branches_loaded.emit(branches)
+                return
+                
             success, result = self.gitlab_api.get_branches(self.project_id)
             if success:
                 self.branches_loaded.emit(result)
@@ -48,7 +71,8 @@ class DeleteBranchesThread(QThread):
     branch_failed = pyqtSignal(str, str)  # Sinal emitido quando uma deleção falha
     all_completed = pyqtSignal()          # Sinal emitido quando todas as operações são concluídas
     
-    def __init__(self, gitlab_api, project_id, branch_names, delete_local=False, git_repo=None, parent=None):
+    def __init__(self, gitlab_api, project_id, branch_names, delete_local=False, git_repo=None,
+                 max_workers=None, async_backend=None, parent=None):
         """
         Inicializa a thread
         
@@ -58,6 +82,9 @@ class DeleteBranchesThread(QThread):
             branch_names: Lista de nomes de branches para deletar
             delete_local: Se True, também deleta branches locais
             git_repo: Instância do repositório Git (se delete_local for True)
+            max_workers: Número máximo de deleções remotas simultâneas (opcional)
+            async_backend: AsyncGitLabBackend; se informado, todas as deleções remotas
+                ficam em andamento ao mesmo tempo no loop assíncrono (opcional)
             parent: Objeto pai
         """
         super().__init__(parent)
@@ -66,27 +93,52 @@ class DeleteBranchesThread(QThread):
         self.branch_names = branch_names
         self.delete_local = delete_local
         self.git_repo = git_repo
+        self.deleter = BranchDeleter(gitlab_api, max_workers)
+        self.async_backend = async_backend
+        
+        # Span da ação que criou a thread, usado como pai das chamadas feitas nela
+        self.trace_parent = tracing.current_span()
         
     def run(self):
         """Executa a thread para deletar as branches"""
-        for branch_name in self.branch_names:
+        with tracing.activate(self.trace_parent):
+            self._delete_branches()
+        self.all_completed.emit()
+        
+    def _delete_branches(self):
+        """Remove as branches remotas (e locais, se solicitado)"""
+        if self.async_backend:
+            # As deleções rodam no loop assíncrono; os resultados chegam nesta thread
+            futures = self.async_backend.delete_branches_async(self.project_id, self.branch_names)
+            for future in as_completed(futures):
+                success, message = future.result()
+                self._on_remote_result(futures[future], success, message)
+        else:
+            # As deleções remotas rodam em paralelo; os resultados chegam nesta thread
+            self.deleter.delete_branches(self.project_id, self.branch_names, self._on_remote_result)
+        
+    def _on_remote_result(self, branch_name, success, message):
+        """
+        Trata o resultado da deleção remota de uma branch
+        
+        Args:
+            branch_name: Nome da branch
+            success: True se a branch remota foi removida
+            message: Mensagem de resultado
+        """
+        if not success:
+            self.branch_failed.emit(branch_name, message)
+            return
+        
+        # Deletar branch local se solicitado (o repositório local não é acessado em paralelo)
+        if self.delete_local and self.git_repo:
             try:
-                # Deletar branch remota primeiro
-                self.gitlab_api.delete_branch(self.project_id, branch_name)
-                
-                # Deletar branch local se solicitado
-                if self.delete_local and self.git_repo:
-                    try:
-                        self.git_repo.delete_branch(branch_name)
-                    except Exception as e:
-                        self.branch_failed.emit(branch_name, f"Branch remota deletada, mas falha ao deletar localmente: {str(e)}")
-                        continue
-                
-                self.branch_deleted.emit(branch_name)
+                self.git_repo.delete_branch(branch_name)
             except Exception as e:
-                self.branch_failed.emit(branch_name, str(e))
-                
-        self.all_completed.emit()
+                self.branch_failed.emit(branch_name, f"Branch remota deletada, mas falha ao deletar localmente: {str(e)}")
+                return
+        
+        self.branch_deleted.emit(branch_name)
 
 
 class LoadProtectedBranchesThread(QThread):
@@ -147,6 +199,9 @@ class BranchController(QObject):
         self.protected_branches = []
         self.gitlab_protected_branches = []
         
+        # Regras de proteção compiladas, recriadas apenas quando a lista muda
+        self._protection = ProtectionMatcher()
+        
         # Por padrão, esconde branches protegidas da listagem
         self.hide_protected_branches = True
         
@@ -157,6 +212,18 @@ class BranchController(QObject):
         
         if parent_controller:
             self.view.back_to_projects_requested.connect(parent_controller.show_projects)
+        
+        # Serviço compartilhado de atualização das branches (fornecido pelo AppController)
+        self.refresh_service = getattr(parent_controller, 'branch_refresh_service', None)
+        self.load_thread = None
+        self._awaiting_refresh = False
+        
+        # Branches removidas com sucesso na operação de deleção em andamento
+        self._deleted_branches = set()
+        
+        if self.refresh_service:
+            self.refresh_service.branches_refreshed.connect(self._on_branches_refreshed)
+            self.refresh_service.refresh_failed.connect(self._on_branches_refresh_failed)
     
     def set_hide_protected_branches(self, hide_protected):
         """
@@ -180,6 +247,7 @@ class BranchController(QObject):
             protected_branches (list): Lista de branches protegidas
         """
         self.protected_branches = protected_branches
+        self._protection = ProtectionMatcher(protected_branches)
         self.protected_branches_updated.emit(protected_branches)
         
         # Se já tem branches carregadas, atualizar a visualização
@@ -194,31 +262,19 @@ class BranchController(QObject):
         
         Args:
             branch_name: Nome da branch a ser verificada
-            branch_obj: Objeto Branch do GitLab (opcional)
+            branch_obj: BranchRecord da branch (opcional)
             
         Returns:
             bool: True se a branch for protegida, False caso contrário
         """
-        # Verificar se a branch está protegida pelo GitLab
-        if branch_obj and hasattr(branch_obj, 'protected') and branch_obj.protected:
-            return True
-            
-        # Verificar se o nome exato da branch está na lista de protegidas
-        if branch_name in self.protected_branches:
-            return True
-            
-        # Dividir o nome da branch em partes pelo separador /
-        path_parts = branch_name.split('/')
-        
-        # Verificar se qualquer parte do caminho está na lista de protegidas
-        return any(part in self.protected_branches for part in path_parts)
+        return is_branch_protected(branch_name, self._protection, branch_obj)
     
     def organize_branches_in_tree(self, branches):
         """
         Organiza as branches em uma estrutura de árvore para melhor visualização
         
         Args:
-            branches: Lista de objetos Branch
+            branches: Lista de BranchRecord
             
         Returns:
             dict: Estrutura de árvore onde as chaves são partes do caminho e os valores são
@@ -228,7 +284,7 @@ class BranchController(QObject):
         
         for branch in branches:
             # Verificar se a branch está protegida pelo GitLab
-            is_protected_by_gitlab = hasattr(branch, 'protected') and branch.protected
+            is_protected_by_gitlab = branch.protected
             
             # Se a opção de esconder branches protegidas estiver ativada, 
             # não incluir branches protegidas na árvore
@@ -284,9 +340,13 @@ class BranchController(QObject):
         self.view.set_loading_state(True, "Carregando branches...")
         self.view.clear_branches()
         
-        # Criar e iniciar thread
-        self.load_thread = LoadBranchesThread(self.gitlab_api, self.current_project_id)
-        self.load_thread.branches_loaded.connect(self.on_branches_loaded)
+        # Criar e iniciar thread (as páginas são exibidas à medida que chegam)
+        trace_span = tracing.start_span('BranchController.load_branches', project_id=self.current_project_id)
+        with tracing.activate(trace_span):
+            self.load_thread = LoadBranchesThread(self.gitlab_api, self.current_project_id, stream=True)
+        self.load_thread.finished.connect(trace_span.end)
+        self.load_thread.branches_page_loaded.connect(self.on_branches_page_loaded)
+        self.load_thread.branches_loaded.connect(self.on_branches_stream_completed)
         self.load_thread.branches_failed.connect(self.on_branches_failed)
         self.load_thread.finished.connect(lambda: self.view.set_loading_state(False))
         
@@ -297,7 +357,7 @@ class BranchController(QObject):
         Callback para quando as branches são carregadas com sucesso
         
         Args:
-            branches: Lista de objetos Branch
+            branches: Lista de BranchRecord
         """
         self.branches = branches
         
@@ -309,6 +369,29 @@ class BranchController(QObject):
         
         self.status_updated.emit(f"Carregadas {len(branches)} branches")
     
+    def on_branches_page_loaded(self, branches):
+        """
+        Callback para quando uma página de branches é carregada
+        
+        Args:
+            branches: Lista de BranchRecord da página
+        """
+        # Acrescentar a página à árvore sem esperar pelas demais
+        branch_tree = self.organize_branches_in_tree(branches)
+        self.view.append_tree_branches(branch_tree, self.is_branch_protected)
+    
+    def on_branches_stream_completed(self, branches):
+        """
+        Callback para quando todas as páginas de branches foram carregadas
+        
+        Args:
+            branches: Lista completa de BranchRecord
+        """
+        self.branches = branches
+        self.view.finish_tree_update()
+        
+        self.status_updated.emit(f"Carregadas {len(branches)} branches")
+    
     def on_branches_failed(self, error_message):
         """
         Callback para quando ocorre uma falha ao carregar branches
@@ -332,8 +415,7 @@ class BranchController(QObject):
             return
         
         # Filtrar branches protegidas (verificação extra de segurança)
-        protected_branches = [name for name in branch_names if self.is_branch_protected(name)]
-        branch_names = [name for name in branch_names if not self.is_branch_protected(name)]
+        protected_branches, branch_names = split_protected(branch_names, self._protection)
         
         if protected_branches:
             protected_names = "\n".join(protected_branches)
@@ -376,16 +458,26 @@ class BranchController(QObject):
         total_branches = len(branch_names)
         self.view.prepare_progress(total_branches)
         self.view.set_loading_state(True, "Removendo branches...")
+        self._deleted_branches = set()
         
         # Criar e iniciar thread
         git_repo = self.git_repo_model if delete_local and self.git_repo_model.is_initialized() else None
-        self.delete_thread = DeleteBranchesThread(
-            self.gitlab_api, 
-            self.current_project_id, 
-            branch_names, 
-            delete_local, 
-            git_repo
+        trace_span = tracing.start_span(
+            'BranchController.delete_branches',
+            project_id=self.current_project_id,
+            branch_count=total_branches,
+            delete_local=delete_local
         )
+        with tracing.activate(trace_span):
+            self.delete_thread = DeleteBranchesThread(
+                self.gitlab_api, 
+                self.current_project_id, 
+                branch_names, 
+                delete_local, 
+                git_repo,
+                async_backend=getattr(self.parent_controller, 'async_backend', None)
+            )
+        self.delete_thread.finished.connect(trace_span.end)
         
         self.delete_thread.branch_deleted.connect(self._on_branch_deleted)
         self.delete_thread.branch_failed.connect(self._on_branch_failed)
@@ -401,6 +493,10 @@ class BranchController(QObject):
             branch_name: Nome da branch deletada
         """
         self.view.update_progress(f"Removida: {branch_name}")
+        
+        # Retirar a linha da árvore imediatamente, sem esperar pela nova listagem
+        self._deleted_branches.add(branch_name)
+        self.view.remove_branches([branch_name])
     
     def _on_branch_failed(self, branch_name, error):
         """
@@ -415,77 +511,80 @@ class BranchController(QObject):
     def _on_delete_completed(self):
         """Callback para quando todas as operações de deleção são concluídas"""
         self.view.set_loading_state(False)
-        QMessageBox.information(self.view, "Concluído", "Operação de remoção finalizada.")
         
-        # Recarregar a lista de branches
-        self.load_branches()
+        # As branches removidas já saíram da árvore; a lista em memória acompanha
+        deleted = self._deleted_branches
+        self.branches = [branch for branch in self.branches if branch.name not in deleted]
         
-        # SOLUÇÃO AGRESSIVA: Forçar atualização completa de todas as visualizações de branches
-        if self.parent_controller:
-            # 1. Atualizar o modelo principal no AppController
-            if hasattr(self.parent_controller, 'current_project_id'):
-                # Forçar recarregamento direto da API
-                success, result = self.gitlab_api.get_branches(self.parent_controller.current_project_id)
-                if success:
-                    # Atualizar o modelo no AppController
-                    self.parent_controller.project_branches = result
-                    
-                    # 2. Atualizar a view de merge explicitamente
-                    if hasattr(self.parent_controller, 'merge_controller'):
-                        # Configurar o controller de merge com os dados atualizados
-                        branch_names = [b.name for b in result]
-                        
-                        # Garantir que a tab de merge tenha as branches atualizadas
-                        self.parent_controller.merge_controller.set_project(
-                            self.parent_controller.current_project_id,
-                            self.parent_controller.current_project_name,
-                            branch_names,
-                            self.parent_controller.selected_protected_branches
-                        )
-                        
-                        # 3. Forçar refresh do display
-                        if hasattr(self.parent_controller.merge_controller.view, 'refresh_branches_display'):
-                            # Forçar atualização da view de merge
-                            self.parent_controller.merge_controller.view.refresh_branches_display()
-                            
-            # 4. Notificar o AppController para garantir
-            if hasattr(self.parent_controller, 'update_merge_tab_branches'):
-                self.parent_controller.update_merge_tab_branches()
-
-    def _populate_tree(self, parent_item, branch_dict, is_protected_func, path=""):
+        QMessageBox.information(self.view, "Concluído", "Operação de remoção finalizada.")
+        
+        # Conferir a árvore com a listagem do servidor em segundo plano, aplicando apenas
+        # as diferenças; o resultado do serviço é enviado a todas as telas inscritas
+        # (árvore de branches, aba de merge e AppController)
+        self.status_updated.emit("Conferindo branches com o servidor...")
+        if self.refresh_service:
+            self._awaiting_refresh = True
+            self.refresh_service.refresh(self.current_project_id, after_write=True)
+        else:
+            self.reconcile_thread = LoadBranchesThread(self.gitlab_api, self.current_project_id)
+            self.reconcile_thread.branches_loaded.connect(self._reconcile_branches)
+            self.reconcile_thread.branches_failed.connect(self.on_branches_failed)
+            self.reconcile_thread.start()
+    
+    def _on_branches_refreshed(self, project_id, branches):
         """
-        Popula a árvore recursivamente
+        Callback para quando o serviço de atualização entrega as branches de um projeto
         
         Args:
-            parent_item: Item pai da árvore
-            branch_dict: Dicionário contendo a estrutura de branches
-            is_protected_func: Função para verificar se uma branch é protegida
-            path: Caminho acumulado
-        """
-        # Ordenar as chaves para manter a ordem alfabética
-        sorted_keys = sorted(branch_dict.keys())
-        
-        for key in sorted_keys:
-            # Pular a chave especial __branch
-            if key == "__branch":
-                continue
-                
-            value = branch_dict[key]
-            current_path = path + "/" + key if path else key
+            project_id: ID do projeto recarregado
+            branches: Lista de BranchRecord
+        """
+        if project_id != self.current_project_id:
+            return
+        
+        # Um carregamento próprio em andamento já vai exibir a lista completa
+        if self.load_thread and self.load_thread.isRunning():
+            return
+        
+        self._awaiting_refresh = False
+        
+        # Com a árvore já montada, aplicar apenas as diferenças preserva a expansão e a seleção
+        if self.branches:
+            self._reconcile_branches(branches)
+        else:
+            self.on_branches_loaded(branches)
             
-            # Verificar se é uma folha (branch) ou um diretório
-            is_branch = "__branch" in value
+    def _reconcile_branches(self, branches):
+        """
+        Atualiza a árvore exibida com as diferenças em relação a uma nova listagem
+        
+        Branches que sumiram saem da árvore; branches novas entram, e as que mudaram
+        (head movido, proteção, merge ou branch padrão) são substituídas.
+        
+        Args:
+            branches: Lista atual de BranchRecord do servidor
+        """
+        delta = diff_branches(self.branches, branches)
+        self.branches = branches
+        if delta:
+            branch_tree = self.organize_branches_in_tree(delta.added + delta.updated)
+            self.view.update_tree_branches(delta.removed + delta.updated_names, branch_tree, self.is_branch_protected)
             
-            if is_branch:
-                branch = value["__branch"]
-                is_protected = is_protected_func(branch.name, branch)
-                branch_item = self._create_branch_item(parent_item, key, branch, is_protected)
-            else:
-                # É um diretório, criar item do diretório
-                dir_item = self._create_branch_item(parent_item, key)
-                
-                # Processar recursivamente os itens deste diretório
-                self._populate_tree(dir_item, value, is_protected_func, current_path)
+        self.status_updated.emit(f"Carregadas {len(branches)} branches")
+    
+    def _on_branches_refresh_failed(self, project_id, error_message):
+        """
+        Callback para quando o serviço de atualização falha
+        
+        Args:
+            project_id: ID do projeto
+            error_message: Mensagem de erro
+        """
+        if project_id != self.current_project_id or not self._awaiting_refresh:
+            return
+        
+        self._awaiting_refresh = False
+        self.on_branches_failed(f"Falha ao atualizar branches: {error_message}")
 
     def get_protected_branches(self, project_id, callback):
         """
@@ -0,0 +1,126 @@
+"""
+Serviço de atualização assíncrona das branches de um projeto
+"""
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+class RefreshBranchesThread(QThread):
+    """
+    Thread para recarregar as branches de um projeto sem bloquear a interface
+    """
+    refreshed = pyqtSignal(object, bool, object)  # (project_id, sucesso, resultado)
+    
+    def __init__(self, gitlab_api, project_id, parent=None):
+        """
+        Inicializa a thread
+        
+        Args:
+            gitlab_api: Instância do GitLabAPI
+            project_id: ID do projeto a ser carregado
+            parent: Objeto pai
+        """
+        super().__init__(parent)
+        self.gitlab_api = gitlab_api
+        self.project_id = project_id
+        
+    def run(self):
+        """Executa a thread para carregar as branches"""
+        try:
+            success, result = self.gitlab_api.get_branches(self.project_id)
+        except Exception as e:
+            success, result = False, str(e)
+        self.refreshed.emit(self.project_id, success, result)
+
+
+class BranchRefreshService(QObject):
+    """
+    Serviço responsável por recarregar as branches fora da thread da interface
+    
+    Pedidos simultâneos para o mesmo projeto são atendidos por uma única busca em
+    andamento, e o resultado é enviado a todos os controllers inscritos nos sinais.
+    """
+    branches_refreshed = pyqtSignal(object, list)  # (project_id, lista de BranchRecord)
+    refresh_failed = pyqtSignal(object, str)       # (project_id, mensagem de erro)
+    
+    def __init__(self, gitlab_api, parent=None):
+        """
+        Inicializa o serviço
+        
+        Args:
+            gitlab_api: Instância do GitLabAPI
+            parent: Objeto pai
+        """
+        super().__init__(parent)
+        self.gitlab_api = gitlab_api
+        
+        # Buscas em andamento: {project_id: thread}
+        self._threads = {}
+        
+        # Projetos cuja busca em andamento começou antes de uma alteração nas branches
+        self._stale = set()
+        
+    def refresh(self, project_id, after_write=False):
+        """
+        Solicita a atualização das branches de um projeto
+        
+        Args:
+            project_id: ID do projeto no GitLab
+            after_write (bool): True se as branches acabaram de ser alteradas; nesse caso
+                uma busca já em andamento é refeita antes de entregar o resultado
+        """
+        if project_id is None:
+            return
+            
+        if project_id in self._threads:
+            # Aproveitar a busca em andamento, a menos que ela possa estar desatualizada
+            if after_write:
+                self._stale.add(project_id)
+            return
+            
+        self._start(project_id)
+        
+    def is_refreshing(self, project_id):
+        """
+        Verifica se há uma busca em andamento para o projeto
+        
+        Args:
+            project_id: ID do projeto no GitLab
+            
+        Returns:
+            bool: True se as branches do projeto estão sendo recarregadas
+        """
+        return project_id in self._threads
+        
+    def _start(self, project_id):
+        """
+        Inicia a busca das branches de um projeto
+        
+        Args:
+            project_id: ID do projeto no GitLab
+        """
+        thread = RefreshBranchesThread(self.gitlab_api, project_id, self)
+        thread.refreshed.connect(self._on_thread_refreshed)
+        thread.finished.connect(thread.deleteLater)
+        self._threads[project_id] = thread
+        thread.start()
+        
+    def _on_thread_refreshed(self, project_id, success, result):
+        """
+        Callback para quando uma busca termina
+        
+        Args:
+            project_id: ID do projeto recarregado
+            success: True se as branches foram obtidas
+            result: Lista de BranchRecord ou mensagem de erro
+        """
+        self._threads.pop(project_id, None)
+        
+        # Descartar um resultado que pode não conter a última alteração e buscar de novo
+        if project_id in self._stale:
+            self._stale.discard(project_id)
+            self._start(project_id)
+            return
+            
+        if success:
+            self.branches_refreshed.emit(project_id, result)
+        else:
+            self.refresh_failed.emit(project_id, str(result))
\ No newline at end of file
@@ -3,7 +3,9 @@ Controller para gerenciar as operações de merge de branches
 """
 from PyQt6.QtWidgets import QMessageBox
 from PyQt6.QtCore import QThread, pyqtSignal, QObject
-import time
+
+from models.merge_pipeline import MergePipeline
+from utils import tracing
 
 class MergeBranchesThread(QThread):
     """
@@ -15,7 +17,8 @@ class MergeBranchesThread(QThread):
     merge_skipped = pyqtSignal(str, str, str)  # (source_branch, target_branch, reason)
     all_completed = pyqtSignal(bool, list)  # (success, failed_merges)
     
-    def __init__(self, gitlab_api, project_id, source_branch, target_branches, squash=False, parent=None):
+    def __init__(self, gitlab_api, project_id, source_branch, target_branches, squash=False,
+                 check_workers=None, merge_workers=None, async_backend=None, parent=None):
         """
         Inicializa a thread
         
@@ -25,6 +28,10 @@ class MergeBranchesThread(QThread):
             source_branch: Nome da branch de origem
             target_branches: Lista de nomes de branches de destino
             squash: Se deve combinar commits em um único
+            check_workers: Número máximo de verificações simultâneas (opcional)
+            merge_workers: Número máximo de merges simultâneos (opcional)
+            async_backend: AsyncGitLabBackend; se informado, verificações e merges rodam
+                como corrotinas no loop do backend (opcional)
             parent: Objeto pai
         """
         super().__init__(parent)
@@ -33,121 +40,49 @@ class MergeBranchesThread(QThread):
         self.source_branch = source_branch
         self.target_branches = target_branches
         self.squash = squash
-        self.failed_merges = []
-        self.skipped_merges = []
+        self.pipeline = MergePipeline(
+            gitlab_api,
+            project_id,
+            source_branch,
+            target_branches,
+            squash,
+            check_workers=check_workers,
+            merge_workers=merge_workers,
+            async_backend=async_backend
+        )
+        self.failed_merges = self.pipeline.failed_merges
+        self.skipped_merges = self.pipeline.skipped_merges
         self.terminated = False
         
+        # Span da ação que criou a thread, usado como pai das chamadas feitas nela
+        self.trace_parent = tracing.current_span()
+        
     def run(self):
-        """Executa a thread para realizar os merges sequencialmente"""
-        overall_success = True
-        current_index = 0
-        total_branches = len(self.target_branches)
-        
-        for target_branch in self.target_branches:
-            if self.terminated:
-                break
-                
-            # Emitir sinal de início do merge
-            self.merge_started.emit(self.source_branch, target_branch)
-            current_index += 1
-            
-            # Verificar diferenças entre as branches
-            success, has_diff, message = self.gitlab_api.check_branch_differences(
-                self.project_id, self.source_branch, target_branch
-            )
-            
-            if not success:
-                # Erro ao verificar diferenças
-                # Se a mensagem contiver algo relacionado a MR, pode ser que o merge possa continuar
-                # Se contém "404", provavelmente significa que não há diferenças
-                if "há um mr aberto" in message.lower() or "404" in message:
-                    # Continuar com o merge, pois já existe um MR ou não há diferenças
-                    if "404" in message:
-                        reason = f"Não há diferenças significativas entre {self.source_branch} e {target_branch} (indicado por 404)"
-                        self.merge_skipped.emit(self.source_branch, target_branch, reason)
-                        self.skipped_merges.append((target_branch, reason))
-                        self.merge_completed.emit(self.source_branch, target_branch, True)
-                        continue
-                else:
-                    self.merge_error.emit(self.source_branch, target_branch, f"Erro ao verificar diferenças: {message}")
-                    self.failed_merges.append((target_branch, f"Erro ao verificar diferenças: {message}"))
-                    overall_success = False
-                    continue
-                
-            if not has_diff:
-                # Sem diferenças, não precisa de merge
-                reason = f"Não há diferenças entre {self.source_branch} e {target_branch} (merge não necessário)"
-                self.merge_skipped.emit(self.source_branch, target_branch, reason)
-                self.skipped_merges.append((target_branch, reason))
-                self.merge_completed.emit(self.source_branch, target_branch, True)
-                continue
-                
-            # Verificar conflitos antes de tentar merge
-            success, has_conflicts, message = self.gitlab_api.check_merge_conflicts(
-                self.project_id, self.source_branch, target_branch
-            )
-            
-            if not success:
-                # Erro ao verificar conflitos
-                # Se a mensagem indicar que o MR já foi mesclado, podemos considerar como sucesso
-                # Se contém "404", provavelmente significa que não há conflitos
-                if "já realizado" in message.lower() or "404" in message:
-                    if "já realizado" in message.lower():
-                        reason = f"Merge de {self.source_branch} para {target_branch} já foi realizado anteriormente"
-                    else:
-                        reason = f"Não há conflitos entre {self.source_branch} e {target_branch} (indicado por 404)"
-                    
-                    self.merge_skipped.emit(self.source_branch, target_branch, reason)
-                    self.skipped_merges.append((target_branch, reason))
-                    self.merge_completed.emit(self.source_branch, target_branch, True)
-                    continue
-                else:
-                    self.merge_error.emit(self.source_branch, target_branch, f"Erro ao verificar conflitos: {message}")
-                    self.failed_merges.append((target_branch, f"Erro ao verificar conflitos: {message}"))
-                    overall_success = False
-                    continue
-                
-            if has_conflicts:
-                # Há conflitos, não pode fazer merge automático
-                self.merge_error.emit(self.source_branch, target_branch, "Existem conflitos de merge que precisam ser resolvidos manualmente")
-                self.failed_merges.append((target_branch, "Conflitos de merge detectados"))
-                overall_success = False
-                # Como foi especificado cancelar todo o processo em caso de conflito
-                break
-                
-            # Realizar o merge
-            success, message = self.gitlab_api.merge_branches(
-                self.project_id, self.source_branch, target_branch, self.squash
-            )
-            
-            if success:
-                # Se a mensagem contiver "já realizado", considerar como um skip
-                if "já realizado" in message.lower():
-                    self.merge_skipped.emit(self.source_branch, target_branch, message)
-                    self.skipped_merges.append((target_branch, message))
-                
-                self.merge_completed.emit(self.source_branch, target_branch, True)
-            else:
-                # Se a mensagem de erro contiver "404", provavelmente significa que não há conflitos/diferenças
-                if "404" in message:
-                    reason = f"Não há diferenças significativas entre {self.source_branch} e {target_branch} (indicado por 404)"
-                    self.merge_skipped.emit(self.source_branch, target_branch, reason)
-                    self.skipped_merges.append((target_branch, reason))
-                    self.merge_completed.emit(self.source_branch, target_branch, True)
-                else:
-                    self.merge_error.emit(self.source_branch, target_branch, message)
-                    self.failed_merges.append((target_branch, message))
-                    overall_success = False
-                
-            # Pequena pausa para não sobrecarregar o servidor
-            time.sleep(0.5)
-            
+        """Executa a thread: verifica todos os destinos em paralelo e depois realiza os merges"""
+        with tracing.activate(self.trace_parent):
+            overall_success = self._run_pipeline()
+        
         # Emitir sinal de conclusão geral
         self.all_completed.emit(overall_success, self.failed_merges)
         
+    def _run_pipeline(self):
+        """
+        Executa o pipeline, emitindo os sinais de cada destino
+        
+        Returns:
+            bool: True se todas as operações foram bem-sucedidas
+        """
+        return self.pipeline.run(
+            on_started=lambda target: self.merge_started.emit(self.source_branch, target),
+            on_completed=lambda target, success: self.merge_completed.emit(self.source_branch, target, success),
+            on_error=lambda target, message: self.merge_error.emit(self.source_branch, target, message),
+            on_skipped=lambda target, reason: self.merge_skipped.emit(self.source_branch, target, reason)
+        )
+        
     def terminate(self):
         """Termina a thread de forma segura"""
         self.terminated = True
+        self.pipeline.cancel()
         super().terminate()
 
 
@@ -204,6 +139,16 @@ class MergeController(QObject):
         self.view.set_project_name(project_name)
         self.view.set_branches(branches, protected_branches)
         
+    def apply_branch_changes(self, added_branches, removed_branches):
+        """
+        Aplica à view as branches que entraram ou saíram do projeto, sem reconfigurá-la
+        
+        Args:
+            added_branches (list): Nomes das branches novas
+            removed_branches (list): Nomes das branches que deixaram de existir
+        """
+        self.view.apply_branch_delta(added_branches, removed_branches)
+        
     def _on_merge_requested(self, source_branch, target_branches, delete_source, squash):
         """
         Callback para quando o usuário solicita o merge
@@ -226,14 +171,38 @@ class MergeController(QObject):
         self.source_branch = source_branch
         self.delete_source = delete_source
         
-        # Criar e iniciar a thread de merge
-        self.merge_thread = MergeBranchesThread(
-            self.gitlab_api,
-            self.current_project_id,
-            source_branch,
-            target_branches,
-            squash
+        # Criar e iniciar a thread de merge; com o backend assíncrono habilitado, todos os
+        # destinos são agendados como corrotinas no loop assíncrono, sem uma thread por destino
+        async_backend = getattr(self.parent_controller, 'async_backend', None)
+        trace_span = tracing.start_span(
+            'MergeController.merge_branches',
+            project_id=self.current_project_id,
+            source_branch=source_branch,
+            target_count=len(target_branches),
+            squash=squash,
+            async_backend=bool(async_backend)
         )
+        with tracing.activate(trace_span):
+            if async_backend:
+                self.merge_thread = MergeBranchesThread(
+                    self.gitlab_api,
+                    self.current_project_id,
+                    source_branch,
+                    target_branches,
+                    squash,
+                    check_workers=async_backend.CHECK_WORKERS,
+                    merge_workers=async_backend.MERGE_WORKERS,
+                    async_backend=async_backend
+                )
+            else:
+                self.merge_thread = MergeBranchesThread(
+                    self.gitlab_api,
+                    self.current_project_id,
+                    source_branch,
+                    target_branches,
+                    squash
+                )
+        self.merge_thread.finished.connect(trace_span.end)
         
         # Conectar sinais da thread
         self.merge_thread.merge_started.connect(self._on_merge_started)
@@ -414,17 +383,13 @@ class MergeController(QObject):
         if hasattr(self, 'branch_deletion_pending') and self.branch_deletion_pending:
             self.branch_deletion_pending = False
             
-            # Forçar recarregamento das branches no projeto atual
+            # Forçar recarregamento das branches no projeto atual, em segundo plano;
+            # o AppController atualiza a lista de branches e a tela de merge ao receber o resultado
             if hasattr(self.parent_controller, 'current_project_id'):
-                # Recarregar as branches do projeto
-                success, result = self.gitlab_api.get_branches(self.parent_controller.current_project_id)
-                if success:
-                    # Atualizar a lista de branches no controller principal
-                    self.parent_controller.project_branches = result
-                    
-                    # Forçar a atualização da tela de merge
-                    if hasattr(self.parent_controller, 'update_merge_tab_branches'):
-                        self.parent_controller.update_merge_tab_branches()
+                self.parent_controller.branch_refresh_service.refresh(
+                    self.parent_controller.current_project_id,
+                    after_write=True
+                )
         
         if self.parent_controller:
             self.parent_controller.show_projects() 
\ No newline at end of file
@@ -8,21 +8,24 @@ class LoadProjectsThread(QThread):
     """Thread para carregar projetos sem bloquear a UI"""
     
     # Sinais para comunicar resultado
-    projects_loaded = pyqtSignal(list)  # lista de projetos
+    projects_loaded = pyqtSignal(list)  # página de projetos (ou a lista completa, sem streaming)
     projects_failed = pyqtSignal(str)   # mensagem de erro
     
-    def __init__(self, gitlab_api):
+    def __init__(self, gitlab_api, stream=True):
         super().__init__()
         self.gitlab_api = gitlab_api
+        self.stream = stream
         
     def run(self):
         """Executa o carregamento de projetos em uma thread separada"""
         try:
-            success, projects = self.gitlab_api.get_projects()
+            # Cada página é repassada à interface assim que chega
+            page_callback = self.projects_loaded.emit if self.stream else None
+            success, projects = self.gitlab_api.get_projects(page_callback=page_callback)
             
-            if success:
+            if success and not self.stream:
                 self.projects_loaded.emit(projects)
-            else:
+            elif not success:
                 self.projects_failed.emit(projects)  # projects contém a mensagem de erro
         except Exception as e:
             self.projects_failed.emit(f"Erro inesperado: {str(e)}")
@@ -60,24 +63,45 @@ class ProjectController:
         # Mostrar mensagem de carregamento
         self.view.set_loading_state(True, "Carregando projetos...")
         
+        # As páginas são acrescentadas à medida que chegam
+        self.view.clear_projects()
+        
+        # Exibir imediatamente a última lista em cache; a do servidor a substitui ao final
+        cached_projects = self.gitlab_api.get_cached_projects()
+        if cached_projects:
+            self.on_projects_loaded(cached_projects)
+        
         # Criar e iniciar thread de carregamento
-        self.projects_thread = LoadProjectsThread(self.gitlab_api)
-        self.projects_thread.projects_loaded.connect(self.on_projects_loaded)
+        self.projects_thread = LoadProjectsThread(self.gitlab_api, stream=not cached_projects)
+        if cached_projects:
+            self.projects_thread.projects_loaded.connect(self.on_projects_revalidated)
+        else:
+            self.projects_thread.projects_loaded.connect(self.on_projects_loaded)
         self.projects_thread.projects_failed.connect(self.on_projects_failed)
         self.projects_thread.finished.connect(self.on_thread_finished)
         self.projects_thread.start()
     
     def on_projects_loaded(self, projects):
-        """Callback para quando os projetos são carregados com sucesso"""
-        self.view.clear_projects()
-        for project in projects:
-            self.view.add_project(
-                project.id, 
-                project.name, 
-                project.path_with_namespace
-            )
+        """Callback para quando uma página de projetos é carregada com sucesso"""
+        self.view.add_projects([
+            (project.id, project.name, project.path_with_namespace)
+            for project in projects
+        ])
+        
+        self.parent.set_status(f"Carregados {len(self.view.projects)} projetos")
+    
+    def on_projects_revalidated(self, projects):
+        """Callback para quando a lista completa substitui os projetos exibidos do cache"""
+        fresh_projects = [
+            (project.id, project.name, project.path_with_namespace)
+            for project in projects
+        ]
+        shown_projects = [(p['id'], p['name'], p['path']) for p in self.view.projects]
+        
+        if fresh_projects != shown_projects:
+            self.view.replace_projects(fresh_projects)
         
-        self.parent.set_status(f"Carregados {len(projects)} projetos")
+        self.parent.set_status(f"Carregados {len(self.view.projects)} projetos")
     
     def on_projects_failed(self, error_message):
         """Callback para quando ocorre falha no carregamento dos projetos"""
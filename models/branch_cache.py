@@ -0,0 +1,162 @@
+"""
+Cache persistente (SQLite) das listagens obtidas do GitLab
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Página de uma listagem armazenada no cache
+CachedPage = namedtuple('CachedPage', ['etag', 'last_modified', 'next_url', 'payload'])
+
+
+class BranchCache:
+    """
+    Modelo responsável por guardar em disco projetos, branches e branches protegidas
+    
+    Cada listagem é armazenada página a página, por URL da instância e ID do projeto,
+    junto com os cabeçalhos ETag e Last-Modified da resposta. Assim ela pode ser
+    exibida imediatamente e depois revalidada com requisições condicionais.
+    """
+    
+    def __init__(self, db_path=None):
+        """
+        Inicializa o cache
+        
+        Args:
+            db_path (str): Caminho do arquivo SQLite (opcional, usa o diretório do usuário)
+        """
+        self.db_path = db_path or self.default_path()
+        self._lock = threading.Lock()
+        self._connection = None
+        
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    instance_url TEXT NOT NULL,
+                    project_id INTEGER NOT NULL,
+                    resource TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    next_url TEXT,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (instance_url, project_id, resource, page)
+                )
+            """)
+            self._connection.commit()
+        except (OSError, sqlite3.Error):
+            # Sem o cache em disco a aplicação continua funcionando normalmente
+            self._connection = None
+            
+    @staticmethod
+    def default_path():
+        """
+        Retorna o caminho padrão do arquivo de cache
+        
+        Returns:
+            str: Caminho do arquivo SQLite no diretório do usuário
+        """
+        return os.path.join(os.path.expanduser("~"), ".gitlab_branch_manager", "cache.sqlite3")
+        
+    def is_available(self):
+        """
+        Verifica se o cache pôde ser aberto
+        
+        Returns:
+            bool: True se o cache está disponível
+        """
+        return self._connection is not None
+        
+    def get_pages(self, instance_url, project_id, resource):
+        """
+        Retorna as páginas armazenadas de uma listagem
+        
+        Args:
+            instance_url (str): URL da instância do GitLab
+            project_id (int): ID do projeto (0 para listagens que não pertencem a um projeto)
+            resource (str): Nome da listagem ('projects', 'branches', 'protected_branches')
+            
+        Returns:
+            list: Lista de CachedPage em ordem (vazia se não houver cache)
+        """
+        if not self._connection:
+            return []
+            
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    """
+                    SELECT etag, last_modified, next_url, payload FROM pages
+                    WHERE instance_url = ? AND project_id = ? AND resource = ?
+                    ORDER BY page
+                    """,
+                    (instance_url, project_id, resource)
+                ).fetchall()
+            return [
+                CachedPage(etag, last_modified, next_url, json.loads(payload))
+                for etag, last_modified, next_url, payload in rows
+            ]
+        except (sqlite3.Error, ValueError):
+            return []
+            
+    def store_pages(self, instance_url, project_id, resource, pages):
+        """
+        Substitui as páginas armazenadas de uma listagem
+        
+        Args:
+            instance_url (str): URL da instância do GitLab
+            project_id (int): ID do projeto (0 para listagens que não pertencem a um projeto)
+            resource (str): Nome da listagem
+            pages (list): Lista de CachedPage em ordem
+        """
+        if not self._connection:
+            return
+            
+        now = time.time()
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "DELETE FROM pages WHERE instance_url = ? AND project_id = ? AND resource = ?",
+                    (instance_url, project_id, resource)
+                )
+                self._connection.executemany(
+                    """
+                    INSERT INTO pages
+                        (instance_url, project_id, resource, page, etag, last_modified,
+                         next_url, payload, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (instance_url, project_id, resource, index, page.etag,
+                         page.last_modified, page.next_url, json.dumps(page.payload), now)
+                        for index, page in enumerate(pages, start=1)
+                    ]
+                )
+        except sqlite3.Error:
+            # Uma falha de escrita apenas faz a próxima leitura ir ao servidor
+            pass
+            
+    def clear(self, instance_url=None):
+        """
+        Remove listagens do cache
+        
+        Args:
+            instance_url (str): URL da instância a ser limpa (None limpa tudo)
+        """
+        if not self._connection:
+            return
+            
+        try:
+            with self._lock, self._connection:
+                if instance_url is None:
+                    self._connection.execute("DELETE FROM pages")
+                else:
+                    self._connection.execute("DELETE FROM pages WHERE instance_url = ?", (instance_url,))
+        except sqlite3.Error:
+            pass
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Remoção concorrente de branches remotas no GitLab
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import tracing
+
+class BranchDeleter:
+    """
+    Modelo responsável por remover várias branches remotas em paralelo
+    
+    As deleções são distribuídas em um pool limitado de threads que compartilham a
+    sessão HTTP do GitLabAPI. Os resultados são entregues na thread que chamou
+    delete_branches, à medida que cada deleção termina.
+    """
+    
+    # Número padrão de deleções simultâneas
+    DEFAULT_MAX_WORKERS = 8
+    
+    def __init__(self, gitlab_api, max_workers=None):
+        """
+        Inicializa o removedor de branches
+        
+        Args:
+            gitlab_api: Instância do GitLabAPI
+            max_workers (int): Número máximo de deleções simultâneas (opcional)
+        """
+        self.gitlab_api = gitlab_api
+        self.max_workers = max(1, max_workers or self.DEFAULT_MAX_WORKERS)
+        
+    def delete_branches(self, project_id, branch_names, on_result=None):
+        """
+        Remove as branches informadas
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_names (list): Nomes das branches a serem removidas
+            on_result (callable): Chamado com (nome, sucesso, mensagem) a cada deleção
+                concluída, sempre na thread que chamou este método
+                
+        Returns:
+            dict: {nome_da_branch: (sucesso, mensagem)}
+        """
+        results = {}
+        if not branch_names:
+            return results
+            
+        workers = min(self.max_workers, len(branch_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(tracing.wrap(self._delete_branch), project_id, branch_name): branch_name
+                for branch_name in branch_names
+            }
+            
+            for future in as_completed(futures):
+                branch_name = futures[future]
+                success, message = future.result()
+                results[branch_name] = (success, message)
+                
+                if on_result:
+                    on_result(branch_name, success, message)
+                    
+        return results
+        
+    def _delete_branch(self, project_id, branch_name):
+        """
+        Remove uma branch, convertendo exceções inesperadas em falha
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_name (str): Nome da branch a ser removida
+            
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        try:
+            return self.gitlab_api.delete_branch(project_id, branch_name)
+        except Exception as e:
+            return False, str(e)
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Comparação incremental de listagens de branches
+"""
+
+
+def branch_state(branch):
+    """
+    Retorna os campos de uma branch que, ao mudar, exigem atualizar sua exibição
+    
+    Args:
+        branch (BranchRecord): Registro da branch
+        
+    Returns:
+        tuple: (SHA do último commit, protegida, mesclada, padrão)
+    """
+    return (branch.commit_sha, branch.protected, branch.merged, branch.default)
+
+
+class BranchDelta:
+    """
+    Diferenças entre duas listagens de branches do mesmo projeto
+    
+    As telas aplicam apenas as branches que entraram, saíram ou mudaram, de modo
+    que uma alteração em uma branch não exige redesenhar a lista inteira.
+    """
+    
+    __slots__ = ('added', 'removed', 'updated')
+    
+    def __init__(self, added=None, removed=None, updated=None):
+        """
+        Inicializa o delta
+        
+        Args:
+            added (list): BranchRecord das branches novas
+            removed (list): Nomes das branches que deixaram de existir
+            updated (list): BranchRecord das branches cujo último commit (ou estado) mudou
+        """
+        self.added = added or []
+        self.removed = removed or []
+        self.updated = updated or []
+        
+    def __bool__(self):
+        return bool(self.added or self.removed or self.updated)
+        
+    def __repr__(self):
+        return f"BranchDelta(+{len(self.added)}, -{len(self.removed)}, ~{len(self.updated)})"
+        
+    @property
+    def names_changed(self):
+        """bool: True se alguma branch entrou ou saiu da listagem"""
+        return bool(self.added or self.removed)
+        
+    @property
+    def added_names(self):
+        """list: Nomes das branches novas"""
+        return [branch.name for branch in self.added]
+        
+    @property
+    def updated_names(self):
+        """list: Nomes das branches alteradas"""
+        return [branch.name for branch in self.updated]
+
+
+def diff_branches(old_branches, new_branches):
+    """
+    Compara duas listagens de branches pelo nome e pelo SHA do último commit
+    
+    Uma branch com o mesmo nome é considerada alterada quando seu head se moveu ou
+    quando mudou a proteção, o estado de merge ou a branch padrão do projeto.
+    
+    Args:
+        old_branches (list): BranchRecord da listagem anterior (em cache ou exibida)
+        new_branches (list): BranchRecord da listagem atual
+        
+    Returns:
+        BranchDelta: Branches adicionadas, removidas e alteradas, na ordem das listagens
+    """
+    old_states = {branch.name: branch_state(branch) for branch in old_branches}
+    new_names = set()
+    added, updated = [], []
+    for branch in new_branches:
+        new_names.add(branch.name)
+        state = old_states.get(branch.name)
+        if state is None:
+            added.append(branch)
+        elif state != branch_state(branch):
+            updated.append(branch)
+    removed = [name for name in old_states if name not in new_names]
+    return BranchDelta(added, removed, updated)
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Representação compacta de uma branch do GitLab
+"""
+
+
+class BranchRecord:
+    """
+    Registro leve de uma branch, com apenas os campos usados pela aplicação
+    
+    Os objetos ProjectBranch do python-gitlab guardam o JSON completo da resposta
+    (incluindo o commit inteiro) em dicionários por instância. Com __slots__, cada
+    registro ocupa uma fração dessa memória, o que faz diferença em projetos com
+    dezenas de milhares de branches.
+    """
+    
+    __slots__ = ('name', 'protected', 'merged', 'default', 'commit_sha', 'committed_date')
+    
+    def __init__(self, name, protected=False, merged=False, default=False,
+                 commit_sha=None, committed_date=None):
+        """
+        Inicializa o registro da branch
+        
+        Args:
+            name (str): Nome da branch
+            protected (bool): Se a branch é protegida no GitLab
+            merged (bool): Se a branch já foi mesclada na branch padrão
+            default (bool): Se é a branch padrão do projeto
+            commit_sha (str): SHA do último commit da branch
+            committed_date (str): Data do último commit (ISO 8601)
+        """
+        self.name = name
+        self.protected = protected
+        self.merged = merged
+        self.default = default
+        self.commit_sha = commit_sha
+        self.committed_date = committed_date
+        
+    @classmethod
+    def from_json(cls, data):
+        """
+        Cria um registro a partir do JSON devolvido pela API de branches
+        
+        Args:
+            data (dict): Item da resposta de /projects/:id/repository/branches
+            
+        Returns:
+            BranchRecord: Registro com os campos relevantes
+        """
+        commit = data.get('commit') or {}
+        return cls(
+            data['name'],
+            bool(data.get('protected', False)),
+            bool(data.get('merged', False)),
+            bool(data.get('default', False)),
+            commit.get('id'),
+            commit.get('committed_date')
+        )
+        
+    def to_json(self):
+        """
+        Converte o registro para o mesmo formato aceito por from_json
+        
+        Returns:
+            dict: Representação serializável com apenas os campos do registro
+        """
+        return {
+            'name': self.name,
+            'protected': self.protected,
+            'merged': self.merged,
+            'default': self.default,
+            'commit': {'id': self.commit_sha, 'committed_date': self.committed_date}
+        }
+    
+    def __repr__(self):
+        return f"BranchRecord(name={self.name!r}, protected={self.protected}, commit_sha={self.commit_sha!r})"
\ No newline at end of file
@@ -1,26 +1,195 @@
 """
 Classe para gerenciar a comunicação com a API do GitLab
 """
-import gitlab
+import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import gitlab
+from gitlab.v4.objects import Project
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from models.branch_cache import CachedPage
+from models.branch_deleter import BranchDeleter
+from models.branch_record import BranchRecord
+from models.merge_pipeline import MergePipeline
+from models.rate_limiter import RateLimitedSession
+from utils import tracing
+from utils.branch_protection import GitLabRuleMatcher
+from utils.metrics import measured, registry
 
 class GitLabAPI:
     """
     Modelo responsável pela comunicação com a API do GitLab
     """
     
-    def __init__(self, url=None, token=None):
+    # Tempo (em segundos) que um projeto permanece válido no cache da sessão
+    PROJECT_CACHE_TTL = 300
+    
+    # Quantidade de projetos solicitados por página
+    PROJECTS_PER_PAGE = 100
+    
+    # Número máximo de páginas de projetos carregadas em paralelo
+    PROJECTS_PAGE_WORKERS = 4
+    
+    # Quantidade de branches solicitadas por página
+    BRANCHES_PER_PAGE = 100
+    
+    # Tentativas extras de uma deleção após erros transitórios (429 e 5xx)
+    DELETE_MAX_RETRIES = 3
+    
+    # Tempo (em segundos) em que o resultado de uma leitura é reaproveitado por
+    # chamadas idênticas feitas logo em seguida
+    SINGLE_FLIGHT_TTL = 2.0
+    
+    # Espera pelo cálculo de mesclabilidade de um MR: intervalo inicial, máximo e tempo limite
+    CONFLICT_POLL_INITIAL_DELAY = 0.25
+    CONFLICT_POLL_MAX_DELAY = 2.0
+    CONFLICT_POLL_TIMEOUT = 20.0
+    
+    # Status de MR que indicam que a mesclabilidade ainda está sendo calculada
+    PENDING_DETAILED_MERGE_STATUSES = ('unchecked', 'checking', 'preparing', 'approvals_syncing')
+    PENDING_MERGE_STATUSES = ('unchecked', 'checking', 'cannot_be_merged_recheck')
+    
+    # Quantidade máxima de vereditos de conflito guardados
+    CONFLICT_VERDICT_CACHE_SIZE = 512
+    
+    # Quantidade máxima de comparações entre commits guardadas
+    COMPARE_CACHE_SIZE = 1024
+    
+    # Tempo (em segundos) em que o índice de branches da última listagem é considerado válido
+    BRANCH_INDEX_TTL = 120
+    
+    # Conexões mantidas abertas por host: o maior pool de workers mais folga para as
+    # threads da interface (listagens e revalidações)
+    HTTP_POOL_SIZE = max(
+        PROJECTS_PAGE_WORKERS,
+        BranchDeleter.DEFAULT_MAX_WORKERS,
+        MergePipeline.DEFAULT_CHECK_WORKERS
+    ) + 4
+    
+    # Novas tentativas no nível HTTP para falhas de conexão e erros de gateway
+    HTTP_RETRIES = 3
+    HTTP_RETRY_BACKOFF = 0.3
+    
+    # Carregamento dos projetos pela API GraphQL (GITLAB_GRAPHQL=1); sem ela, ou se o
+    # servidor não a suportar, são usadas as listagens REST
+    GRAPHQL_ENABLED = os.environ.get('GITLAB_GRAPHQL', '').lower() in ('1', 'true', 'yes')
+    
+    # Quantidade de nomes de branches solicitados por consulta GraphQL
+    GRAPHQL_BRANCHES_PER_PAGE = 1000
+    
+    # Tempo (em segundos) em que a lista de MRs abertos da visão geral é considerada válida
+    OPEN_MERGE_REQUESTS_TTL = 120
+    
+    # Branches, regras de proteção e MRs abertos de um projeto; cada listagem deixa de
+    # ser pedida (@include) quando sua última página já foi recebida
+    PROJECT_OVERVIEW_QUERY = """
+    query($ids: [ID!], $branchOffset: Int!, $branchLimit: Int!, $withBranches: Boolean!,
+          $rulesAfter: String, $withRules: Boolean!, $mrsAfter: String, $withMrs: Boolean!) {
+      projects(ids: $ids) {
+        nodes {
+          repository @include(if: $withBranches) {
+            rootRef
+            branchNames(searchPattern: "*", offset: $branchOffset, limit: $branchLimit)
+          }
+          branchRules(first: 100, after: $rulesAfter) @include(if: $withRules) {
+            nodes { name isProtected }
+            pageInfo { hasNextPage endCursor }
+          }
+          mergeRequests(state: opened, first: 100, after: $mrsAfter) @include(if: $withMrs) {
+            nodes { iid sourceBranch targetBranch }
+            pageInfo { hasNextPage endCursor }
+          }
+        }
+      }
+    }
+    """
+    
+    def __init__(self, url=None, token=None, cache=None):
         """
         Inicializa a API do GitLab
         
         Args:
             url (str): URL da instância do GitLab
             token (str): Token de acesso à API
+            cache (BranchCache): Cache persistente das listagens (opcional)
         """
         self.url = url
         self.token = token
         self.gl = None
+        self.cache = cache
+        
+        # Registro das métricas de latência, volume e erros das operações
+        self.metrics = registry
+        
+        # Sessão HTTP compartilhada por todas as chamadas, com ritmo adaptado aos
+        # limites informados pelo servidor (RateLimit-*/Retry-After)
+        self.session = self._create_session()
+        
+        # Cache dos objetos de projeto: {project_id: (projeto, instante_do_carregamento)}
+        self._project_cache = {}
+        self._project_cache_lock = threading.Lock()
+        
+        # Leituras em andamento e resultados recentes, compartilhados por chamadas idênticas:
+        # {chave: {'event', 'result', 'generation'}} e {chave: (resultado, instante)}
+        self._inflight_reads = {}
+        self._recent_reads = {}
+        self._read_generation = 0
+        self._reads_lock = threading.Lock()
+        
+        # Vereditos de conflito: {(project_id, sha_origem, sha_destino): tem_conflito}
+        self._conflict_verdicts = OrderedDict()
+        self._conflict_verdicts_lock = threading.Lock()
+        
+        # Contagens de comparações: {(project_id, sha_destino, sha_origem): (commits, diffs)}
+        self._compare_cache = OrderedDict()
+        self._compare_cache_lock = threading.Lock()
+        
+        # Índice das branches da última listagem: {project_id: ({nome: sha}, instante)}
+        self._branch_index = {}
+        self._branch_index_lock = threading.Lock()
+        
+        # MRs abertos da última visão geral: {project_id: ({(origem, destino): iid}, instante)}
+        self._open_merge_requests = {}
+        self._open_merge_requests_lock = threading.Lock()
+        
+    def _create_session(self):
+        """
+        Cria a sessão HTTP compartilhada pelo python-gitlab e pelas chamadas diretas
         
+        As conexões são reaproveitadas (keep-alive) em um pool do tamanho da maior
+        concorrência usada pela aplicação, e falhas de conexão ou erros de gateway em
+        requisições idempotentes são repetidos com espera crescente.
+        
+        Returns:
+            RateLimitedSession: Sessão configurada
+        """
+        session = RateLimitedSession(metrics=self.metrics)
+        session.headers['Connection'] = 'keep-alive'
+        
+        retry = Retry(
+            total=self.HTTP_RETRIES,
+            backoff_factor=self.HTTP_RETRY_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.HTTP_POOL_SIZE,
+            pool_maxsize=self.HTTP_POOL_SIZE,
+            max_retries=retry
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+        
+    @tracing.traced()
+    @measured('login')
     def login(self, url=None, token=None):
         """
         Realiza a autenticação com o GitLab
@@ -40,12 +209,13 @@ class GitLabAPI:
         if not self.url or not self.token:
             return False, "URL e token são obrigatórios"
         
-        start_time = time.time()
         try:
-            self.gl = gitlab.Gitlab(self.url, private_token=self.token)
-            self.gl.auth()
+            # Uma nova sessão não pode reaproveitar projetos obtidos com outra credencial
+            self.invalidate_project_cache()
+            self.invalidate_reads()
             
-            elapsed = time.time() - start_time
+            self.gl = gitlab.Gitlab(self.url, private_token=self.token, session=self.session)
+            self.gl.auth()
             
             # Verificar versão da API para garantir que está conectado
             try:
@@ -55,56 +225,294 @@ class GitLabAPI:
             
             return True, "Login realizado com sucesso"
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de autenticação: {str(e)}"
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de conexão com o GitLab: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro ao autenticar: {str(e)}"
-    
-    def get_projects(self):
+            
+    def _get_project(self, project_id, lazy=False):
+        """
+        Retorna o objeto de um projeto, reaproveitando o cache da sessão
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            lazy (bool): Se True e o projeto não estiver em cache, retorna um objeto
+                sem consultar o servidor (suficiente para operações de escrita)
+                
+        Returns:
+            Project: Objeto do projeto no python-gitlab
+        """
+        now = time.monotonic()
+        with self._project_cache_lock:
+            cached = self._project_cache.get(project_id)
+            if cached and now - cached[1] < self.PROJECT_CACHE_TTL:
+                return cached[0]
+                
+        if lazy:
+            return self.gl.projects.get(project_id, lazy=True)
+            
+        project = self.gl.projects.get(project_id)
+        with self._project_cache_lock:
+            self._project_cache[project_id] = (project, now)
+        return project
+        
+    def invalidate_project_cache(self, project_id=None):
+        """
+        Remove projetos do cache da sessão
+        
+        Args:
+            project_id (int): ID do projeto a ser removido (None remove todos)
+        """
+        with self._project_cache_lock:
+            if project_id is None:
+                self._project_cache.clear()
+            else:
+                self._project_cache.pop(project_id, None)
+                
+    def _single_flight(self, key, fetch, on_shared=None):
+        """
+        Executa uma leitura, compartilhando-a com chamadas idênticas
+        
+        Chamadas simultâneas com a mesma chave aguardam a requisição em andamento em vez
+        de repeti-la, e chamadas feitas até SINGLE_FLIGHT_TTL segundos depois de uma
+        leitura bem-sucedida recebem o mesmo resultado.
+        
+        Args:
+            key (tuple): Identificação da leitura, ex.: ('branches', project_id)
+            fetch (callable): Função que executa a leitura e retorna (sucesso, resultado)
+            on_shared (callable): Chamada com o resultado quando ele veio de outra chamada
+                (opcional)
+                
+        Returns:
+            tuple: (sucesso, resultado) da leitura
+        """
+        with self._reads_lock:
+            recent = self._recent_reads.get(key)
+            if recent and time.monotonic() - recent[1] < self.SINGLE_FLIGHT_TTL:
+                flight = None
+                result = recent[0]
+            else:
+                flight = self._inflight_reads.get(key)
+                leader = flight is None
+                if leader:
+                    flight = {'event': threading.Event(), 'result': None, 'generation': self._read_generation}
+                    self._inflight_reads[key] = flight
+                    
+        if flight is not None and leader:
+            try:
+                result = fetch()
+            except Exception as e:
+                result = (False, str(e))
+                
+            with self._reads_lock:
+                flight['result'] = result
+                if self._inflight_reads.get(key) is flight:
+                    del self._inflight_reads[key]
+                    
+                # Uma escrita durante a leitura torna o resultado impróprio para reaproveitamento
+                if result[0] and flight['generation'] == self._read_generation:
+                    self._recent_reads[key] = (result, time.monotonic())
+            flight['event'].set()
+            return result[0], self._copy_result(result[1])
+            
+        if flight is not None:
+            # Aguardar a mesma leitura já iniciada por outra chamada
+            flight['event'].wait()
+            result = flight['result']
+            
+        if on_shared:
+            on_shared(result)
+        return result[0], self._copy_result(result[1])
+        
+    @staticmethod
+    def _copy_result(value):
+        """
+        Copia a lista de um resultado compartilhado, para que cada chamador possa alterá-la
+        
+        Args:
+            value: Resultado de uma leitura
+            
+        Returns:
+            Cópia rasa do resultado, se for uma lista
+        """
+        return list(value) if isinstance(value, list) else value
+        
+    def invalidate_reads(self, project_id=None):
+        """
+        Descarta os resultados de leitura compartilhados após uma alteração
+        
+        Leituras em andamento continuam para quem já as aguardava, mas novas chamadas
+        passam a fazer uma nova requisição.
+        
+        Args:
+            project_id (int): ID do projeto alterado (None descarta tudo)
+        """
+        with self._reads_lock:
+            self._read_generation += 1
+            for reads in (self._recent_reads, self._inflight_reads):
+                for key in list(reads):
+                    if project_id is None or key[1] == project_id:
+                        del reads[key]
+                        
+    def notify_branches_changed(self, project_id, *branch_names):
+        """
+        Descarta os dados em memória de branches alteradas fora deste objeto
+        
+        Usado pelo backend assíncrono, que escreve no GitLab sem passar por este objeto.
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_names (str): Nomes das branches alteradas ou removidas
+        """
+        self._forget_branch_heads(project_id, *branch_names)
+        self.invalidate_reads(project_id)
+        
+    @tracing.traced()
+    @measured('get_projects')
+    def get_projects(self, page_callback=None):
         """
         Retorna a lista de projetos disponíveis para o usuário
         
+        A primeira página informa o total de páginas (cabeçalho X-Total-Pages) e as
+        demais são carregadas em paralelo. Quando o servidor não informa o total
+        (listagens muito grandes), as páginas são percorridas sequencialmente.
+        
+        Args:
+            page_callback (callable): Função chamada com a lista de projetos de cada
+                página, na ordem do servidor, assim que ela estiver disponível (opcional)
+        
         Returns:
             tuple: (sucesso, projects ou mensagem de erro)
         """
         if not self.gl:
             return False, "Não autenticado no GitLab"
         
-        start_time = time.time()
+        def deliver_shared(result):
+            # Uma listagem compartilhada chega inteira, como uma única página
+            if result[0] and page_callback:
+                page_callback(self._copy_result(result[1]))
+                
+        return self._single_flight(
+            ('projects', 0),
+            lambda: self._load_projects(page_callback),
+            deliver_shared
+        )
+        
+    def _load_projects(self, page_callback=None):
+        """
+        Carrega a lista de projetos do servidor (ver get_projects)
+        
+        Args:
+            page_callback (callable): Função chamada com os projetos de cada página (opcional)
+            
+        Returns:
+            tuple: (sucesso, projects ou mensagem de erro)
+        """
         try:
             # Obter apenas projetos que o usuário é membro
             # membership=True garante que apenas projetos onde o usuário é membro são incluídos
-            # owned=True para obter projetos onde o usuário é dono
+            # archived=False remove os projetos arquivados no próprio servidor
             # simple=True para dados básicos do projeto, melhorando a performance
-            projects = self.gl.projects.list(
-                membership=True,
-                per_page=100,
-                page=1,
-                order_by='name',
-                sort='asc',
-                simple=True
-            )
+            query_data = {
+                'membership': True,
+                'archived': False,
+                'order_by': 'name',
+                'sort': 'asc',
+                'simple': True,
+                'per_page': self.PROJECTS_PER_PAGE
+            }
             
-            # Remover projetos arquivados, se houver
-            active_projects = [p for p in projects if not hasattr(p, 'archived') or not p.archived]
+            first_page, total_pages, next_page = self._get_projects_page(query_data, 1)
             
-            elapsed = time.time() - start_time
+            pages = {1: first_page}
+            delivered = 0  # Última página repassada ao callback
+            
+            def deliver_ready_pages():
+                # Repassa as páginas em ordem, assim que a sequência estiver completa
+                nonlocal delivered
+                while delivered + 1 in pages:
+                    delivered += 1
+                    if page_callback:
+                        page_callback(pages[delivered])
+                        
+            deliver_ready_pages()
+            
+            if total_pages:
+                # Total conhecido: buscar as páginas restantes em paralelo
+                remaining = range(2, total_pages + 1)
+                with ThreadPoolExecutor(max_workers=self.PROJECTS_PAGE_WORKERS) as executor:
+                    futures = {
+                        executor.submit(self._get_projects_page, query_data, page): page
+                        for page in remaining
+                    }
+                    for future in as_completed(futures):
+                        pages[futures[future]] = future.result()[0]
+                        deliver_ready_pages()
+            else:
+                # Total desconhecido: seguir o cabeçalho X-Next-Page
+                while next_page:
+                    projects, _, following = self._get_projects_page(query_data, next_page)
+                    pages[next_page] = projects
+                    deliver_ready_pages()
+                    next_page = following
+                    
+            active_projects = [project for page in sorted(pages) for project in pages[page]]
+            
+            # Guardar a listagem para exibição imediata na próxima abertura
+            if self.cache:
+                self.cache.store_pages(self._cache_key(), 0, 'projects', [CachedPage(None, None, None, [
+                    {'id': p.id, 'name': p.name, 'path_with_namespace': p.path_with_namespace}
+                    for p in active_projects
+                ])])
             
             return True, active_projects
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de autenticação: {str(e)}"
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de conexão com o GitLab: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro ao obter projetos: {str(e)}"
-    
+            
+    def _get_projects_page(self, query_data, page):
+        """
+        Obtém uma única página da listagem de projetos
+        
+        Args:
+            query_data (dict): Parâmetros da listagem
+            page (int): Número da página
+            
+        Returns:
+            tuple: (projetos da página, total de páginas ou None, próxima página ou None)
+        """
+        response = self.gl.http_get(
+            self.gl.projects.path,
+            query_data=dict(query_data, page=page),
+            raw=True
+        )
+        
+        projects = [
+            Project(self.gl.projects, attrs, created_from_list=True)
+            for attrs in response.json()
+        ]
+        
+        total_pages = response.headers.get('X-Total-Pages')
+        next_page = response.headers.get('X-Next-Page')
+        
+        return (
+            projects,
+            int(total_pages) if total_pages else None,
+            int(next_page) if next_page else None
+        )
+        
+    @tracing.traced('project_id')
+    @measured('get_branches')
     def get_branches(self, project_id):
         """
         Retorna a lista de branches de um projeto específico
@@ -113,29 +521,348 @@ class GitLabAPI:
             project_id (int): ID do projeto no GitLab
             
         Returns:
-            tuple: (sucesso, branches ou mensagem de erro)
+            tuple: (sucesso, lista de BranchRecord ou mensagem de erro)
         """
         if not self.gl:
             return False, "Não autenticado no GitLab"
             
-        start_time = time.time()
-        try:
-            project = self.gl.projects.get(project_id)
-            branches = project.branches.list(all=True)
+        return self._single_flight(('branches', project_id), lambda: self._load_branches(project_id))
+        
+    def _load_branches(self, project_id):
+        """
+        Carrega todas as branches de um projeto do servidor (ver get_branches)
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
             
-            elapsed = time.time() - start_time
+        Returns:
+            tuple: (sucesso, lista de BranchRecord ou mensagem de erro)
+        """
+        try:
+            branches = []
+            for page in self.iter_branches(project_id):
+                branches.extend(page)
             
             return True, branches
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de autenticação: {str(e)}"
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de conexão com o GitLab: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro ao obter branches: {str(e)}"
-    
+            
+    def iter_branches(self, project_id, per_page=None):
+        """
+        Percorre as branches de um projeto página a página
+        
+        Cada página é solicitada apenas quando a anterior já foi consumida, seguindo o
+        cabeçalho Link (rel="next") devolvido pelo GitLab. Esse é o mesmo mecanismo da
+        paginação por keyset, então a iteração funciona com os dois modos de paginação.
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            per_page (int): Quantidade de branches por página (opcional)
+            
+        Yields:
+            list: BranchRecord de cada página
+            
+        Raises:
+            GitlabError: Se alguma página não puder ser obtida
+        """
+        if not self.gl:
+            raise gitlab.exceptions.GitlabAuthenticationError("Não autenticado no GitLab")
+            
+        # A listagem só precisa do caminho do projeto, não dos seus atributos
+        project = self._get_project(project_id, lazy=True)
+        
+        pages = self._iter_listing(
+            project_id,
+            'branches',
+            project.branches.path,
+            lambda item: BranchRecord.from_json(item).to_json(),
+            per_page
+        )
+        heads = {}
+        for page in pages:
+            # Converter o JSON diretamente em registros compactos
+            records = [BranchRecord.from_json(item) for item in page]
+            heads.update((record.name, record.commit_sha) for record in records)
+            yield records
+            
+        # A listagem completa passa a responder as verificações de existência das branches
+        with self._branch_index_lock:
+            self._branch_index[project_id] = (heads, time.monotonic())
+            
+    def _get_branch_heads(self, project, project_id, *branch_names):
+        """
+        Retorna o commit atual de cada branch, consultando o índice da última listagem
+        
+        Apenas as branches ausentes do índice (ou com o índice expirado) são buscadas
+        individualmente no servidor.
+        
+        Args:
+            project: Objeto do projeto no python-gitlab
+            project_id (int): ID do projeto no GitLab
+            branch_names (str): Nomes das branches
+            
+        Returns:
+            list: SHA do commit atual de cada branch, na ordem informada
+            
+        Raises:
+            GitlabGetError: Se alguma das branches não existir
+        """
+        heads = self._indexed_branch_heads(project_id)
+        
+        result = []
+        for branch_name in branch_names:
+            sha = heads.get(branch_name)
+            if sha is None:
+                # Branch criada depois da listagem ou inexistente: confirmar no servidor
+                sha = project.branches.get(branch_name).commit['id']
+                self._index_branch_head(project_id, branch_name, sha)
+            result.append(sha)
+        return result
+        
+    def _indexed_branch_heads(self, project_id):
+        """
+        Retorna uma cópia do índice de branches da última listagem, se ainda válido
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            
+        Returns:
+            dict: {nome: sha}; vazio se não há índice ou ele expirou
+        """
+        with self._branch_index_lock:
+            indexed = self._branch_index.get(project_id)
+            if indexed and time.monotonic() - indexed[1] < self.BRANCH_INDEX_TTL:
+                return dict(indexed[0])
+        return {}
+        
+    def _index_branch_head(self, project_id, branch_name, sha):
+        """
+        Acrescenta ao índice uma branch confirmada individualmente no servidor
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_name (str): Nome da branch
+            sha (str): Commit atual da branch
+        """
+        with self._branch_index_lock:
+            if project_id in self._branch_index:
+                self._branch_index[project_id][0][branch_name] = sha
+                
+    def _forget_branch_heads(self, project_id, *branch_names):
+        """
+        Remove branches do índice após uma alteração feita pela aplicação
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_names (str): Nomes das branches alteradas ou removidas
+        """
+        with self._branch_index_lock:
+            indexed = self._branch_index.get(project_id)
+            if indexed:
+                for branch_name in branch_names:
+                    indexed[0].pop(branch_name, None)
+                    
+    def _iter_listing(self, project_id, resource, path, compact, per_page=None):
+        """
+        Percorre uma listagem paginada, revalidando cada página com o cache local
+        
+        Quando há uma cópia da página em cache, a requisição é condicional
+        (If-None-Match/If-Modified-Since) e uma resposta 304 reaproveita a cópia sem
+        transferir o conteúdo. A listagem completa é gravada no cache ao final.
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            resource (str): Nome da listagem no cache
+            path (str): Caminho da listagem na API
+            compact (callable): Converte cada item do JSON para o formato armazenado
+            per_page (int): Quantidade de itens por página (opcional)
+            
+        Yields:
+            list: Itens de cada página, já no formato armazenado
+        """
+        per_page = per_page or self.BRANCHES_PER_PAGE
+        cached_pages = self.cache.get_pages(self._cache_key(), project_id, resource) if self.cache else []
+        fresh_pages = []
+        
+        url = path
+        query_data = {'per_page': per_page}
+        
+        while url:
+            index = len(fresh_pages)
+            cached = cached_pages[index] if index < len(cached_pages) else None
+            
+            page = self._get_listing_page(url, query_data, cached, compact, per_page)
+            fresh_pages.append(page)
+            yield page.payload
+            
+            # A URL da próxima página já contém todos os parâmetros da consulta
+            url = page.next_url
+            query_data = None
+            
+        if self.cache:
+            self.cache.store_pages(self._cache_key(), project_id, resource, fresh_pages)
+            
+    def _get_listing_page(self, url, query_data, cached, compact, per_page):
+        """
+        Obtém uma página de listagem, usando uma requisição condicional se houver cache
+        
+        Args:
+            url (str): Caminho ou URL completa da página
+            query_data (dict): Parâmetros da consulta (None se já estiverem na URL)
+            cached (CachedPage): Cópia da página em cache (ou None)
+            compact (callable): Converte cada item do JSON para o formato armazenado
+            per_page (int): Quantidade de itens por página
+            
+        Returns:
+            CachedPage: Página atualizada ou a própria cópia em cache, se não mudou
+        """
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+                
+        response = self._raw_get(url, query_data, headers)
+        
+        if response.status_code == 304:
+            # O ETag é calculado apenas sobre o corpo: uma página cheia que era a última
+            # pode ter ganho uma continuação, então nesse caso a página é pedida de novo
+            if cached.next_url or len(cached.payload) < per_page:
+                return cached
+            response = self._raw_get(url, query_data)
+            
+        return CachedPage(
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            response.links.get('next', {}).get('url'),
+            [compact(item) for item in response.json()]
+        )
+        
+    def _raw_get(self, url, query_data=None, headers=None):
+        """
+        Executa um GET diretamente na sessão HTTP do python-gitlab
+        
+        Usado quando a requisição precisa de cabeçalhos próprios, como nas
+        requisições condicionais, que o python-gitlab não permite enviar.
+        
+        Args:
+            url (str): Caminho na API ou URL completa
+            query_data (dict): Parâmetros da consulta (opcional)
+            headers (dict): Cabeçalhos adicionais (opcional)
+            
+        Returns:
+            requests.Response: Resposta com status 2xx ou 304
+            
+        Raises:
+            GitlabAuthenticationError: Se o token for recusado
+            GitlabHttpError: Para os demais erros HTTP
+        """
+        if not url.startswith(('http://', 'https://')):
+            url = f"{self.gl.api_url}{url}"
+            
+        request_headers = dict(self.gl.headers)
+        request_headers.update(headers or {})
+        
+        response = self.gl.session.get(
+            url,
+            params=query_data,
+            headers=request_headers,
+            timeout=self.gl.timeout,
+            verify=self.gl.ssl_verify
+        )
+        
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            return response
+            
+        if response.status_code == 401:
+            error_class = gitlab.exceptions.GitlabAuthenticationError
+        else:
+            error_class = gitlab.exceptions.GitlabHttpError
+        raise error_class(
+            response_code=response.status_code,
+            error_message=response.reason,
+            response_body=response.content
+        )
+        
+    def _cache_key(self):
+        """
+        Retorna a chave da instância usada no cache persistente
+        
+        Returns:
+            str: URL da instância sem a barra final
+        """
+        return (self.url or "").rstrip('/')
+        
+    def _get_cached_payloads(self, project_id, resource):
+        """
+        Retorna os itens de uma listagem em cache, sem acessar o servidor
+        
+        Returns:
+            list ou None: Itens armazenados, ou None se a listagem não estiver em cache
+        """
+        if not self.cache:
+            return None
+            
+        pages = self.cache.get_pages(self._cache_key(), project_id, resource)
+        if not pages:
+            return None
+            
+        return [item for page in pages for item in page.payload]
+        
+    def get_cached_projects(self):
+        """
+        Retorna a última lista de projetos gravada no cache local
+        
+        Returns:
+            list ou None: Projetos em cache, ou None se não houver cópia local
+        """
+        if not self.gl:
+            return None
+            
+        items = self._get_cached_payloads(0, 'projects')
+        if items is None:
+            return None
+            
+        return [Project(self.gl.projects, attrs, created_from_list=True) for attrs in items]
+        
+    def get_cached_branches(self, project_id):
+        """
+        Retorna as branches de um projeto gravadas no cache local
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            
+        Returns:
+            list ou None: BranchRecord em cache, ou None se não houver cópia local
+        """
+        items = self._get_cached_payloads(project_id, 'branches')
+        if items is None:
+            return None
+            
+        return [BranchRecord.from_json(item) for item in items]
+        
+    def get_cached_protected_branches(self, project_id):
+        """
+        Retorna os nomes das branches protegidas gravados no cache local
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            
+        Returns:
+            list ou None: Nomes em cache, ou None se não houver cópia local
+        """
+        return self._get_cached_payloads(project_id, 'protected_branches')
+        
+    @tracing.traced('project_id')
+    @measured('get_protected_branches')
     def get_protected_branches(self, project_id):
         """
         Retorna a lista de branches protegidas de um projeto específico
@@ -149,27 +876,205 @@ class GitLabAPI:
         if not self.gl:
             return False, "Não autenticado no GitLab"
             
-        start_time = time.time()
-        try:
-            project = self.gl.projects.get(project_id)
-            protected_branches = project.protectedbranches.list(all=True)
+        return self._single_flight(
+            ('protected_branches', project_id),
+            lambda: self._load_protected_branches(project_id)
+        )
+        
+    def _load_protected_branches(self, project_id):
+        """
+        Carrega as branches protegidas de um projeto do servidor (ver get_protected_branches)
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
             
-            # Extrair apenas os nomes das branches protegidas
-            protected_branch_names = [branch.name for branch in protected_branches]
+        Returns:
+            tuple: (sucesso, lista de nomes de branches protegidas ou mensagem de erro)
+        """
+        try:
+            # A listagem só precisa do caminho do projeto, não dos seus atributos
+            project = self._get_project(project_id, lazy=True)
             
-            elapsed = time.time() - start_time
+            # Extrair apenas os nomes das branches protegidas (formato também usado no cache)
+            pages = self._iter_listing(
+                project_id,
+                'protected_branches',
+                project.protectedbranches.path,
+                lambda item: item['name']
+            )
+            protected_branch_names = [name for page in pages for name in page]
             
             return True, protected_branch_names
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de autenticação: {str(e)}"
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de conexão com o GitLab: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro ao obter branches protegidas: {str(e)}"
-    
+            
+    @tracing.traced('project_id')
+    @measured('get_project_overview')
+    def get_project_overview(self, project_id):
+        """
+        Retorna branches, branches protegidas e MRs abertos de um projeto via GraphQL
+        
+        As três listagens são paginadas na mesma consulta, então o projeto inteiro é
+        carregado em poucas requisições, em vez de uma sequência de listagens REST.
+        A API GraphQL não informa o commit de cada branch em lote, então os registros
+        vêm sem commit_sha; o índice de branches continua sendo preenchido pela
+        listagem REST.
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            
+        Returns:
+            tuple: (sucesso, dicionário com 'branches' (lista de BranchRecord),
+                'protected_branches' (lista de nomes) e 'merge_requests' (lista de
+                dicionários com iid, source_branch e target_branch), ou mensagem de erro)
+        """
+        if not self.gl:
+            return False, "Não autenticado no GitLab"
+            
+        return self._single_flight(
+            ('project_overview', project_id),
+            lambda: self._load_project_overview(project_id)
+        )
+        
+    def _load_project_overview(self, project_id):
+        """
+        Carrega a visão geral de um projeto do servidor (ver get_project_overview)
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            
+        Returns:
+            tuple: (sucesso, dicionário da visão geral ou mensagem de erro)
+        """
+        try:
+            branch_names = []
+            protected_rules = []
+            merge_requests = []
+            root_ref = None
+            
+            variables = {
+                'ids': [f"gid://gitlab/Project/{project_id}"],
+                'branchOffset': 0,
+                'branchLimit': self.GRAPHQL_BRANCHES_PER_PAGE,
+                'withBranches': True,
+                'rulesAfter': None,
+                'withRules': True,
+                'mrsAfter': None,
+                'withMrs': True
+            }
+            while variables['withBranches'] or variables['withRules'] or variables['withMrs']:
+                data = self._graphql(self.PROJECT_OVERVIEW_QUERY, variables)
+                nodes = data['projects']['nodes']
+                if not nodes:
+                    self.metrics.fail('NotFound')
+                    return False, "Projeto não encontrado (404)"
+                project = nodes[0]
+                
+                if variables['withBranches']:
+                    root_ref = project['repository']['rootRef']
+                    names = project['repository']['branchNames'] or []
+                    branch_names.extend(names)
+                    variables['branchOffset'] += len(names)
+                    variables['withBranches'] = len(names) == self.GRAPHQL_BRANCHES_PER_PAGE
+                    
+                if variables['withRules']:
+                    rules = project['branchRules']
+                    protected_rules.extend(rule['name'] for rule in rules['nodes'] if rule['isProtected'])
+                    variables['rulesAfter'] = rules['pageInfo']['endCursor']
+                    variables['withRules'] = rules['pageInfo']['hasNextPage']
+                    
+                if variables['withMrs']:
+                    mrs = project['mergeRequests']
+                    merge_requests.extend(
+                        {'iid': int(mr['iid']), 'source_branch': mr['sourceBranch'], 'target_branch': mr['targetBranch']}
+                        for mr in mrs['nodes']
+                    )
+                    variables['mrsAfter'] = mrs['pageInfo']['endCursor']
+                    variables['withMrs'] = mrs['pageInfo']['hasNextPage']
+                    
+            # Regras do GitLab: nome exato ou curinga cobrindo o nome inteiro (ex.: release/*)
+            protection = GitLabRuleMatcher(protected_rules)
+            branches = [
+                BranchRecord(name, protected=protection.matches(name), default=name == root_ref)
+                for name in sorted(branch_names)
+            ]
+            
+            # Os MRs abertos permitem criar MRs de verificação sem listá-los antes
+            with self._open_merge_requests_lock:
+                self._open_merge_requests[project_id] = (
+                    {(mr['source_branch'], mr['target_branch']): mr['iid'] for mr in merge_requests},
+                    time.monotonic()
+                )
+                
+            return True, {
+                'branches': branches,
+                'protected_branches': protected_rules,
+                'merge_requests': merge_requests
+            }
+        except gitlab.exceptions.GitlabAuthenticationError as e:
+            self.metrics.fail(e)
+            return False, f"Erro de autenticação: {str(e)}"
+        except gitlab.exceptions.GitlabConnectionError as e:
+            self.metrics.fail(e)
+            return False, f"Erro de conexão com o GitLab: {str(e)}"
+        except Exception as e:
+            self.metrics.fail(e)
+            return False, f"Erro ao obter dados do projeto via GraphQL: {str(e)}"
+            
+    @tracing.traced(name='GitLabAPI.graphql')
+    def _graphql(self, query, variables):
+        """
+        Executa uma consulta na API GraphQL pela sessão HTTP compartilhada
+        
+        Args:
+            query (str): Documento GraphQL
+            variables (dict): Variáveis da consulta
+            
+        Returns:
+            dict: Conteúdo do campo "data" da resposta
+            
+        Raises:
+            GitlabAuthenticationError: Se o token for recusado
+            GitlabHttpError: Para erros HTTP ou erros devolvidos pela consulta
+        """
+        response = self.session.post(
+            f"{self.gl.url}/api/graphql",
+            json={'query': query, 'variables': variables},
+            headers=dict(self.gl.headers),
+            timeout=self.gl.timeout,
+            verify=self.gl.ssl_verify
+        )
+        
+        if response.status_code == 401:
+            raise gitlab.exceptions.GitlabAuthenticationError(
+                response_code=response.status_code,
+                error_message=response.reason,
+                response_body=response.content
+            )
+        if response.status_code >= 400:
+            raise gitlab.exceptions.GitlabHttpError(
+                response_code=response.status_code,
+                error_message=response.reason,
+                response_body=response.content
+            )
+            
+        payload = response.json()
+        if payload.get('errors'):
+            raise gitlab.exceptions.GitlabHttpError(
+                response_code=response.status_code,
+                error_message="; ".join(error.get('message', '') for error in payload['errors'])
+            )
+        return payload['data']
+        
+    @tracing.traced('project_id', 'branch_name')
+    @measured('delete_branch')
     def delete_branch(self, project_id, branch_name):
         """
         Remove uma branch remota no GitLab
@@ -184,28 +1089,44 @@ class GitLabAPI:
         if not self.gl:
             return False, "Não autenticado no GitLab"
         
-        start_time = time.time()
         try:
-            project = self.gl.projects.get(project_id)
-            project.branches.delete(branch_name)
+            project = self._get_project(project_id, lazy=True)
             
-            elapsed = time.time() - start_time
+            # Erros transitórios são repetidos pelo python-gitlab, respeitando o Retry-After
+            project.branches.delete(
+                branch_name,
+                retry_transient_errors=True,
+                max_retries=self.DELETE_MAX_RETRIES
+            )
+            
+            self._forget_branch_heads(project_id, branch_name)
             
             return True, f"Branch '{branch_name}' removida com sucesso"
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de autenticação: {str(e)}"
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de conexão com o GitLab: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro ao remover branch: {str(e)}"
+        finally:
+            # Leituras anteriores das branches deixam de ser compartilhadas
+            self.invalidate_reads(project_id)
             
+    @tracing.traced('project_id', 'source_branch', 'target_branch')
+    @measured('check_merge_conflicts')
     def check_merge_conflicts(self, project_id, source_branch, target_branch):
         """
         Verifica se há conflitos de merge entre duas branches
         
+        A verificação usa o MR aberto entre as branches e aguarda o GitLab calcular a
+        mesclabilidade. Sem MR aberto, um MR temporário é criado e, ao fim da
+        verificação, fechado e removido, para que a consulta não deixe MRs para trás.
+        O veredito é guardado por par de commits (origem, destino), então verificações
+        repetidas com as branches inalteradas não fazem novas requisições ao MR.
+        
         Args:
             project_id (int): ID do projeto no GitLab
             source_branch (str): Nome da branch de origem
@@ -217,175 +1138,388 @@ class GitLabAPI:
                 - tem_conflito (bool): True se há conflitos, False caso contrário
                 - mensagem (str): Mensagem descritiva
         """
-        if not self.gl:
-            return False, None, "Não autenticado no GitLab"
+        return self._check_merge_conflicts(project_id, source_branch, target_branch, False)[:3]
+        
+    @tracing.traced('project_id', 'source_branch', 'target_branch')
+    @measured('check_merge_conflicts')
+    def prepare_merge_request(self, project_id, source_branch, target_branch):
+        """
+        Verifica conflitos como check_merge_conflicts, mantendo o MR criado para o merge
+        
+        Usado quando o merge vem logo depois da verificação: sem conflitos, o MR criado
+        para verificar é devolvido em vez de descartado, e deve ser passado a
+        merge_branches (ou a discard_merge_request, se o merge não acontecer). Com
+        conflitos, ele é descartado aqui mesmo.
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            source_branch (str): Nome da branch de origem
+            target_branch (str): Nome da branch de destino
+            
+        Returns:
+            tuple: (sucesso, tem_conflito, mensagem, MR criado na verificação ou None)
+        """
+        return self._check_merge_conflicts(project_id, source_branch, target_branch, True)
         
-        start_time = time.time()
+    def _check_merge_conflicts(self, project_id, source_branch, target_branch, keep_merge_request):
+        """
+        Verifica conflitos de merge (ver check_merge_conflicts)
         
+        Args:
+            project_id (int): ID do projeto no GitLab
+            source_branch (str): Nome da branch de origem
+            target_branch (str): Nome da branch de destino
+            keep_merge_request (bool): Se True, mantém o MR criado quando não há conflitos
+            
+        Returns:
+            tuple: (sucesso, tem_conflito, mensagem, MR mantido ou None)
+        """
+        if not self.gl:
+            return False, None, "Não autenticado no GitLab", None
+            
         try:
-            project = self.gl.projects.get(project_id)
+            project = self._get_project(project_id, lazy=True)
             
-            # Verificar se as branches existem
+            # Verificar se as branches existem (e obter o commit atual de cada uma)
             try:
-                source = project.branches.get(source_branch)
-                target = project.branches.get(target_branch)
+                source_sha, target_sha = self._get_branch_heads(project, project_id, source_branch, target_branch)
             except gitlab.exceptions.GitlabGetError:
-                return False, None, f"Uma das branches não existe: {source_branch} ou {target_branch}"
-            
-            # Método 1: Tentar usar a comparação de repositórios para verificar diferenças
-            # Em vez de criar um MR temporário, vamos verificar se há diferenças entre as branches
-            try:
-                compare = project.repository_compare(target_branch, source_branch)
-                
-                # Se não há commits para comparar, não há diferenças, logo não há conflitos
-                if len(compare.get('commits', [])) == 0 and len(compare.get('diffs', [])) == 0:
-                    return True, False, f"Não há diferenças entre as branches {source_branch} e {target_branch}, portanto não há conflitos"
+                return False, None, f"Uma das branches não existe: {source_branch} ou {target_branch}", None
                 
-                # Verificar se há um MR aberto entre essas branches
-                mrs = project.mergerequests.list(state='opened', source_branch=source_branch, target_branch=target_branch)
+            # Reaproveitar o veredito se nenhuma das branches mudou desde a última verificação
+            verdict_key = (project_id, source_sha, target_sha)
+            cached_verdict = self._cached_conflict_verdict(verdict_key)
+            if cached_verdict is not None:
+                return True, cached_verdict, self._conflict_message(cached_verdict, source_branch, target_branch), None
                 
-                # Se já existe um MR, verificar se ele tem conflitos
-                if mrs:
-                    mr = mrs[0]
-                    # Se o MR tem o atributo has_conflicts, usar esse valor
-                    if hasattr(mr, 'has_conflicts'):
-                        has_conflicts = mr.has_conflicts
-                        if has_conflicts:
-                            return True, True, f"Existem conflitos entre as branches {source_branch} e {target_branch}"
-                        else:
-                            return True, False, f"Não há conflitos entre as branches {source_branch} e {target_branch}"
+            try:
+                commit_count, diff_count = self._compare_counts(project, project_id, source_sha, target_sha)
                 
-                # Método 2: Usar a API de Merge Request para verificar possíveis conflitos
-                # Em vez de criar e deletar o MR, vamos usar a API para verificar
-                try:
-                    # Endpoint para verificar se um merge é possível
-                    url = f"{self.url}/api/v4/projects/{project_id}/merge_requests/merge_check"
-                    headers = {"PRIVATE-TOKEN": self.token}
-                    data = {
-                        "source_branch": source_branch,
-                        "target_branch": target_branch
-                    }
-                    
-                    import requests
-                    response = requests.post(url, headers=headers, data=data)
-                    
-                    # Se a resposta for bem sucedida, não há conflitos
-                    if response.status_code == 200:
-                        return True, False, f"Não há conflitos entre as branches {source_branch} e {target_branch}"
+                # Se não há commits para comparar, não há diferenças, logo não há conflitos
+                if commit_count == 0 and diff_count == 0:
+                    return True, False, f"Não há diferenças entre as branches {source_branch} e {target_branch}, portanto não há conflitos", None
                     
-                    # Se a resposta for um erro específico, pode ser devido a conflitos
-                    if response.status_code == 405 or response.status_code == 406:
-                        return True, True, f"Existem conflitos entre as branches {source_branch} e {target_branch}"
+                mr, created = self._find_or_create_merge_request(project, project_id, source_branch, target_branch)
+                if mr is None:
+                    # Se não conseguir criar ou encontrar um MR, assumir que não há conflitos
+                    # Isso é uma suposição segura para evitar bloqueios
+                    return True, False, f"Não foi possível verificar conflitos, assumindo que não há conflitos", None
                     
-                    # Se for 404, pode ser que não seja possível verificar dessa forma
-                    if response.status_code == 404:
-                        # Continuar com o método alternativo (criar um MR)
-                        pass
-                except Exception:
-                    # Se falhar, continuar com o método alternativo
-                    pass
-                
-                # Método 3 (Fallback): Criar um MR temporário para verificação
-                # Procurar por MRs temporários existentes primeiro
-                temp_mr_exists = False
-                temp_mr = None
-                
+                # O MR criado só é mantido se a verificação terminar sem conflitos
+                keep = False
                 try:
-                    for mr in mrs:
-                        if "[TEMP]" in mr.title:
-                            temp_mr = mr
-                            temp_mr_exists = True
-                            break
-                except Exception:
-                    pass
-                
-                if not temp_mr_exists:
-                    # Criar um MR temporário apenas se não existir
-                    mr_data = {
-                        'source_branch': source_branch,
-                        'target_branch': target_branch,
-                        'title': f'[TEMP] Verificação de conflitos entre {source_branch} e {target_branch}',
-                        'remove_source_branch': False,
-                        'squash': False
-                    }
+                    mr, has_conflicts = self._wait_for_mergeability(project, mr)
+                    keep = keep_merge_request and not has_conflicts
+                finally:
+                    if created and not keep:
+                        self._discard_merge_request(project, project_id, mr, source_branch, target_branch)
+                kept = mr if created and keep else None
+                if has_conflicts is None:
+                    return True, False, f"Verificação de conflitos inconclusiva, assumindo que não há conflitos", kept
                     
-                    try:
-                        temp_mr = project.mergerequests.create(mr_data)
-                    except gitlab.exceptions.GitlabCreateError as e:
-                        # Se o erro for porque o MR já existe, isso é normal
-                        if "already exists" in str(e).lower():
-                            mrs = project.mergerequests.list(state='opened', source_branch=source_branch, target_branch=target_branch)
-                            if mrs:
-                                temp_mr = mrs[0]
-                            else:
-                                # Se não conseguir criar ou encontrar um MR, assumir que não há conflitos
-                                # Isso é uma suposição segura para evitar bloqueios
-                                return True, False, f"Não foi possível verificar conflitos, assumindo que não há conflitos"
-                        else:
-                            # Se for um erro 404, pode significar que não há diferenças entre as branches
-                            if "404" in str(e):
-                                return True, False, f"Não há diferenças significativas entre as branches, portanto não há conflitos"
-                            return False, None, f"Erro ao criar MR para verificação: {str(e)}"
+                self._store_conflict_verdict(verdict_key, has_conflicts)
                 
-                # Se chegamos aqui, temos um MR (novo ou existente) para verificar
-                if temp_mr:
-                    try:
-                        # Atualizar informações do MR
-                        temp_mr = project.mergerequests.get(temp_mr.id)
-                        
-                        # Verificar se há conflitos
-                        has_conflicts = getattr(temp_mr, 'has_conflicts', False)
-                        
-                        # Tentar fechar e deletar o MR temporário se foi criado para verificação
-                        if "[TEMP]" in temp_mr.title:
-                            try:
-                                temp_mr.state_event = 'close'
-                                temp_mr.save()
-                                
-                                # Tentar deletar, mas não falhar se não conseguir
-                                try:
-                                    temp_mr.delete()
-                                except:
-                                    pass
-                            except:
-                                # Ignorar erros ao fechar/deletar
-                                pass
-                        
-                        if has_conflicts:
-                            return True, True, f"Existem conflitos entre as branches {source_branch} e {target_branch}"
-                        else:
-                            return True, False, f"Não há conflitos entre as branches {source_branch} e {target_branch}"
-                    except Exception as e:
-                        # Se falhar ao verificar o MR, assumir que não há conflitos para evitar bloqueios
-                        return True, False, f"Não foi possível verificar conflitos completamente, assumindo que não há conflitos: {str(e)}"
-                    
-                # Se chegamos aqui sem retornar, algo deu errado, mas vamos assumir que não há conflitos
-                return True, False, f"Verificação de conflitos inconclusiva, assumindo que não há conflitos"
+                return True, has_conflicts, self._conflict_message(has_conflicts, source_branch, target_branch), kept
                 
             except gitlab.exceptions.GitlabError as e:
                 # Se for um erro 404, pode significar que não há diferenças entre as branches
                 if "404" in str(e):
-                    return True, False, f"Não há diferenças significativas entre as branches, portanto não há conflitos"
+                    return True, False, f"Não há diferenças significativas entre as branches, portanto não há conflitos", None
                     
                 # Outro tipo de erro, informar
-                return False, None, f"Erro ao comparar branches: {str(e)}"
+                return False, None, f"Erro ao comparar branches: {str(e)}", None
                 
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
-            return False, None, f"Erro de autenticação: {str(e)}"
+            self.metrics.fail(e)
+            return False, None, f"Erro de autenticação: {str(e)}", None
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
-            return False, None, f"Erro de conexão com o GitLab: {str(e)}"
+            self.metrics.fail(e)
+            return False, None, f"Erro de conexão com o GitLab: {str(e)}", None
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             # Verificar se é um erro 404
             if "404" in str(e):
                 # O erro 404 pode significar que não há diferenças ou que não há como verificar conflitos
                 # Vamos assumir que não há conflitos nesse caso
-                return True, False, f"Não há diferenças significativas entre as branches ou não há como verificar conflitos"
+                return True, False, f"Não há diferenças significativas entre as branches ou não há como verificar conflitos", None
+                
+            return False, None, f"Erro ao verificar conflitos: {str(e)}", None
             
-            return False, None, f"Erro ao verificar conflitos: {str(e)}"
-    
+    @tracing.traced('source_sha', 'target_sha', name='GitLabAPI.compare')
+    def _compare_counts(self, project, project_id, source_sha, target_sha):
+        """
+        Compara dois commits, reaproveitando comparações já feitas
+        
+        Como os commits são imutáveis, o resultado para um mesmo par de SHAs nunca muda.
+        Apenas as contagens são guardadas, não o conteúdo dos diffs.
+        
+        Args:
+            project: Objeto do projeto no python-gitlab
+            project_id (int): ID do projeto no GitLab
+            source_sha (str): Commit atual da branch de origem
+            target_sha (str): Commit atual da branch de destino
+            
+        Returns:
+            tuple: (quantidade de commits, quantidade de diffs) da origem em relação ao destino
+        """
+        key = (project_id, target_sha, source_sha)
+        counts = self._cached_compare_counts(key)
+        if counts is not None:
+            return counts
+            
+        compare = project.repository_compare(target_sha, source_sha)
+        counts = (len(compare.get('commits', [])), len(compare.get('diffs', [])))
+        
+        self._store_compare_counts(key, counts)
+        return counts
+        
+    def _cached_compare_counts(self, key):
+        """
+        Retorna as contagens guardadas de uma comparação
+        
+        Args:
+            key (tuple): (project_id, sha_destino, sha_origem)
+            
+        Returns:
+            tuple ou None: (commits, diffs), ou None se a comparação não está guardada
+        """
+        with self._compare_cache_lock:
+            counts = self._compare_cache.get(key)
+            if counts is not None:
+                self._compare_cache.move_to_end(key)
+            return counts
+            
+    def _store_compare_counts(self, key, counts):
+        """
+        Guarda as contagens de uma comparação, descartando as mais antigas
+        
+        Args:
+            key (tuple): (project_id, sha_destino, sha_origem)
+            counts (tuple): (commits, diffs)
+        """
+        with self._compare_cache_lock:
+            self._compare_cache[key] = counts
+            while len(self._compare_cache) > self.COMPARE_CACHE_SIZE:
+                self._compare_cache.popitem(last=False)
+                
+    def _cached_conflict_verdict(self, key):
+        """
+        Retorna o veredito de conflito guardado para um par de commits
+        
+        Args:
+            key (tuple): (project_id, sha_origem, sha_destino)
+            
+        Returns:
+            bool ou None: Veredito, ou None se o par não foi verificado
+        """
+        with self._conflict_verdicts_lock:
+            return self._conflict_verdicts.get(key)
+            
+    def _store_conflict_verdict(self, key, has_conflicts):
+        """
+        Guarda o veredito de conflito de um par de commits, descartando os mais antigos
+        
+        Args:
+            key (tuple): (project_id, sha_origem, sha_destino)
+            has_conflicts (bool): Veredito da verificação
+        """
+        with self._conflict_verdicts_lock:
+            self._conflict_verdicts[key] = has_conflicts
+            while len(self._conflict_verdicts) > self.CONFLICT_VERDICT_CACHE_SIZE:
+                self._conflict_verdicts.popitem(last=False)
+                
+    @staticmethod
+    def _conflict_message(has_conflicts, source_branch, target_branch):
+        """
+        Monta a mensagem do resultado de uma verificação de conflitos
+        
+        Returns:
+            str: Mensagem descritiva
+        """
+        if has_conflicts:
+            return f"Existem conflitos entre as branches {source_branch} e {target_branch}"
+        return f"Não há conflitos entre as branches {source_branch} e {target_branch}"
+        
+    @tracing.traced('source_branch', 'target_branch', name='GitLabAPI.find_or_create_merge_request')
+    def _find_or_create_merge_request(self, project, project_id, source_branch, target_branch):
+        """
+        Retorna o MR aberto entre duas branches, criando-o se necessário
+        
+        Um MR criado aqui é temporário: quem o solicitou deve usá-lo no merge ou
+        descartá-lo com _discard_merge_request.
+        
+        Args:
+            project: Objeto do projeto no python-gitlab
+            project_id (int): ID do projeto no GitLab
+            source_branch (str): Nome da branch de origem
+            target_branch (str): Nome da branch de destino
+            
+        Returns:
+            tuple: (ProjectMergeRequest ou None, True se o MR foi criado nesta chamada)
+        """
+        # Se a visão geral recente não tem MR aberto entre as branches, criar diretamente;
+        # um MR criado depois dela é encontrado pelo tratamento de "already exists"
+        if not self._known_without_open_merge_request(project_id, source_branch, target_branch):
+            mrs = project.mergerequests.list(state='opened', source_branch=source_branch, target_branch=target_branch)
+            if mrs:
+                return mrs[0], False
+                
+        mr_data = {
+            'source_branch': source_branch,
+            'target_branch': target_branch,
+            'title': f'Merge de {source_branch} para {target_branch}',
+            'remove_source_branch': False,  # Não remover branch source no merge
+            'squash': False
+        }
+        
+        try:
+            return project.mergerequests.create(mr_data), True
+        except gitlab.exceptions.GitlabCreateError as e:
+            # Outro processo pode ter criado o MR ao mesmo tempo
+            if "already exists" in str(e).lower():
+                mrs = project.mergerequests.list(state='opened', source_branch=source_branch, target_branch=target_branch)
+                return (mrs[0] if mrs else None), False
+            raise
+            
+    def discard_merge_request(self, project_id, source_branch, target_branch, merge_request):
+        """
+        Descarta um MR mantido por prepare_merge_request cujo merge não será realizado
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            source_branch (str): Nome da branch de origem
+            target_branch (str): Nome da branch de destino
+            merge_request: MR devolvido por prepare_merge_request
+        """
+        if not self.gl:
+            return
+            
+        try:
+            project = self._get_project(project_id, lazy=True)
+        except gitlab.exceptions.GitlabError:
+            return
+        self._discard_merge_request(project, project_id, merge_request, source_branch, target_branch)
+        
+    @tracing.traced('source_branch', 'target_branch', name='GitLabAPI.discard_merge_request')
+    def _discard_merge_request(self, project, project_id, mr, source_branch, target_branch):
+        """
+        Fecha e remove um MR temporário criado para verificar conflitos
+        
+        A remoção exige permissão de dono do projeto; sem ela, o MR fica apenas fechado,
+        o que basta para não aparecer entre os MRs abertos.
+        
+        Args:
+            project: Objeto do projeto no python-gitlab
+            project_id (int): ID do projeto no GitLab
+            mr: MR a descartar
+            source_branch (str): Nome da branch de origem
+            target_branch (str): Nome da branch de destino
+        """
+        try:
+            project.mergerequests.update(mr.iid, {'state_event': 'close'})
+            project.mergerequests.delete(mr.iid)
+        except gitlab.exceptions.GitlabError:
+            pass
+            
+        self._forget_open_merge_request(project_id, source_branch, target_branch)
+        
+    def _forget_open_merge_request(self, project_id, source_branch, target_branch):
+        """
+        Registra na última visão geral que o par de branches voltou a não ter MR aberto
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            source_branch (str): Nome da branch de origem
+            target_branch (str): Nome da branch de destino
+        """
+        with self._open_merge_requests_lock:
+            known = self._open_merge_requests.get(project_id)
+            if known:
+                known[0].pop((source_branch, target_branch), None)
+                
+    def _known_without_open_merge_request(self, project_id, source_branch, target_branch):
+        """
+        Verifica, pela última visão geral do projeto, se não há MR aberto entre duas branches
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            source_branch (str): Nome da branch de origem
+            target_branch (str): Nome da branch de destino
+            
+        Returns:
+            bool: True apenas se a visão geral é recente e não contém o MR
+        """
+        with self._open_merge_requests_lock:
+            known = self._open_merge_requests.get(project_id)
+            if not known or time.monotonic() - known[1] >= self.OPEN_MERGE_REQUESTS_TTL:
+                return False
+                
+            if (source_branch, target_branch) in known[0]:
+                return False
+                
+            # A partir daqui o MR passa a existir; só a primeira chamada pula a listagem
+            known[0][(source_branch, target_branch)] = None
+            return True
+            
+    @tracing.traced(name='GitLabAPI.wait_for_mergeability')
+    def _wait_for_mergeability(self, project, mr):
+        """
+        Aguarda o GitLab calcular a mesclabilidade de um MR
+        
+        O cálculo é assíncrono no servidor: logo após a criação (ou após um push) o MR
+        fica com status "unchecked"/"checking". O MR é consultado novamente com
+        intervalos crescentes até o status ser definitivo ou o tempo limite acabar.
+        
+        Args:
+            project: Objeto do projeto no python-gitlab
+            mr: MR a ser verificado
+            
+        Returns:
+            tuple: (MR com o status mais recente, True se há conflitos, False se não há,
+                None se inconclusivo)
+        """
+        delay = self.CONFLICT_POLL_INITIAL_DELAY
+        deadline = time.monotonic() + self.CONFLICT_POLL_TIMEOUT
+        
+        while True:
+            verdict = self._mergeability_verdict(
+                getattr(mr, 'detailed_merge_status', None),
+                getattr(mr, 'merge_status', None),
+                getattr(mr, 'has_conflicts', False)
+            )
+            if verdict is not None:
+                return mr, verdict
+                
+            if time.monotonic() + delay > deadline:
+                return mr, None
+                
+            time.sleep(delay)
+            delay = min(delay * 2, self.CONFLICT_POLL_MAX_DELAY)
+            mr = project.mergerequests.get(mr.iid)
+            
+    @classmethod
+    def _mergeability_verdict(cls, detailed_status, merge_status, has_conflicts):
+        """
+        Interpreta os status de mesclabilidade de um MR
+        
+        Args:
+            detailed_status (str): Campo detailed_merge_status (None em versões antigas do GitLab)
+            merge_status (str): Campo merge_status
+            has_conflicts (bool): Campo has_conflicts
+            
+        Returns:
+            bool ou None: True se há conflitos, False se não há, None se o cálculo está pendente
+        """
+        pending = (
+            detailed_status in cls.PENDING_DETAILED_MERGE_STATUSES
+            or (detailed_status is None and merge_status in cls.PENDING_MERGE_STATUSES)
+        )
+        if pending:
+            return None
+        return bool(has_conflicts) or detailed_status == 'conflict' or merge_status == 'cannot_be_merged'
+        
+    @tracing.traced('project_id', 'source_branch', 'target_branch')
+    @measured('check_branch_differences')
     def check_branch_differences(self, project_id, source_branch, target_branch):
         """
         Verifica se há diferenças entre as branches (se o merge é necessário)
@@ -404,14 +1538,12 @@ class GitLabAPI:
         if not self.gl:
             return False, None, "Não autenticado no GitLab"
         
-        start_time = time.time()
         try:
-            project = self.gl.projects.get(project_id)
+            project = self._get_project(project_id)
             
-            # Verificar se as branches existem
+            # Verificar se as branches existem (e obter o commit atual de cada uma)
             try:
-                project.branches.get(source_branch)
-                project.branches.get(target_branch)
+                source_sha, target_sha = self._get_branch_heads(project, project_id, source_branch, target_branch)
             except gitlab.exceptions.GitlabGetError:
                 return False, None, f"Uma das branches não existe: {source_branch} ou {target_branch}"
             
@@ -419,10 +1551,10 @@ class GitLabAPI:
             try:
                 # Comparar as branches para ver se há diferenças
                 # Isso verifica se há commits em source_branch que não estão em target_branch
-                compare = project.repository_compare(target_branch, source_branch)
+                commit_count, diff_count = self._compare_counts(project, project_id, source_sha, target_sha)
                 
                 # Se houver commits na comparação, significa que há diferenças
-                has_differences = len(compare['commits']) > 0 or len(compare.get('diffs', [])) > 0
+                has_differences = commit_count > 0 or diff_count > 0
                 
             except gitlab.exceptions.GitlabError as e:
                 # Se falhar na comparação, tentar uma alternativa: verificar se já existe um MR aberto
@@ -443,24 +1575,24 @@ class GitLabAPI:
                 # Se chegamos aqui, significa que não conseguimos determinar via MR também
                 return False, None, f"Erro ao comparar branches: {str(e)}"
             
-            elapsed = time.time() - start_time
-            
             if has_differences:
                 return True, True, f"Existem diferenças entre as branches {source_branch} e {target_branch}"
             else:
                 return True, False, f"Não há diferenças entre as branches {source_branch} e {target_branch} (merge não necessário)"
                 
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, None, f"Erro de autenticação: {str(e)}"
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, None, f"Erro de conexão com o GitLab: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, None, f"Erro ao verificar diferenças: {str(e)}"
-    
-    def merge_branches(self, project_id, source_branch, target_branch, squash=False):
+            
+    @tracing.traced('project_id', 'source_branch', 'target_branch', 'squash')
+    @measured('merge_branches')
+    def merge_branches(self, project_id, source_branch, target_branch, squash=False, merge_request=None):
         """
         Realiza o merge de duas branches
         
@@ -469,6 +1601,7 @@ class GitLabAPI:
             source_branch (str): Nome da branch de origem
             target_branch (str): Nome da branch de destino
             squash (bool): Se deve combinar todos os commits em um único
+            merge_request: MR mantido por prepare_merge_request, usado sem nova busca (opcional)
             
         Returns:
             tuple: (sucesso, mensagem)
@@ -476,28 +1609,27 @@ class GitLabAPI:
         if not self.gl:
             return False, "Não autenticado no GitLab"
         
-        start_time = time.time()
         mr = None
         
         try:
-            project = self.gl.projects.get(project_id)
+            project = self._get_project(project_id, lazy=True)
             
             # Verificar se as branches existem
             try:
-                project.branches.get(source_branch)
-                project.branches.get(target_branch)
+                self._get_branch_heads(project, project_id, source_branch, target_branch)
             except gitlab.exceptions.GitlabGetError:
                 return False, f"Uma das branches não existe: {source_branch} ou {target_branch}"
             
             # Verificar se já existe um MR aberto para essas branches
-            existing_mr = None
-            try:
-                mrs = project.mergerequests.list(state='opened', source_branch=source_branch, target_branch=target_branch)
-                if mrs:
-                    existing_mr = mrs[0]
-            except Exception as e:
-                # Se não conseguir listar MRs, apenas ignorar e tentar criar um novo
-                pass
+            existing_mr = merge_request
+            if existing_mr is None:
+                try:
+                    mrs = project.mergerequests.list(state='opened', source_branch=source_branch, target_branch=target_branch)
+                    if mrs:
+                        existing_mr = mrs[0]
+                except Exception as e:
+                    # Se não conseguir listar MRs, apenas ignorar e tentar criar um novo
+                    pass
             
             # Usar o MR existente ou criar um novo
             if existing_mr:
@@ -555,16 +1687,19 @@ class GitLabAPI:
             except gitlab.exceptions.GitlabMRConflictError:
                 return False, f"Existem conflitos entre {source_branch} e {target_branch} que precisam ser resolvidos"
             
-            elapsed = time.time() - start_time
-            
             return True, f"Merge de {source_branch} para {target_branch} realizado com sucesso"
                 
         except gitlab.exceptions.GitlabAuthenticationError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de autenticação: {str(e)}"
         except gitlab.exceptions.GitlabConnectionError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de conexão com o GitLab: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
-            return False, f"Erro ao realizar merge: {str(e)}" 
\ No newline at end of file
+            self.metrics.fail(e)
+            return False, f"Erro ao realizar merge: {str(e)}"
+        finally:
+            # Leituras anteriores das branches deixam de ser compartilhadas e o
+            # commit do destino pode ter mudado
+            self.invalidate_reads(project_id)
+            self._forget_branch_heads(project_id, target_branch)
\ No newline at end of file
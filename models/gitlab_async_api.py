@@ -0,0 +1,781 @@
+"""
+Backend assíncrono (asyncio + httpx) para a API do GitLab
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+from models.branch_record import BranchRecord
+from models.gitlab_api import GitLabAPI
+from utils import tracing
+from utils.metrics import registry
+
+class AsyncGitLabAPI:
+    """
+    Modelo de comunicação com a API do GitLab baseado em asyncio
+    
+    Segue o mesmo contrato do GitLabAPI (métodos retornam (sucesso, resultado) ou
+    (sucesso, valor, mensagem)), mas todas as requisições compartilham um único
+    cliente httpx e um único loop de eventos, permitindo centenas de requisições
+    simultâneas sem uma thread para cada uma.
+    
+    O controle de ritmo (TokenBucket), o índice de branches e os caches de comparações,
+    de vereditos de conflito e de MRs abertos são os do GitLabAPI informado, então os
+    dois backends respeitam o mesmo orçamento de requisições e aproveitam o trabalho
+    um do outro.
+    
+    O httpx é uma dependência opcional, importada apenas quando o backend é usado.
+    """
+    
+    # Conexões simultâneas mantidas pelo cliente HTTP
+    MAX_CONNECTIONS = 100
+    
+    # Operações simultâneas em lote (deleções, verificações)
+    MAX_CONCURRENCY = 64
+    
+    # Quantidade de itens solicitados por página
+    PER_PAGE = 100
+    
+    # Tempo limite (em segundos) de cada requisição
+    TIMEOUT = 30.0
+    
+    # Novas tentativas após uma resposta 429
+    MAX_RETRIES = 5
+    
+    def __init__(self, url=None, token=None, gitlab_api=None):
+        """
+        Inicializa o backend assíncrono
+        
+        Args:
+            url (str): URL da instância do GitLab
+            token (str): Token de acesso à API
+            gitlab_api (GitLabAPI): Instância cujos caches e controle de ritmo são
+                compartilhados (opcional, cria uma própria)
+        """
+        self.url = url
+        self.token = token
+        self.gitlab_api = gitlab_api or GitLabAPI(url, token)
+        self._client = None
+        self._semaphore = None
+        
+    @staticmethod
+    def is_available():
+        """
+        Verifica se a dependência opcional (httpx) está instalada
+        
+        Returns:
+            bool: True se o backend assíncrono pode ser usado
+        """
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            return False
+        return True
+        
+    def _get_client(self):
+        """
+        Retorna o cliente HTTP, criando-o no loop atual se necessário
+        
+        Returns:
+            httpx.AsyncClient: Cliente compartilhado
+        """
+        if self._client is None:
+            import httpx
+            
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.url.rstrip('/')}/api/v4",
+                headers={'PRIVATE-TOKEN': self.token},
+                timeout=self.TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_CONNECTIONS
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        return self._client
+        
+    async def close(self):
+        """
+        Fecha o cliente HTTP
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            
+    async def _request(self, method, path, **kwargs):
+        """
+        Executa uma requisição, repetindo-a quando o servidor responde 429
+        
+        Cada tentativa aguarda uma ficha do TokenBucket compartilhado, e a resposta
+        ajusta o ritmo dele (inclusive a pausa pedida por um Retry-After).
+        
+        Args:
+            method (str): Método HTTP
+            path (str): Caminho relativo a /api/v4 ou URL completa
+            
+        Returns:
+            httpx.Response: Resposta com status 2xx
+            
+        Raises:
+            AsyncGitLabError: Para respostas de erro (a mensagem começa com o status)
+        """
+        client = self._get_client()
+        bucket = self.gitlab_api.session.bucket
+        
+        for attempt in range(self.MAX_RETRIES + 1):
+            # Aguardar a vez sem bloquear as demais requisições do loop
+            await bucket.acquire_async()
+            
+            start_time = time.time()
+            try:
+                response = await client.request(method, path, **kwargs)
+            except Exception as e:
+                registry.observe_http(method, path, time.time() - start_time, error=e)
+                raise
+            registry.observe_http(method, path, time.time() - start_time, response.status_code, len(response.content))
+            bucket.observe(response)
+            if response.status_code != 429 or attempt == self.MAX_RETRIES:
+                break
+                
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message', response.text)
+            except ValueError:
+                message = response.text
+            raise AsyncGitLabError(response.status_code, message)
+        return response
+        
+    async def _list(self, path, params=None):
+        """
+        Percorre todas as páginas de uma listagem seguindo o cabeçalho Link
+        
+        Args:
+            path (str): Caminho da listagem
+            params (dict): Parâmetros da consulta (opcional)
+            
+        Returns:
+            list: Itens de todas as páginas
+        """
+        items = []
+        url = path
+        params = dict(params or {}, per_page=self.PER_PAGE)
+        
+        while url:
+            response = await self._request('GET', url, params=params)
+            items.extend(response.json())
+            url = response.links.get('next', {}).get('url')
+            params = None
+        return items
+        
+    @staticmethod
+    def _branch_path(project_id, branch_name):
+        """
+        Monta o caminho de uma branch na API
+        
+        Returns:
+            str: Caminho com o nome da branch codificado
+        """
+        return f"/projects/{project_id}/repository/branches/{quote(branch_name, safe='')}"
+        
+    async def _get_branch_heads(self, project_id, *branch_names):
+        """
+        Retorna o commit atual de cada branch, consultando o índice da última listagem
+        
+        Apenas as branches ausentes do índice são buscadas no servidor.
+        
+        Raises:
+            AsyncGitLabError: Com status 404 se alguma das branches não existir
+        """
+        heads = self.gitlab_api._indexed_branch_heads(project_id)
+        missing = [branch_name for branch_name in branch_names if branch_name not in heads]
+        
+        responses = await asyncio.gather(*[
+            self._request('GET', self._branch_path(project_id, branch_name))
+            for branch_name in missing
+        ])
+        for branch_name, response in zip(missing, responses):
+            heads[branch_name] = response.json()['commit']['id']
+            self.gitlab_api._index_branch_head(project_id, branch_name, heads[branch_name])
+        return [heads[branch_name] for branch_name in branch_names]
+        
+    async def _compare_counts(self, project_id, source_sha, target_sha):
+        """
+        Compara dois commits, reaproveitando as comparações guardadas pelo GitLabAPI
+        
+        Returns:
+            tuple: (quantidade de commits, quantidade de diffs) da origem em relação ao destino
+        """
+        key = (project_id, target_sha, source_sha)
+        counts = self.gitlab_api._cached_compare_counts(key)
+        if counts is not None:
+            return counts
+            
+        response = await self._request(
+            'GET',
+            f"/projects/{project_id}/repository/compare",
+            params={'from': target_sha, 'to': source_sha}
+        )
+        compare = response.json()
+        counts = (len(compare.get('commits') or []), len(compare.get('diffs') or []))
+        
+        self.gitlab_api._store_compare_counts(key, counts)
+        return counts
+        
+    async def _find_open_merge_request(self, project_id, source_branch, target_branch):
+        """
+        Retorna o MR aberto entre duas branches, ou None
+        
+        Returns:
+            dict ou None: Dados do MR
+        """
+        response = await self._request(
+            'GET',
+            f"/projects/{project_id}/merge_requests",
+            params={'state': 'opened', 'source_branch': source_branch, 'target_branch': target_branch}
+        )
+        mrs = response.json()
+        return mrs[0] if mrs else None
+        
+    async def _find_or_create_merge_request(self, project_id, source_branch, target_branch, squash=False):
+        """
+        Retorna o MR aberto entre duas branches, criando-o se necessário
+        
+        Returns:
+            tuple: (dados do MR ou None, True se o MR foi criado nesta chamada)
+        """
+        # Sem MR aberto na visão geral recente, criar diretamente (como no GitLabAPI)
+        if not self.gitlab_api._known_without_open_merge_request(project_id, source_branch, target_branch):
+            mr = await self._find_open_merge_request(project_id, source_branch, target_branch)
+            if mr:
+                return mr, False
+                
+        try:
+            response = await self._request('POST', f"/projects/{project_id}/merge_requests", json={
+                'source_branch': source_branch,
+                'target_branch': target_branch,
+                'title': f'Merge de {source_branch} para {target_branch}',
+                'remove_source_branch': False,
+                'squash': squash
+            })
+            return response.json(), True
+        except AsyncGitLabError as e:
+            # Outro processo pode ter criado o MR ao mesmo tempo
+            if "already exists" in str(e).lower():
+                return await self._find_open_merge_request(project_id, source_branch, target_branch), False
+            raise
+            
+    async def _discard_merge_request(self, project_id, mr, source_branch, target_branch):
+        """
+        Fecha e remove um MR temporário criado para verificar conflitos
+        
+        A remoção exige permissão de dono do projeto; sem ela, o MR fica apenas fechado.
+        """
+        mr_path = f"/projects/{project_id}/merge_requests/{mr['iid']}"
+        try:
+            await self._request('PUT', mr_path, json={'state_event': 'close'})
+            await self._request('DELETE', mr_path)
+        except AsyncGitLabError:
+            pass
+            
+        self.gitlab_api._forget_open_merge_request(project_id, source_branch, target_branch)
+        
+    async def login(self, url=None, token=None):
+        """
+        Valida as credenciais no GitLab
+        
+        Args:
+            url (str): URL da instância do GitLab (opcional se já definido)
+            token (str): Token de acesso à API (opcional se já definido)
+            
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        if url or token:
+            await self.close()
+            self.url = url or self.url
+            self.token = token or self.token
+            
+        if not self.url or not self.token:
+            return False, "URL e token são obrigatórios"
+            
+        try:
+            await self._request('GET', '/user')
+            return True, "Login realizado com sucesso"
+        except AsyncGitLabError as e:
+            if e.status_code == 401:
+                return False, f"Erro de autenticação: {str(e)}"
+            return False, f"Erro ao autenticar: {str(e)}"
+        except Exception as e:
+            return False, f"Erro de conexão com o GitLab: {str(e)}"
+            
+    async def get_branches(self, project_id):
+        """
+        Retorna a lista de branches de um projeto
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            
+        Returns:
+            tuple: (sucesso, lista de BranchRecord ou mensagem de erro)
+        """
+        try:
+            items = await self._list(f"/projects/{project_id}/repository/branches")
+            return True, [BranchRecord.from_json(item) for item in items]
+        except Exception as e:
+            return False, f"Erro ao obter branches: {str(e)}"
+            
+    async def get_protected_branches(self, project_id):
+        """
+        Retorna os nomes das branches protegidas de um projeto
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            
+        Returns:
+            tuple: (sucesso, lista de nomes ou mensagem de erro)
+        """
+        try:
+            items = await self._list(f"/projects/{project_id}/protected_branches")
+            return True, [item['name'] for item in items]
+        except Exception as e:
+            return False, f"Erro ao obter branches protegidas: {str(e)}"
+            
+    async def delete_branch(self, project_id, branch_name):
+        """
+        Remove uma branch remota
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_name (str): Nome da branch
+            
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        self._get_client()
+        async with self._semaphore:
+            try:
+                await self._request('DELETE', self._branch_path(project_id, branch_name))
+                return True, f"Branch '{branch_name}' removida com sucesso"
+            except Exception as e:
+                return False, f"Erro ao remover branch: {str(e)}"
+            finally:
+                # Os caches do GitLabAPI deixam de valer para a branch removida
+                self.gitlab_api.notify_branches_changed(project_id, branch_name)
+                
+    async def delete_branches(self, project_id, branch_names, on_result=None):
+        """
+        Remove várias branches simultaneamente
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_names (list): Nomes das branches
+            on_result (callable): Chamado com (nome, sucesso, mensagem) a cada deleção concluída
+            
+        Returns:
+            dict: {nome_da_branch: (sucesso, mensagem)}
+        """
+        results = {}
+        
+        async def delete(branch_name):
+            success, message = await self.delete_branch(project_id, branch_name)
+            results[branch_name] = (success, message)
+            if on_result:
+                on_result(branch_name, success, message)
+                
+        await asyncio.gather(*[delete(branch_name) for branch_name in branch_names])
+        return results
+        
+    async def check_branch_differences(self, project_id, source_branch, target_branch):
+        """
+        Verifica se há diferenças entre as branches (se o merge é necessário)
+        
+        Returns:
+            tuple: (sucesso, tem_diferenca, mensagem)
+        """
+        try:
+            try:
+                source_sha, target_sha = await self._get_branch_heads(project_id, source_branch, target_branch)
+            except AsyncGitLabError as e:
+                if e.status_code == 404:
+                    return False, None, f"Uma das branches não existe: {source_branch} ou {target_branch}"
+                raise
+                
+            commit_count, diff_count = await self._compare_counts(project_id, source_sha, target_sha)
+            if commit_count > 0 or diff_count > 0:
+                return True, True, f"Existem diferenças entre as branches {source_branch} e {target_branch}"
+            return True, False, f"Não há diferenças entre as branches {source_branch} e {target_branch} (merge não necessário)"
+        except Exception as e:
+            return False, None, f"Erro ao verificar diferenças: {str(e)}"
+            
+    async def check_merge_conflicts(self, project_id, source_branch, target_branch):
+        """
+        Verifica se há conflitos de merge entre duas branches, usando o MR aberto entre elas
+        
+        Segue o GitLabAPI.check_merge_conflicts: o veredito é guardado por par de commits
+        e, sem MR aberto, um MR temporário é criado e descartado ao fim da verificação.
+        
+        Returns:
+            tuple: (sucesso, tem_conflito, mensagem)
+        """
+        return (await self._check_merge_conflicts(project_id, source_branch, target_branch, False))[:3]
+        
+    async def prepare_merge_request(self, project_id, source_branch, target_branch):
+        """
+        Verifica conflitos mantendo o MR criado para o merge (ver GitLabAPI.prepare_merge_request)
+        
+        Returns:
+            tuple: (sucesso, tem_conflito, mensagem, dados do MR criado na verificação ou None)
+        """
+        return await self._check_merge_conflicts(project_id, source_branch, target_branch, True)
+        
+    async def discard_merge_request(self, project_id, source_branch, target_branch, merge_request):
+        """
+        Descarta um MR mantido por prepare_merge_request cujo merge não será realizado
+        """
+        await self._discard_merge_request(project_id, merge_request, source_branch, target_branch)
+        
+    async def _check_merge_conflicts(self, project_id, source_branch, target_branch, keep_merge_request):
+        """
+        Verifica conflitos de merge, mantendo o MR criado se keep_merge_request e não houver conflitos
+        
+        Returns:
+            tuple: (sucesso, tem_conflito, mensagem, dados do MR mantido ou None)
+        """
+        try:
+            try:
+                source_sha, target_sha = await self._get_branch_heads(project_id, source_branch, target_branch)
+            except AsyncGitLabError as e:
+                if e.status_code == 404:
+                    return False, None, f"Uma das branches não existe: {source_branch} ou {target_branch}", None
+                raise
+                
+            # Reaproveitar o veredito se nenhuma das branches mudou desde a última verificação
+            verdict_key = (project_id, source_sha, target_sha)
+            cached_verdict = self.gitlab_api._cached_conflict_verdict(verdict_key)
+            if cached_verdict is not None:
+                return True, cached_verdict, GitLabAPI._conflict_message(cached_verdict, source_branch, target_branch), None
+                
+            commit_count, diff_count = await self._compare_counts(project_id, source_sha, target_sha)
+            if commit_count == 0 and diff_count == 0:
+                return True, False, f"Não há diferenças entre as branches {source_branch} e {target_branch}, portanto não há conflitos", None
+                
+            mr, created = await self._find_or_create_merge_request(project_id, source_branch, target_branch)
+            if mr is None:
+                return True, False, f"Não foi possível verificar conflitos, assumindo que não há conflitos", None
+                
+            # O MR criado só é mantido se a verificação terminar sem conflitos
+            keep = False
+            try:
+                mr, has_conflicts = await self._wait_for_mergeability(project_id, mr)
+                keep = keep_merge_request and not has_conflicts
+            finally:
+                if created and not keep:
+                    await self._discard_merge_request(project_id, mr, source_branch, target_branch)
+            kept = mr if created and keep else None
+            if has_conflicts is None:
+                return True, False, f"Verificação de conflitos inconclusiva, assumindo que não há conflitos", kept
+                
+            self.gitlab_api._store_conflict_verdict(verdict_key, has_conflicts)
+            return True, has_conflicts, GitLabAPI._conflict_message(has_conflicts, source_branch, target_branch), kept
+        except AsyncGitLabError as e:
+            if e.status_code == 404:
+                return True, False, f"Não há diferenças significativas entre as branches, portanto não há conflitos", None
+            return False, None, f"Erro ao verificar conflitos: {str(e)}", None
+        except Exception as e:
+            return False, None, f"Erro ao verificar conflitos: {str(e)}", None
+            
+    async def _wait_for_mergeability(self, project_id, mr):
+        """
+        Aguarda o GitLab calcular a mesclabilidade do MR
+        
+        Usa os mesmos status pendentes e intervalos de consulta do GitLabAPI.
+        
+        Returns:
+            tuple: (dados do MR mais recentes, True se há conflitos, False se não há,
+                None se inconclusivo)
+        """
+        delay = self.gitlab_api.CONFLICT_POLL_INITIAL_DELAY
+        deadline = time.monotonic() + self.gitlab_api.CONFLICT_POLL_TIMEOUT
+        
+        while True:
+            verdict = self.gitlab_api._mergeability_verdict(
+                mr.get('detailed_merge_status'),
+                mr.get('merge_status'),
+                mr.get('has_conflicts')
+            )
+            if verdict is not None:
+                return mr, verdict
+                
+            if time.monotonic() + delay > deadline:
+                return mr, None
+                
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.gitlab_api.CONFLICT_POLL_MAX_DELAY)
+            response = await self._request('GET', f"/projects/{project_id}/merge_requests/{mr['iid']}")
+            mr = response.json()
+            
+    async def merge_branches(self, project_id, source_branch, target_branch, squash=False, merge_request=None):
+        """
+        Realiza o merge de duas branches por meio de um MR
+        
+        Args:
+            merge_request (dict): MR mantido por prepare_merge_request, usado sem nova busca (opcional)
+            
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        try:
+            mr = merge_request
+            if mr is None:
+                mr, _ = await self._find_or_create_merge_request(project_id, source_branch, target_branch, squash)
+            if mr is None:
+                return False, f"Não foi possível criar ou encontrar um MR"
+                
+            mr_path = f"/projects/{project_id}/merge_requests/{mr['iid']}"
+            if mr.get('state') == 'merged':
+                return True, f"Merge de {source_branch} para {target_branch} já realizado anteriormente"
+            if mr.get('has_conflicts'):
+                return False, f"Existem conflitos entre {source_branch} e {target_branch} que precisam ser resolvidos"
+            if mr.get('squash') != squash:
+                await self._request('PUT', mr_path, json={'squash': squash})
+                
+            try:
+                await self._request('PUT', f"{mr_path}/merge")
+            except AsyncGitLabError as e:
+                if e.status_code == 405:
+                    # O MR pode ter sido fechado ou mesclado por outro processo
+                    response = await self._request('GET', mr_path)
+                    if response.json().get('state') == 'merged':
+                        return True, f"Merge de {source_branch} para {target_branch} já realizado"
+                    return False, f"O merge request foi fechado antes de ser mesclado"
+                if e.status_code in (406, 409):
+                    return False, f"Existem conflitos entre {source_branch} e {target_branch} que precisam ser resolvidos"
+                raise
+                
+            return True, f"Merge de {source_branch} para {target_branch} realizado com sucesso"
+        except Exception as e:
+            return False, f"Erro ao realizar merge: {str(e)}"
+        finally:
+            # O commit do destino pode ter mudado
+            self.gitlab_api.notify_branches_changed(project_id, target_branch)
+
+
+class AsyncGitLabError(Exception):
+    """
+    Erro HTTP retornado pelo GitLab ao backend assíncrono
+    """
+    
+    def __init__(self, status_code, message):
+        """
+        Inicializa o erro
+        
+        Args:
+            status_code (int): Status HTTP da resposta
+            message (str): Mensagem retornada pelo servidor
+        """
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+
+class AsyncLoopThread:
+    """
+    Loop de eventos asyncio executado em uma thread própria
+    
+    Permite que código síncrono (QThreads, pools de threads) agende corrotinas no
+    loop compartilhado e aguarde seus resultados.
+    """
+    
+    def __init__(self):
+        """
+        Inicializa e inicia o loop
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="gitlab-async-loop", daemon=True)
+        self._thread.start()
+        
+    def _run(self):
+        """
+        Executa o loop até que stop seja chamado
+        """
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        
+    def submit(self, coro):
+        """
+        Agenda uma corrotina no loop
+        
+        Args:
+            coro: Corrotina a executar
+            
+        Returns:
+            concurrent.futures.Future: Futuro com o resultado da corrotina
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+        
+    def run(self, coro):
+        """
+        Executa uma corrotina no loop e aguarda seu resultado
+        
+        Args:
+            coro: Corrotina a executar
+            
+        Returns:
+            object: Resultado da corrotina
+        """
+        return self.submit(coro).result()
+        
+    def stop(self):
+        """
+        Encerra o loop e aguarda o fim da thread
+        """
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+class AsyncGitLabBackend:
+    """
+    Fachada síncrona sobre o AsyncGitLabAPI
+    
+    Expõe os mesmos métodos de escrita do GitLabAPI usados pelo MergePipeline e pela
+    remoção de branches, executando-os no loop compartilhado, e permite agendar lotes
+    inteiros de corrotinas (submit_all). O AsyncGitLabAPI compartilha os caches do
+    GitLabAPI e os atualiza após cada alteração, como acontece no backend síncrono.
+    """
+    
+    # Verificações e merges simultâneos quando o backend assíncrono está em uso
+    CHECK_WORKERS = 32
+    MERGE_WORKERS = 16
+    
+    def __init__(self, gitlab_api):
+        """
+        Inicializa o backend a partir das credenciais do GitLabAPI já autenticado
+        
+        Args:
+            gitlab_api: Instância do GitLabAPI
+        """
+        self.gitlab_api = gitlab_api
+        self.api = AsyncGitLabAPI(gitlab_api.url, gitlab_api.token, gitlab_api)
+        self.runner = AsyncLoopThread()
+        
+    @classmethod
+    def from_environment(cls, gitlab_api):
+        """
+        Cria o backend se ele foi habilitado pela variável GITLAB_ASYNC_BACKEND
+        
+        Args:
+            gitlab_api: Instância do GitLabAPI
+            
+        Returns:
+            AsyncGitLabBackend ou None: Backend, ou None se desabilitado ou sem httpx
+        """
+        if os.environ.get('GITLAB_ASYNC_BACKEND', '').lower() not in ('1', 'true', 'yes'):
+            return None
+        if not AsyncGitLabAPI.is_available():
+            # A variável foi definida, mas sem o httpx o backend padrão continua em uso
+            print("AVISO: GITLAB_ASYNC_BACKEND está definida, mas o pacote httpx não está instalado; "
+                  "usando o backend padrão (instale com: pip install -r requirements-async.txt)", file=sys.stderr)
+            return None
+        return cls(gitlab_api)
+        
+    def close(self):
+        """
+        Fecha o cliente HTTP e encerra o loop
+        """
+        try:
+            self.runner.run(self.api.close())
+        finally:
+            self.runner.stop()
+            
+    def submit_all(self, coroutine_function, items, limit):
+        """
+        Agenda uma corrotina para cada item, com no máximo `limit` em andamento
+        
+        O lote inteiro roda no loop compartilhado, sem uma thread por item; o span ativo
+        de quem agendou é o pai dos spans criados nas corrotinas.
+        
+        Args:
+            coroutine_function (callable): Função assíncrona chamada com cada item
+            items (list): Itens do lote
+            limit (int): Quantidade máxima de corrotinas em andamento
+            
+        Returns:
+            dict: {concurrent.futures.Future: item}
+        """
+        semaphore = self.runner.run(self._create_semaphore(max(1, limit)))
+        parent = tracing.current_span()
+        
+        async def limited(item):
+            async with semaphore:
+                with tracing.activate(parent):
+                    return await coroutine_function(item)
+                    
+        return {self.runner.submit(limited(item)): item for item in items}
+        
+    @staticmethod
+    async def _create_semaphore(limit):
+        """
+        Cria um semáforo dentro do loop, ao qual ele fica associado
+        
+        Returns:
+            asyncio.Semaphore: Semáforo com `limit` vagas
+        """
+        return asyncio.Semaphore(limit)
+        
+    def delete_branches_async(self, project_id, branch_names):
+        """
+        Agenda a remoção de várias branches, todas em andamento ao mesmo tempo
+        
+        Args:
+            project_id (int): ID do projeto no GitLab
+            branch_names (list): Nomes das branches
+            
+        Returns:
+            dict: {concurrent.futures.Future: nome_da_branch}; cada futuro resulta em (sucesso, mensagem)
+        """
+        return {
+            self.runner.submit(self.api.delete_branch(project_id, branch_name)): branch_name
+            for branch_name in branch_names
+        }
+        
+    @tracing.traced('project_id', 'branch_name', name='AsyncGitLabBackend.delete_branch')
+    def delete_branch(self, project_id, branch_name):
+        """
+        Remove uma branch remota
+        
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        return self.runner.run(self.api.delete_branch(project_id, branch_name))
+        
+    @tracing.traced('project_id', 'source_branch', 'target_branch', name='AsyncGitLabBackend.check_branch_differences')
+    def check_branch_differences(self, project_id, source_branch, target_branch):
+        """
+        Verifica se há diferenças entre as branches
+        
+        Returns:
+            tuple: (sucesso, tem_diferenca, mensagem)
+        """
+        return self.runner.run(self.api.check_branch_differences(project_id, source_branch, target_branch))
+        
+    @tracing.traced('project_id', 'source_branch', 'target_branch', name='AsyncGitLabBackend.check_merge_conflicts')
+    def check_merge_conflicts(self, project_id, source_branch, target_branch):
+        """
+        Verifica se há conflitos de merge entre duas branches
+        
+        Returns:
+            tuple: (sucesso, tem_conflito, mensagem)
+        """
+        return self.runner.run(self.api.check_merge_conflicts(project_id, source_branch, target_branch))
+        
+    @tracing.traced('project_id', 'source_branch', 'target_branch', 'squash', name='AsyncGitLabBackend.merge_branches')
+    def merge_branches(self, project_id, source_branch, target_branch, squash=False, merge_request=None):
+        """
+        Realiza o merge de duas branches
+        
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        return self.runner.run(self.api.merge_branches(project_id, source_branch, target_branch, squash, merge_request))
\ No newline at end of file
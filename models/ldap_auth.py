@@ -3,10 +3,11 @@ Classe para gerenciar a autenticação LDAP/Active Directory
 """
 import ldap3
 import ssl
-import time
 from ldap3 import Server, Connection, ALL, NTLM, SIMPLE, SASL, GSSAPI
 from ldap3.core.exceptions import LDAPException, LDAPBindError, LDAPSocketOpenError
 
+from utils.metrics import measured, registry
+
 class LDAPAuth:
     """
     Modelo responsável pela autenticação LDAP/AD e integração com GitLab
@@ -23,7 +24,11 @@ class LDAPAuth:
         self.server = None
         self.connection = None
         self.user_data = None
+        
+        # Registro das métricas de latência e erros da autenticação
+        self.metrics = registry
     
+    @measured('ldap_authenticate')
     def authenticate(self, server_url, domain, username, password, use_ssl=True, auth_method='SIMPLE'):
         """
         Autentica o usuário via LDAP/AD
@@ -39,8 +44,6 @@ class LDAPAuth:
         Returns:
             tuple: (sucesso, mensagem)
         """
-        start_time = time.time()
-        
         # Validação básica dos campos
         if not server_url or not username or not password:
             return False, "Servidor, nome de usuário e senha são obrigatórios"
@@ -78,23 +81,22 @@ class LDAPAuth:
             if self.connection.bound:
                 # Buscar informações do usuário
                 self._fetch_user_info(username, domain)
-                elapsed = time.time() - start_time
                 return True, "Autenticação LDAP bem-sucedida"
             else:
-                elapsed = time.time() - start_time
+                self.metrics.fail('BindFailed')
                 return False, "Falha na autenticação LDAP"
                 
         except LDAPBindError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de autenticação LDAP: {str(e)}"
         except LDAPSocketOpenError as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro de conexão com servidor LDAP: {str(e)}"
         except LDAPException as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro LDAP: {str(e)}"
         except Exception as e:
-            elapsed = time.time() - start_time
+            self.metrics.fail(e)
             return False, f"Erro ao autenticar via LDAP: {str(e)}"
     
     def _fetch_user_info(self, username, domain):
@@ -0,0 +1,442 @@
+"""
+Execução em paralelo dos merges de uma branch de origem em várias branches de destino
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import tracing
+
+class MergePipeline:
+    """
+    Modelo responsável por mesclar uma branch de origem em várias branches de destino
+    
+    O processo tem duas etapas. Primeiro, as verificações de diferenças e de conflitos
+    de todos os destinos rodam em paralelo; se algum destino tiver conflitos, nenhum
+    merge é realizado. Depois, os merges rodam com paralelismo configurável. Destinos
+    repetidos são agrupados, de modo que cada destino recebe um único merge e dois
+    merges nunca disputam a mesma branch.
+    
+    Sem backend assíncrono, cada destino ocupa uma thread de um pool; com ele, todos
+    os destinos de uma etapa são agendados como corrotinas no loop do backend.
+    
+    O MR criado para verificar os conflitos de um destino é mantido e usado no seu
+    merge; ele só é descartado se o merge não acontecer (conflitos em outro destino
+    ou cancelamento).
+    
+    Os callbacks são chamados na thread que executa run(), na ordem em que cada
+    destino é concluído. Todo destino iniciado recebe um desfecho: on_completed,
+    on_error ou, se o merge foi cancelado, on_skipped seguido de
+    on_completed(destino, False).
+    """
+    
+    # Número padrão de destinos verificados simultaneamente
+    DEFAULT_CHECK_WORKERS = 8
+    
+    # Número padrão de destinos mesclados simultaneamente
+    DEFAULT_MERGE_WORKERS = 4
+    
+    # Resultados da verificação de um destino
+    CHECK_MERGE = 'merge'
+    CHECK_SKIP = 'skip'
+    CHECK_ERROR = 'error'
+    CHECK_CONFLICT = 'conflict'
+    
+    def __init__(self, gitlab_api, project_id, source_branch, target_branches, squash=False,
+                 check_workers=None, merge_workers=None, async_backend=None):
+        """
+        Inicializa o pipeline
+        
+        Args:
+            gitlab_api: Instância do GitLabAPI
+            project_id: ID do projeto no GitLab
+            source_branch: Nome da branch de origem
+            target_branches: Lista de nomes de branches de destino
+            squash: Se deve combinar commits em um único
+            check_workers (int): Número máximo de verificações simultâneas (opcional)
+            merge_workers (int): Número máximo de merges simultâneos (opcional)
+            async_backend (AsyncGitLabBackend): Backend que executa as etapas como
+                corrotinas (opcional)
+        """
+        self.gitlab_api = gitlab_api
+        self.async_backend = async_backend
+        self.project_id = project_id
+        self.source_branch = source_branch
+        self.target_branches = list(target_branches)
+        self.squash = squash
+        self.check_workers = max(1, check_workers or self.DEFAULT_CHECK_WORKERS)
+        self.merge_workers = max(1, merge_workers or self.DEFAULT_MERGE_WORKERS)
+        
+        self.failed_merges = []
+        self.skipped_merges = []
+        self.cancelled = False
+        
+        # MRs criados nas verificações, usados nos merges: {target_branch: MR}
+        self._merge_requests = {}
+        
+    def cancel(self):
+        """
+        Interrompe o pipeline; merges ainda não iniciados deixam de ser realizados
+        """
+        self.cancelled = True
+        
+    def run(self, on_started=None, on_completed=None, on_error=None, on_skipped=None):
+        """
+        Executa as verificações e os merges
+        
+        Args:
+            on_started (callable): Chamado com (target_branch) quando o destino começa a ser processado
+            on_completed (callable): Chamado com (target_branch, sucesso) quando o destino é concluído
+                (sucesso é False se o merge foi cancelado)
+            on_error (callable): Chamado com (target_branch, mensagem) quando o destino falha
+            on_skipped (callable): Chamado com (target_branch, motivo) quando o merge é pulado
+            
+        Returns:
+            bool: True se todas as operações foram bem-sucedidas
+        """
+        self._on_completed = on_completed
+        self._on_error = on_error
+        self._on_skipped = on_skipped
+        overall_success = True
+        
+        # Agrupar os destinos repetidos: um único merge por destino
+        targets = list(OrderedDict.fromkeys(self.target_branches))
+        if not targets:
+            return overall_success
+            
+        # Etapa 1: verificar diferenças e conflitos de todos os destinos em paralelo
+        if on_started:
+            for target_branch in targets:
+                on_started(target_branch)
+                
+        ready_targets = []
+        conflicting_targets = []
+        for target_branch, (outcome, message, merge_request) in self._run_stage(
+                self._check_target, self._check_target_async, targets, self.check_workers):
+            if merge_request is not None:
+                self._merge_requests[target_branch] = merge_request
+            if outcome == self.CHECK_MERGE:
+                ready_targets.append(target_branch)
+            elif outcome == self.CHECK_SKIP:
+                self._skip(target_branch, message)
+            elif outcome == self.CHECK_CONFLICT:
+                conflicting_targets.append(target_branch)
+                self._fail(target_branch, message, "Conflitos de merge detectados")
+                overall_success = False
+            else:
+                self._fail(target_branch, message)
+                overall_success = False
+                
+        # Como foi especificado cancelar todo o processo em caso de conflito
+        if conflicting_targets or self.cancelled:
+            reason = (
+                f"Merge cancelado devido a conflitos em: {', '.join(conflicting_targets)}"
+                if conflicting_targets else "Merge cancelado"
+            )
+            for target_branch in self._in_request_order(ready_targets):
+                self._cancel(target_branch, reason)
+            self._discard_merge_requests()
+            return overall_success
+            
+        # Etapa 2: realizar os merges com paralelismo limitado
+        if not ready_targets:
+            return overall_success
+            
+        ready_targets = self._in_request_order(ready_targets)
+        for target_branch, (success, message) in self._run_stage(
+                self._merge_target, self._merge_target_async, ready_targets, self.merge_workers):
+            if success is None:
+                # Pipeline interrompido antes deste merge
+                self._cancel(target_branch, message)
+                continue
+                
+            if success:
+                # Se a mensagem contiver "já realizado", considerar como um skip
+                if "já realizado" in message.lower():
+                    self.skipped_merges.append((target_branch, message))
+                    if on_skipped:
+                        on_skipped(target_branch, message)
+                        
+                if on_completed:
+                    on_completed(target_branch, True)
+            elif "404" in message:
+                # Se a mensagem de erro contiver "404", provavelmente significa que não há conflitos/diferenças
+                reason = f"Não há diferenças significativas entre {self.source_branch} e {target_branch} (indicado por 404)"
+                self._skip(target_branch, reason)
+            else:
+                self._fail(target_branch, message)
+                overall_success = False
+                
+        # MRs de merges interrompidos pelo cancelamento
+        self._discard_merge_requests()
+        return overall_success
+        
+    def _discard_merge_requests(self):
+        """
+        Descarta, em paralelo, os MRs criados nas verificações cujos merges não foram realizados
+        """
+        if self._merge_requests:
+            for _ in self._run_stage(self._discard_target, self._discard_target_async,
+                                     list(self._merge_requests), self.merge_workers):
+                pass
+                
+    def _discard_target(self, target_branch):
+        """
+        Descarta o MR criado na verificação de um destino, se ainda não foi usado
+        
+        Args:
+            target_branch: Nome da branch de destino
+        """
+        merge_request = self._merge_requests.pop(target_branch, None)
+        if merge_request is not None:
+            self.gitlab_api.discard_merge_request(self.project_id, self.source_branch, target_branch, merge_request)
+            
+    async def _discard_target_async(self, target_branch):
+        """
+        Equivalente de _discard_target executado como corrotina no backend assíncrono
+        
+        Args:
+            target_branch: Nome da branch de destino
+        """
+        merge_request = self._merge_requests.pop(target_branch, None)
+        if merge_request is not None:
+            await self.async_backend.api.discard_merge_request(
+                self.project_id, self.source_branch, target_branch, merge_request
+            )
+            
+    def _run_stage(self, method, async_method, target_branches, workers):
+        """
+        Executa uma etapa em todos os destinos, entregando os resultados à medida que ficam prontos
+        
+        Args:
+            method (callable): Função executada por destino em uma thread do pool
+            async_method (callable): Corrotina equivalente, usada com o backend assíncrono
+            target_branches (list): Destinos da etapa
+            workers (int): Número máximo de destinos processados simultaneamente
+            
+        Yields:
+            tuple: (target_branch, resultado)
+        """
+        workers = min(workers, len(target_branches))
+        if self.async_backend:
+            futures = self.async_backend.submit_all(async_method, target_branches, workers)
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+            return
+            
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(tracing.wrap(method), target_branch): target_branch
+                for target_branch in target_branches
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+                
+    def _in_request_order(self, target_branches):
+        """
+        Ordena destinos conforme a ordem em que foram solicitados
+        
+        Args:
+            target_branches (list): Destinos a ordenar
+            
+        Returns:
+            list: Destinos na ordem original
+        """
+        order = {target_branch: index for index, target_branch in enumerate(self.target_branches)}
+        return sorted(target_branches, key=order.get)
+        
+    def _skip(self, target_branch, reason):
+        """
+        Registra um destino pulado, que conta como concluído com sucesso
+        
+        Args:
+            target_branch: Nome da branch de destino
+            reason: Motivo pelo qual o merge foi pulado
+        """
+        self.skipped_merges.append((target_branch, reason))
+        if self._on_skipped:
+            self._on_skipped(target_branch, reason)
+        if self._on_completed:
+            self._on_completed(target_branch, True)
+            
+    def _cancel(self, target_branch, reason):
+        """
+        Registra um destino cujo merge foi cancelado, concluindo-o sem sucesso
+        
+        Args:
+            target_branch: Nome da branch de destino
+            reason: Motivo do cancelamento
+        """
+        self.skipped_merges.append((target_branch, reason))
+        if self._on_skipped:
+            self._on_skipped(target_branch, reason)
+        if self._on_completed:
+            self._on_completed(target_branch, False)
+            
+    def _fail(self, target_branch, message, failure_reason=None):
+        """
+        Registra um destino que falhou
+        
+        Args:
+            target_branch: Nome da branch de destino
+            message: Mensagem de erro exibida ao usuário
+            failure_reason: Motivo registrado na lista de falhas (opcional, usa a mensagem)
+        """
+        self.failed_merges.append((target_branch, failure_reason or message))
+        if self._on_error:
+            self._on_error(target_branch, message)
+            
+    @tracing.traced('target_branch', name='MergePipeline.check_target')
+    def _check_target(self, target_branch):
+        """
+        Verifica se um destino precisa de merge e se ele pode ser feito sem conflitos
+        
+        Args:
+            target_branch: Nome da branch de destino
+            
+        Returns:
+            tuple: (resultado, mensagem, MR criado na verificação ou None), onde
+                resultado é uma das constantes CHECK_*
+        """
+        try:
+            # Verificar diferenças entre as branches
+            outcome = self._differences_outcome(target_branch, self.gitlab_api.check_branch_differences(
+                self.project_id, self.source_branch, target_branch
+            ))
+            if outcome:
+                return outcome + (None,)
+                
+            # Verificar conflitos antes de tentar merge, mantendo o MR para o merge
+            return self._conflicts_outcome(target_branch, self.gitlab_api.prepare_merge_request(
+                self.project_id, self.source_branch, target_branch
+            ))
+        except Exception as e:
+            return self.CHECK_ERROR, f"Erro ao verificar branches: {str(e)}", None
+            
+    async def _check_target_async(self, target_branch):
+        """
+        Equivalente de _check_target executado como corrotina no backend assíncrono
+        
+        Args:
+            target_branch: Nome da branch de destino
+            
+        Returns:
+            tuple: (resultado, mensagem, MR criado na verificação ou None), onde
+                resultado é uma das constantes CHECK_*
+        """
+        api = self.async_backend.api
+        with tracing.span('MergePipeline.check_target', target_branch=target_branch):
+            try:
+                outcome = self._differences_outcome(target_branch, await api.check_branch_differences(
+                    self.project_id, self.source_branch, target_branch
+                ))
+                if outcome:
+                    return outcome + (None,)
+                    
+                return self._conflicts_outcome(target_branch, await api.prepare_merge_request(
+                    self.project_id, self.source_branch, target_branch
+                ))
+            except Exception as e:
+                return self.CHECK_ERROR, f"Erro ao verificar branches: {str(e)}", None
+                
+    def _differences_outcome(self, target_branch, result):
+        """
+        Interpreta a verificação de diferenças de um destino
+        
+        Args:
+            target_branch: Nome da branch de destino
+            result (tuple): (sucesso, tem_diferenca, mensagem) de check_branch_differences
+            
+        Returns:
+            tuple ou None: (resultado, mensagem), ou None se os conflitos ainda devem ser verificados
+        """
+        success, has_diff, message = result
+        
+        if not success:
+            # Se contém "404", provavelmente significa que não há diferenças
+            if "404" in message:
+                reason = f"Não há diferenças significativas entre {self.source_branch} e {target_branch} (indicado por 404)"
+                return self.CHECK_SKIP, reason
+            # Se a mensagem contiver algo relacionado a MR, pode ser que o merge possa continuar
+            if "há um mr aberto" not in message.lower():
+                return self.CHECK_ERROR, f"Erro ao verificar diferenças: {message}"
+                
+        if not has_diff:
+            # Sem diferenças, não precisa de merge
+            reason = f"Não há diferenças entre {self.source_branch} e {target_branch} (merge não necessário)"
+            return self.CHECK_SKIP, reason
+        return None
+        
+    def _conflicts_outcome(self, target_branch, result):
+        """
+        Interpreta a verificação de conflitos de um destino
+        
+        Args:
+            target_branch: Nome da branch de destino
+            result (tuple): (sucesso, tem_conflito, mensagem, MR) de prepare_merge_request
+            
+        Returns:
+            tuple: (resultado, mensagem, MR), onde resultado é uma das constantes CHECK_*
+        """
+        success, has_conflicts, message, merge_request = result
+        
+        if not success:
+            # Se a mensagem indicar que o MR já foi mesclado, podemos considerar como sucesso
+            if "já realizado" in message.lower():
+                return self.CHECK_SKIP, f"Merge de {self.source_branch} para {target_branch} já foi realizado anteriormente", None
+            # Se contém "404", provavelmente significa que não há conflitos
+            if "404" in message:
+                return self.CHECK_SKIP, f"Não há conflitos entre {self.source_branch} e {target_branch} (indicado por 404)", None
+            return self.CHECK_ERROR, f"Erro ao verificar conflitos: {message}", None
+            
+        if has_conflicts:
+            # Há conflitos, não pode fazer merge automático
+            return self.CHECK_CONFLICT, "Existem conflitos de merge que precisam ser resolvidos manualmente", None
+            
+        return self.CHECK_MERGE, None, merge_request
+        
+    @tracing.traced('target_branch', name='MergePipeline.merge_target')
+    def _merge_target(self, target_branch):
+        """
+        Realiza o merge em um destino
+        
+        Args:
+            target_branch: Nome da branch de destino
+            
+        Returns:
+            tuple: (sucesso, mensagem); sucesso é None se o pipeline foi interrompido
+        """
+        if self.cancelled:
+            return None, "Merge cancelado"
+            
+        try:
+            result = self.gitlab_api.merge_branches(
+                self.project_id, self.source_branch, target_branch, self.squash,
+                self._merge_requests.pop(target_branch, None)
+            )
+        except Exception as e:
+            result = (False, f"Erro ao realizar merge: {str(e)}")
+            
+        # O ritmo das requisições é controlado pela sessão HTTP do GitLabAPI
+        return result
+        
+    async def _merge_target_async(self, target_branch):
+        """
+        Equivalente de _merge_target executado como corrotina no backend assíncrono
+        
+        Args:
+            target_branch: Nome da branch de destino
+            
+        Returns:
+            tuple: (sucesso, mensagem); sucesso é None se o pipeline foi interrompido
+        """
+        if self.cancelled:
+            return None, "Merge cancelado"
+            
+        with tracing.span('MergePipeline.merge_target', target_branch=target_branch):
+            try:
+                return await self.async_backend.api.merge_branches(
+                    self.project_id, self.source_branch, target_branch, self.squash,
+                    self._merge_requests.pop(target_branch, None)
+                )
+            except Exception as e:
+                return False, f"Erro ao realizar merge: {str(e)}"
\ No newline at end of file
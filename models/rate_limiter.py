@@ -0,0 +1,198 @@
+"""
+Controle de ritmo das requisições HTTP enviadas ao GitLab
+"""
+import asyncio
+import threading
+import time
+
+import requests
+
+from utils import tracing
+
+class TokenBucket:
+    """
+    Balde de fichas que limita a taxa de requisições e se adapta ao servidor
+    
+    Cada requisição consome uma ficha; as fichas são repostas continuamente na taxa
+    atual. A taxa é recalculada a partir dos cabeçalhos RateLimit-* das respostas, de
+    forma que o orçamento restante seja distribuído até o fim da janela do servidor.
+    Um orçamento esgotado suspende todas as requisições até RateLimit-Reset, e um
+    Retry-After as suspende pelo tempo pedido.
+    """
+    
+    # Taxa (requisições por segundo) usada enquanto o servidor não informa seus limites
+    DEFAULT_RATE = 20.0
+    
+    # Limites da taxa adaptada
+    MIN_RATE = 0.5
+    MAX_RATE = 100.0
+    
+    # Quantidade máxima de fichas acumuladas (rajada permitida)
+    DEFAULT_CAPACITY = 20
+    
+    def __init__(self, rate=None, capacity=None):
+        """
+        Inicializa o balde
+        
+        Args:
+            rate (float): Taxa inicial em requisições por segundo (opcional)
+            capacity (int): Quantidade máxima de fichas acumuladas (opcional)
+        """
+        self.rate = rate or self.DEFAULT_RATE
+        self.capacity = capacity or self.DEFAULT_CAPACITY
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        
+    def acquire(self):
+        """
+        Aguarda até haver uma ficha disponível e a consome
+        """
+        wait = self._try_acquire()
+        while wait:
+            time.sleep(wait)
+            wait = self._try_acquire()
+            
+    async def acquire_async(self):
+        """
+        Equivalente de acquire para corrotinas: aguarda sem bloquear o loop de eventos
+        """
+        wait = self._try_acquire()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._try_acquire()
+            
+    def _try_acquire(self):
+        """
+        Consome uma ficha, se houver uma disponível
+        
+        Returns:
+            float: 0 se a ficha foi consumida, ou o tempo (em segundos) a aguardar antes
+                de tentar novamente
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+                
+            if now < self._paused_until:
+                return self._paused_until - now
+            return (1 - self._tokens) / self.rate
+            
+    def observe(self, response):
+        """
+        Ajusta o ritmo a partir dos cabeçalhos de limite de uma resposta
+        
+        Args:
+            response (requests.Response ou httpx.Response): Resposta recebida do servidor
+        """
+        headers = response.headers
+        remaining = self._header_number(headers, 'RateLimit-Remaining')
+        reset_at = self._header_number(headers, 'RateLimit-Reset')
+        retry_after = self._header_number(headers, 'Retry-After')
+        
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            if remaining is not None:
+                # Nunca acumular mais fichas do que o servidor ainda aceita
+                self._tokens = min(self._tokens, remaining)
+                
+                # Distribuir o orçamento restante até o fim da janela atual
+                window = max(1.0, reset_at - time.time()) if reset_at is not None else 60.0
+                self.rate = min(self.MAX_RATE, max(self.MIN_RATE, remaining / window))
+                
+                if remaining <= 0:
+                    # Orçamento esgotado: suspender até o servidor renovar a janela
+                    until_reset = max(0.0, reset_at - time.time()) if reset_at is not None else window
+                    self._paused_until = max(self._paused_until, now + until_reset)
+                    
+            if response.status_code == 429 or retry_after is not None:
+                # Suspender todas as requisições pelo tempo pedido pelo servidor
+                delay = retry_after if retry_after is not None else 1.0 / self.rate
+                self._paused_until = max(self._paused_until, now + delay)
+                self._tokens = 0.0
+                
+    def _refill(self, now):
+        """
+        Repõe as fichas acumuladas desde a última atualização
+        
+        Args:
+            now (float): Instante atual (time.monotonic)
+        """
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+        
+    @staticmethod
+    def _header_number(headers, name):
+        """
+        Lê um cabeçalho numérico
+        
+        Returns:
+            float ou None: Valor do cabeçalho, ou None se ausente ou inválido
+        """
+        value = headers.get(name)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+
+class RateLimitedSession(requests.Session):
+    """
+    Sessão HTTP que passa todas as requisições pelo mesmo TokenBucket
+    
+    É entregue ao python-gitlab (gitlab.Gitlab(session=...)), então todas as
+    chamadas, inclusive as feitas em paralelo pelos workers, respeitam o mesmo ritmo.
+    """
+    
+    def __init__(self, bucket=None, metrics=None):
+        """
+        Inicializa a sessão
+        
+        Args:
+            bucket (TokenBucket): Balde compartilhado (opcional, cria um novo)
+            metrics (MetricsRegistry): Registro onde cada requisição é medida (opcional)
+        """
+        super().__init__()
+        self.bucket = bucket or TokenBucket()
+        self.metrics = metrics
+        
+    def request(self, method, url, *args, **kwargs):
+        """
+        Executa uma requisição respeitando o ritmo atual
+        
+        Returns:
+            requests.Response: Resposta do servidor
+        """
+        with tracing.span('HTTP', method=method, url=url) as request_span:
+            with tracing.span('RateLimiter.wait'):
+                self.bucket.acquire()
+                
+            start_time = time.time()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except Exception as e:
+                if self.metrics:
+                    self.metrics.observe_http(method, url, time.time() - start_time, error=e)
+                raise
+            request_span.set_attribute('status', response.status_code)
+        
+        if self.metrics:
+            # Respostas em streaming não são lidas aqui; usar o tamanho informado pelo servidor
+            if kwargs.get('stream'):
+                payload_bytes = int(response.headers.get('Content-Length') or 0)
+            else:
+                payload_bytes = len(response.content)
+            self.metrics.observe_http(method, url, time.time() - start_time, response.status_code, payload_bytes)
+            
+        self.bucket.observe(response)
+        return response
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Testes automatizados da aplicação
+"""
\ No newline at end of file
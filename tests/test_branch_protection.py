@@ -0,0 +1,92 @@
+"""
+Testes das regras de proteção de branches e da visão geral do projeto via GraphQL
+
+Uso (a partir da raiz do projeto):
+    python -m unittest discover -s tests -t .
+"""
+import unittest
+
+from benchmarks.fake_gitlab import FakeGitLabDataset, FakeGitLabServer
+from models.gitlab_api import GitLabAPI
+from utils.branch_protection import GitLabRuleMatcher, ProtectionMatcher
+
+# Branches cujo nome contém uma regra do GitLab sem ser protegidas por ela
+EXTRA_BRANCHES = ('feature/main', 'develop/x', 'main-old', 'releases', 'release/1.0', 'release/2.0/hotfix')
+
+
+class GitLabRuleMatcherTest(unittest.TestCase):
+    """
+    Semântica das regras do GitLab em comparação com as regras locais
+    """
+    
+    def test_exact_name_does_not_match_path_parts(self):
+        rules = GitLabRuleMatcher(['main', 'develop'])
+        self.assertTrue(rules.matches('main'))
+        self.assertFalse(rules.matches('feature/main'))
+        self.assertFalse(rules.matches('develop/x'))
+        
+        # As regras locais continuam protegendo as partes do caminho
+        local = ProtectionMatcher(['main', 'develop'])
+        self.assertTrue(local.matches('feature/main'))
+        self.assertTrue(local.matches('develop/x'))
+        
+    def test_wildcard_must_cover_whole_name(self):
+        rules = GitLabRuleMatcher(['release/*', '*-stable'])
+        self.assertTrue(rules.matches('release/1.0'))
+        self.assertTrue(rules.matches('release/2.0/hotfix'))
+        self.assertTrue(rules.matches('1.0-stable'))
+        self.assertFalse(rules.matches('releases'))
+        self.assertFalse(rules.matches('1.0-stable/fix'))
+
+
+class ProjectOverviewProtectionTest(unittest.TestCase):
+    """
+    A proteção calculada a partir das regras via GraphQL deve coincidir com a flag da API REST
+    """
+    
+    def setUp(self):
+        self.dataset = FakeGitLabDataset(branch_count=30, project_count=1)
+        for name in EXTRA_BRANCHES:
+            self.dataset.branches[name] = self.dataset._sha(name)
+        self.dataset.touch()
+        
+        self.server = FakeGitLabServer(self.dataset, 0)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        
+        self.api = GitLabAPI()
+        success, message = self.api.login(self.server.url, 'token-de-teste')
+        self.assertTrue(success, message)
+        self.api._graphql = self._graphql
+        
+    def _graphql(self, query, variables):
+        # Resposta da consulta PROJECT_OVERVIEW_QUERY montada a partir do conjunto de dados
+        names = sorted(self.dataset.branches)
+        offset, limit = variables['branchOffset'], variables['branchLimit']
+        return {'projects': {'nodes': [{
+            'repository': {'rootRef': 'main', 'branchNames': names[offset:offset + limit]},
+            'branchRules': {
+                'nodes': [{'name': rule, 'isProtected': True} for rule in FakeGitLabDataset.PROTECTED_PATTERNS],
+                'pageInfo': {'hasNextPage': False, 'endCursor': None}
+            },
+            'mergeRequests': {'nodes': [], 'pageInfo': {'hasNextPage': False, 'endCursor': None}}
+        }]}}
+        
+    def test_matches_rest_listing(self):
+        project_id = FakeGitLabDataset.PROJECT_ID
+        success, branches = self.api.get_branches(project_id)
+        self.assertTrue(success, branches)
+        rest = {branch.name: branch.protected for branch in branches}
+        
+        success, overview = self.api.get_project_overview(project_id)
+        self.assertTrue(success, overview)
+        graphql = {branch.name: branch.protected for branch in overview['branches']}
+        
+        self.assertEqual(graphql, rest)
+        self.assertFalse(graphql['feature/main'])
+        self.assertFalse(graphql['develop/x'])
+        self.assertTrue(graphql['release/1.0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
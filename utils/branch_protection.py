@@ -0,0 +1,198 @@
+"""
+Regras de proteção de branches compartilhadas pela interface gráfica e pela linha de comando
+"""
+import re
+
+# Curinga aceito nas regras de proteção (mesma semântica do GitLab: "release/*")
+WILDCARD = '*'
+
+
+class ProtectionMatcher:
+    """
+    Regras de proteção compiladas uma única vez
+    
+    Regras sem curinga protegem o nome exato e qualquer parte do caminho com esse
+    nome; ficam em um conjunto, consultado em O(1) por parte. Regras com curinga
+    seguem o GitLab: o padrão precisa cobrir o nome inteiro e "*" aceita qualquer
+    sequência, inclusive "/". Elas ficam em uma trie indexada pelo prefixo literal
+    anterior ao primeiro curinga, de modo que só os padrões cujo prefixo inicia o
+    nome da branch são avaliados. O veredito de cada nome é memorizado; como as
+    regras são imutáveis, basta criar um novo matcher quando a lista mudar.
+    """
+    
+    def __init__(self, protected_branches=()):
+        """
+        Compila as regras de proteção
+        
+        Args:
+            protected_branches (iterable): Nomes, partes de caminho ou padrões com "*"
+        """
+        self.rules = tuple(dict.fromkeys(protected_branches))
+        self._names = set()
+        
+        # Trie de prefixos: {caractere: nó}; a chave None guarda os padrões do nó
+        self._trie = {}
+        for rule in self.rules:
+            if WILDCARD in rule:
+                self._add_pattern(rule)
+            else:
+                self._names.add(rule)
+                
+        # {nome da branch: protegida}
+        self._verdicts = {}
+        
+    def __contains__(self, rule):
+        return rule in self.rules
+        
+    def __iter__(self):
+        return iter(self.rules)
+        
+    def __len__(self):
+        return len(self.rules)
+        
+    def _add_pattern(self, pattern):
+        """
+        Insere um padrão com curinga na trie, sob seu prefixo literal
+        
+        Args:
+            pattern (str): Padrão no formato do GitLab (ex.: "release/*")
+        """
+        node = self._trie
+        for char in pattern[:pattern.index(WILDCARD)]:
+            node = node.setdefault(char, {})
+        regex = '.*'.join(re.escape(part) for part in pattern.split(WILDCARD))
+        node.setdefault(None, []).append(re.compile(regex, re.DOTALL))
+        
+    def _matches_pattern(self, branch_name):
+        """
+        Verifica se algum padrão com curinga cobre o nome inteiro da branch
+        
+        Args:
+            branch_name (str): Nome da branch
+            
+        Returns:
+            bool: True se algum padrão corresponder
+        """
+        node = self._trie
+        for char in branch_name:
+            for regex in node.get(None, ()):
+                if regex.fullmatch(branch_name):
+                    return True
+            node = node.get(char)
+            if node is None:
+                return False
+        return any(regex.fullmatch(branch_name) for regex in node.get(None, ()))
+        
+    def matches(self, branch_name):
+        """
+        Verifica se as regras protegem um nome de branch
+        
+        Args:
+            branch_name (str): Nome da branch
+            
+        Returns:
+            bool: True se a branch for protegida pelas regras
+        """
+        verdict = self._verdicts.get(branch_name)
+        if verdict is None:
+            names = self._names
+            verdict = (
+                branch_name in names
+                or any(part in names for part in branch_name.split('/'))
+                or (bool(self._trie) and self._matches_pattern(branch_name))
+            )
+            self._verdicts[branch_name] = verdict
+        return verdict
+
+
+class GitLabRuleMatcher(ProtectionMatcher):
+    """
+    Regras de proteção de branches do próprio GitLab (protected branches)
+    
+    Diferente das regras locais, um nome sem curinga protege apenas a branch com
+    esse nome exato, sem considerar as partes do caminho: a regra "main" não
+    protege "feature/main" e a regra "develop" não protege "develop/x". Padrões
+    com "*" precisam cobrir o nome inteiro, como na flag "protected" da API REST.
+    """
+    
+    def matches(self, branch_name):
+        """
+        Verifica se as regras do GitLab protegem um nome de branch
+        
+        Args:
+            branch_name (str): Nome da branch
+            
+        Returns:
+            bool: True se o nome for igual a uma regra ou coberto por um padrão
+        """
+        verdict = self._verdicts.get(branch_name)
+        if verdict is None:
+            verdict = branch_name in self._names or (bool(self._trie) and self._matches_pattern(branch_name))
+            self._verdicts[branch_name] = verdict
+        return verdict
+
+
+def compile_protection(protected_branches):
+    """
+    Retorna as regras de proteção compiladas, reaproveitando um matcher existente
+    
+    Args:
+        protected_branches (iterable ou ProtectionMatcher): Regras de proteção
+        
+    Returns:
+        ProtectionMatcher: Regras compiladas
+    """
+    if isinstance(protected_branches, ProtectionMatcher):
+        return protected_branches
+    return ProtectionMatcher(protected_branches)
+
+
+def is_branch_protected(branch_name, protected_branches, branch_obj=None):
+    """
+    Verifica se uma branch é protegida baseada em seu nome, partes do caminho,
+    ou flags de proteção do GitLab
+    
+    Uma branch é protegida quando o GitLab a marca como protegida, quando seu nome
+    está na lista de protegidas, quando qualquer parte do caminho (separado por /)
+    está na lista, de modo que proteger "release" protege também "release/1.0", ou
+    quando um padrão com curinga da lista cobre o nome inteiro ("release/*").
+    
+    Para verificar muitas branches, passe um ProtectionMatcher já compilado.
+    
+    Args:
+        branch_name (str): Nome da branch a ser verificada
+        protected_branches (list ou ProtectionMatcher): Regras de proteção
+        branch_obj (BranchRecord): Registro da branch (opcional)
+        
+    Returns:
+        bool: True se a branch for protegida, False caso contrário
+    """
+    # Verificar se a branch está protegida pelo GitLab
+    if branch_obj is not None and branch_obj.protected:
+        return True
+        
+    # Verificar o nome, as partes do caminho e os padrões com curinga
+    return compile_protection(protected_branches).matches(branch_name)
+
+
+def split_protected(branch_names, protected_branches, branches_by_name=None):
+    """
+    Separa uma lista de branches em protegidas e desprotegidas
+    
+    Args:
+        branch_names (list): Nomes das branches
+        protected_branches (list ou ProtectionMatcher): Regras de proteção
+        branches_by_name (dict): {nome: BranchRecord}, para considerar a proteção do GitLab (opcional)
+        
+    Returns:
+        tuple: (protegidas, desprotegidas), ambas na ordem original
+    """
+    branches_by_name = branches_by_name or {}
+    matcher = compile_protection(protected_branches)
+    protected, unprotected = [], []
+    for name in branch_names:
+        if is_branch_protected(name, matcher, branches_by_name.get(name)):
+            protected.append(name)
+        else:
+            unprotected.append(name)
+    return protected, unprotected
\ No newline at end of file
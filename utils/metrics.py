@@ -0,0 +1,358 @@
+"""
+Registro de métricas de desempenho da aplicação
+"""
+import contextvars
+import functools
+import json
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Limites (em segundos) das faixas dos histogramas de latência
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Trechos variáveis dos caminhos da API, substituídos para agrupar as requisições por endpoint
+_ENDPOINT_PATTERNS = (
+    (re.compile(r'/repository/branches/[^?]+'), '/repository/branches/:branch'),
+    (re.compile(r'/protected_branches/[^/?]+'), '/protected_branches/:branch'),
+    (re.compile(r'/merge_requests/\d+'), '/merge_requests/:iid'),
+    (re.compile(r'/projects/[^/?]+'), '/projects/:id'),
+)
+
+# Classe de erro registrada quando uma operação medida retorna (False, ...) sem informar o erro
+FAILED_RESULT = 'Failed'
+
+# Operação medida em andamento no contexto atual: {'error': erro informado ou None}
+_current_call = contextvars.ContextVar('current_call', default=None)
+
+class Histogram:
+    """
+    Histograma cumulativo de latências, no formato usado pelo Prometheus
+    """
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        Inicializa o histograma
+        
+        Args:
+            buckets (tuple): Limites superiores das faixas, em ordem crescente
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        
+    def observe(self, value):
+        """
+        Registra uma medida
+        
+        Args:
+            value (float): Valor medido, em segundos
+        """
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                
+    def quantile(self, q):
+        """
+        Estima um quantil a partir das faixas
+        
+        Args:
+            q (float): Quantil desejado, entre 0 e 1
+            
+        Returns:
+            float ou None: Limite da primeira faixa que atinge o quantil (None se vazio)
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, cumulative in zip(self.buckets, self.counts):
+            if cumulative >= target:
+                return bound
+        return float('inf')
+        
+    def to_dict(self):
+        """
+        Converte o histograma para um dicionário serializável
+        
+        Returns:
+            dict: Contagem, soma, quantis estimados e faixas cumulativas
+        """
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': {str(bound): cumulative for bound, cumulative in zip(self.buckets, self.counts)}
+        }
+
+
+class MetricsRegistry:
+    """
+    Registro das métricas coletadas durante a execução
+    
+    Guarda, por operação do GitLabAPI/LDAPAuth e por endpoint HTTP, histogramas de
+    latência, contagem de chamadas, bytes recebidos e classes de erro. É seguro para
+    uso a partir de várias threads e pode ser exportado como JSON ou no formato de
+    texto do Prometheus.
+    """
+    
+    def __init__(self):
+        """
+        Inicializa o registro vazio
+        """
+        self._lock = threading.Lock()
+        self.reset()
+        
+    def reset(self):
+        """
+        Descarta todas as métricas coletadas
+        """
+        with self._lock:
+            self._started_at = time.time()
+            
+            # {operação: {'latency': Histogram, 'errors': {classe: contagem}}}
+            self._operations = {}
+            
+            # {(método, endpoint): {'latency': Histogram, 'bytes': int, 'statuses': {status: contagem},
+            #                       'errors': {classe: contagem}}}
+            self._endpoints = {}
+            
+    def observe_call(self, operation, elapsed, error=None):
+        """
+        Registra a execução de uma operação de alto nível
+        
+        Args:
+            operation (str): Nome da operação (ex.: 'get_branches')
+            elapsed (float): Duração em segundos
+            error: Exceção ou nome da classe de erro, se a operação falhou (opcional)
+        """
+        with self._lock:
+            metrics = self._operations.setdefault(operation, {'latency': Histogram(), 'errors': {}})
+            metrics['latency'].observe(elapsed)
+            if error is not None:
+                error_class = error if isinstance(error, str) else type(error).__name__
+                metrics['errors'][error_class] = metrics['errors'].get(error_class, 0) + 1
+                
+    def fail(self, error):
+        """
+        Informa o erro da operação medida em andamento (ver measured)
+        
+        Usado nos tratamentos de exceção que convertem o erro em um resultado (False, ...),
+        para que a classe do erro seja registrada quando a operação terminar.
+        
+        Args:
+            error: Exceção ou nome da classe de erro
+        """
+        call = _current_call.get()
+        if call is not None and call['error'] is None:
+            call['error'] = error
+            
+    def observe_http(self, method, url, elapsed, status=None, payload_bytes=0, error=None):
+        """
+        Registra uma requisição HTTP
+        
+        Args:
+            method (str): Método HTTP
+            url (str): URL ou caminho da requisição
+            elapsed (float): Duração em segundos
+            status (int): Status da resposta (None se não houve resposta)
+            payload_bytes (int): Tamanho do corpo recebido
+            error: Exceção ou nome da classe de erro, se a requisição falhou (opcional)
+        """
+        key = (method.upper(), endpoint_template(url))
+        with self._lock:
+            metrics = self._endpoints.setdefault(
+                key,
+                {'latency': Histogram(), 'bytes': 0, 'statuses': {}, 'errors': {}}
+            )
+            metrics['latency'].observe(elapsed)
+            metrics['bytes'] += payload_bytes or 0
+            if status is not None:
+                metrics['statuses'][status] = metrics['statuses'].get(status, 0) + 1
+            if error is not None:
+                error_class = error if isinstance(error, str) else type(error).__name__
+                metrics['errors'][error_class] = metrics['errors'].get(error_class, 0) + 1
+                
+    def snapshot(self):
+        """
+        Retorna uma cópia das métricas atuais
+        
+        Returns:
+            dict: {'uptime', 'operations': {...}, 'endpoints': [...]}
+        """
+        with self._lock:
+            return {
+                'uptime': round(time.time() - self._started_at, 3),
+                'operations': {
+                    operation: dict(metrics['latency'].to_dict(), errors=dict(metrics['errors']))
+                    for operation, metrics in sorted(self._operations.items())
+                },
+                'endpoints': [
+                    dict(
+                        metrics['latency'].to_dict(),
+                        method=method,
+                        endpoint=endpoint,
+                        bytes=metrics['bytes'],
+                        statuses={str(status): count for status, count in sorted(metrics['statuses'].items())},
+                        errors=dict(metrics['errors'])
+                    )
+                    for (method, endpoint), metrics in sorted(self._endpoints.items())
+                ]
+            }
+            
+    def to_json(self):
+        """
+        Exporta as métricas como JSON
+        
+        Returns:
+            str: Documento JSON com o conteúdo de snapshot()
+        """
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+        
+    def to_prometheus(self):
+        """
+        Exporta as métricas no formato de texto do Prometheus
+        
+        Returns:
+            str: Métricas com linhas HELP/TYPE para cada família
+        """
+        snapshot = self.snapshot()
+        lines = []
+        
+        lines.append('# HELP gitlab_branches_operation_seconds Duração das operações da aplicação')
+        lines.append('# TYPE gitlab_branches_operation_seconds histogram')
+        for operation, metrics in snapshot['operations'].items():
+            lines.extend(_histogram_lines('gitlab_branches_operation_seconds', {'operation': operation}, metrics))
+            
+        lines.append('# HELP gitlab_branches_operation_errors_total Falhas das operações por classe de erro')
+        lines.append('# TYPE gitlab_branches_operation_errors_total counter')
+        for operation, metrics in snapshot['operations'].items():
+            for error_class, count in metrics['errors'].items():
+                labels = _labels({'operation': operation, 'error': error_class})
+                lines.append(f'gitlab_branches_operation_errors_total{labels} {count}')
+                
+        lines.append('# HELP gitlab_branches_http_request_seconds Duração das requisições HTTP por endpoint')
+        lines.append('# TYPE gitlab_branches_http_request_seconds histogram')
+        for metrics in snapshot['endpoints']:
+            labels = {'method': metrics['method'], 'endpoint': metrics['endpoint']}
+            lines.extend(_histogram_lines('gitlab_branches_http_request_seconds', labels, metrics))
+            
+        lines.append('# HELP gitlab_branches_http_requests_total Requisições HTTP por endpoint e status')
+        lines.append('# TYPE gitlab_branches_http_requests_total counter')
+        for metrics in snapshot['endpoints']:
+            for status, count in metrics['statuses'].items():
+                labels = _labels({'method': metrics['method'], 'endpoint': metrics['endpoint'], 'status': status})
+                lines.append(f'gitlab_branches_http_requests_total{labels} {count}')
+                
+        lines.append('# HELP gitlab_branches_http_errors_total Requisições HTTP sem resposta por classe de erro')
+        lines.append('# TYPE gitlab_branches_http_errors_total counter')
+        for metrics in snapshot['endpoints']:
+            for error_class, count in metrics['errors'].items():
+                labels = _labels({'method': metrics['method'], 'endpoint': metrics['endpoint'], 'error': error_class})
+                lines.append(f'gitlab_branches_http_errors_total{labels} {count}')
+                
+        lines.append('# HELP gitlab_branches_http_response_bytes_total Bytes recebidos por endpoint')
+        lines.append('# TYPE gitlab_branches_http_response_bytes_total counter')
+        for metrics in snapshot['endpoints']:
+            labels = _labels({'method': metrics['method'], 'endpoint': metrics['endpoint']})
+            lines.append(f'gitlab_branches_http_response_bytes_total{labels} {metrics["bytes"]}')
+            
+        return '\n'.join(lines) + '\n'
+
+
+def endpoint_template(url):
+    """
+    Converte uma URL em um modelo de endpoint, sem IDs nem nomes de branches
+    
+    Args:
+        url (str): URL completa ou caminho da requisição
+        
+    Returns:
+        str: Caminho com os trechos variáveis substituídos (ex.: /api/v4/projects/:id/repository/branches)
+    """
+    path = urlsplit(url).path or url
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+def _labels(labels):
+    """
+    Formata os rótulos de uma amostra do Prometheus
+    
+    Args:
+        labels (dict): Rótulos e valores
+        
+    Returns:
+        str: Rótulos entre chaves, com os valores escapados
+    """
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _histogram_lines(name, labels, metrics):
+    """
+    Gera as linhas de um histograma no formato do Prometheus
+    
+    Args:
+        name (str): Nome da métrica
+        labels (dict): Rótulos da série
+        metrics (dict): Histograma convertido por Histogram.to_dict
+        
+    Returns:
+        list: Linhas _bucket, _sum e _count
+    """
+    lines = []
+    for bound, cumulative in metrics['buckets'].items():
+        lines.append(f'{name}_bucket{_labels(dict(labels, le=bound))} {cumulative}')
+    lines.append(f'{name}_bucket{_labels(dict(labels, le="+Inf"))} {metrics["count"]}')
+    lines.append(f'{name}_sum{_labels(labels)} {metrics["sum"]}')
+    lines.append(f'{name}_count{_labels(labels)} {metrics["count"]}')
+    return lines
+
+
+def measured(operation):
+    """
+    Decorador que registra a duração de um método inteiro como uma operação
+    
+    Todas as chamadas são medidas, inclusive retornos antecipados e respostas vindas de
+    cache. A chamada conta como erro se uma exceção escapar, se o erro foi informado
+    com fail() ou se o método retornar (False, ...). O registro usado é o atributo
+    metrics do objeto.
+    
+    Args:
+        operation (str): Nome da operação (ex.: 'get_branches')
+        
+    Returns:
+        callable: Decorador
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            call = {'error': None}
+            token = _current_call.set(call)
+            start_time = time.time()
+            try:
+                result = fn(self, *args, **kwargs)
+                if call['error'] is None and isinstance(result, tuple) and result and result[0] is False:
+                    call['error'] = FAILED_RESULT
+                return result
+            except Exception as e:
+                call['error'] = e
+                raise
+            finally:
+                _current_call.reset(token)
+                self.metrics.observe_call(operation, time.time() - start_time, call['error'])
+        return wrapper
+    return decorator
+    
+    
+# Registro compartilhado pela aplicação
+registry = MetricsRegistry()
\ No newline at end of file
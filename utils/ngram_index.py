@@ -0,0 +1,106 @@
+"""
+Índice de trigramas para busca de substrings em nomes
+"""
+
+
+class NGramIndex:
+    """
+    Índice invertido de trigramas para encontrar os itens cujo texto contém uma substring
+    
+    Cada item é registrado com seu texto em minúsculas. Uma busca com três ou mais
+    caracteres intersecta as listas dos trigramas da consulta, começando pela menor,
+    e confirma apenas os candidatos restantes; o custo acompanha o número de
+    candidatos, e não o total de itens. Consultas mais curtas percorrem os textos.
+    """
+    
+    # Tamanho dos n-gramas indexados
+    N = 3
+    
+    def __init__(self):
+        """
+        Inicializa o índice vazio
+        """
+        # {trigrama: {item}}
+        self._postings = {}
+        
+        # {item: texto em minúsculas}
+        self._texts = {}
+        
+    def __len__(self):
+        return len(self._texts)
+        
+    def _grams(self, text):
+        """
+        Retorna os n-gramas distintos de um texto
+        
+        Returns:
+            set: N-gramas do texto
+        """
+        return {text[i:i + self.N] for i in range(len(text) - self.N + 1)}
+        
+    def add(self, item, text):
+        """
+        Registra um item
+        
+        Args:
+            item: Objeto indexado (precisa ser hashable)
+            text (str): Texto pesquisável do item
+        """
+        text = text.lower()
+        if item in self._texts:
+            self.discard(item)
+        self._texts[item] = text
+        for gram in self._grams(text):
+            self._postings.setdefault(gram, set()).add(item)
+            
+    def discard(self, item):
+        """
+        Remove um item, se estiver registrado
+        
+        Args:
+            item: Objeto indexado
+        """
+        text = self._texts.pop(item, None)
+        if text is None:
+            return
+        for gram in self._grams(text):
+            items = self._postings.get(gram)
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    del self._postings[gram]
+                    
+    def search(self, query):
+        """
+        Procura os itens cujo texto contém a consulta
+        
+        Args:
+            query (str): Substring procurada (sem diferenciar maiúsculas)
+            
+        Returns:
+            list: Itens encontrados, em ordem arbitrária
+        """
+        query = query.lower()
+        if not query:
+            return list(self._texts)
+            
+        if len(query) < self.N:
+            return [item for item, text in self._texts.items() if query in text]
+            
+        postings = []
+        for gram in self._grams(query):
+            items = self._postings.get(gram)
+            if not items:
+                return []
+            postings.append(items)
+            
+        postings.sort(key=len)
+        candidates = postings[0]
+        for items in postings[1:]:
+            candidates = candidates & items
+            if not candidates:
+                return []
+                
+        # Todos os trigramas presentes não garantem a substring inteira (ex.: "abcXbcd" para "abcd")
+        texts = self._texts
+        return [item for item in candidates if query in texts[item]]
\ No newline at end of file
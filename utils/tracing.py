@@ -0,0 +1,370 @@
+"""
+Rastreamento (tracing) hierárquico das operações da aplicação
+"""
+import atexit
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+
+# Span ativo no contexto atual (thread ou tarefa)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+# Identificadores únicos dos spans
+_span_ids = itertools.count(1)
+
+class Span:
+    """
+    Intervalo de tempo de uma operação, com atributos e um span pai opcional
+    """
+    
+    # __weakref__ permite conectar span.end diretamente a sinais do Qt (ex.: QThread.finished)
+    __slots__ = ('name', 'attributes', 'span_id', 'parent_id', 'trace_id', 'start', 'thread_id', '_token',
+                 '__weakref__')
+                 
+    def __init__(self, name, parent=None, attributes=None):
+        """
+        Inicia o span
+        
+        Args:
+            name (str): Nome da operação
+            parent (Span): Span pai (opcional)
+            attributes (dict): Atributos da operação (opcional)
+        """
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.start = time.perf_counter()
+        self.thread_id = threading.get_ident()
+        self._token = None
+        
+    def set_attribute(self, key, value):
+        """
+        Define um atributo do span
+        
+        Args:
+            key (str): Nome do atributo
+            value: Valor do atributo
+        """
+        self.attributes[key] = value
+        
+    def end(self):
+        """
+        Encerra o span e o envia ao exportador
+        """
+        if _exporter is not None:
+            _exporter.export(self, time.perf_counter())
+            
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.attributes['error'] = type(exc).__name__
+        self.end()
+        return False
+
+
+class _NoopSpan:
+    """
+    Span usado quando o rastreamento está desabilitado; não registra nada
+    """
+    
+    __slots__ = ('__weakref__',)
+    
+    def set_attribute(self, key, value):
+        pass
+        
+    def end(self):
+        pass
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class ChromeTraceExporter:
+    """
+    Exportador que grava os spans no formato Chrome Trace Event
+    
+    O arquivo pode ser aberto no chrome://tracing ou no Perfetto (ui.perfetto.dev).
+    Cada span vira um evento completo ("ph": "X"). Os eventos são acrescentados ao
+    arquivo, um por linha, sempre que um span raiz termina ou o buffer enche, e o
+    buffer é esvaziado a cada gravação; o "]" final só é escrito ao encerrar, o que
+    os visualizadores aceitam mesmo se a aplicação for interrompida.
+    """
+    
+    # Quantidade de eventos pendentes que força uma gravação antes do fim do span raiz
+    MAX_BUFFERED_EVENTS = 1000
+    
+    def __init__(self, path):
+        """
+        Inicializa o exportador
+        
+        Args:
+            path (str): Caminho do arquivo de saída
+        """
+        self.path = path
+        self._events = []
+        self._lock = threading.Lock()
+        self._written = 0
+        self._closed = False
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        
+    def export(self, span, end):
+        """
+        Registra um span encerrado
+        
+        Args:
+            span (Span): Span encerrado
+            end (float): Instante do encerramento (time.perf_counter)
+        """
+        args = {key: _serializable(value) for key, value in span.attributes.items()}
+        args.update(span_id=span.span_id, parent_id=span.parent_id, trace_id=span.trace_id)
+        event = {
+            'name': span.name,
+            'cat': span.name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': round((span.start - self._origin) * 1e6, 1),
+            'dur': round((end - span.start) * 1e6, 1),
+            'pid': self._pid,
+            'tid': span.thread_id,
+            'args': args
+        }
+        with self._lock:
+            if self._closed:
+                return
+            self._events.append(event)
+            pending = len(self._events)
+            
+        if span.parent_id is None or pending >= self.MAX_BUFFERED_EVENTS:
+            self.flush()
+            
+    def flush(self):
+        """
+        Acrescenta ao arquivo os spans pendentes e esvazia o buffer
+        """
+        with self._lock:
+            self._write(self._events)
+            self._events = []
+            
+    def close(self):
+        """
+        Grava os spans pendentes e fecha o array JSON do arquivo
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._write(self._events, closing=True)
+            self._events = []
+            self._closed = True
+            
+    def _write(self, events, closing=False):
+        """
+        Acrescenta eventos ao arquivo; deve ser chamado com o lock adquirido
+        
+        O arquivo é truncado e o "[" inicial escrito na primeira gravação. Se a
+        gravação falhar, os eventos são descartados para não acumular memória.
+        
+        Args:
+            events (list): Eventos a gravar
+            closing (bool): Se True, escreve também o "]" final
+        """
+        if not events and not closing:
+            return
+        first = self._written == 0
+        lines = ['[\n'] if first else []
+        for index, event in enumerate(events):
+            separator = ',\n' if self._written + index else ''
+            lines.append(separator + json.dumps(event, ensure_ascii=False))
+        if closing:
+            lines.append('\n]\n')
+        try:
+            with open(self.path, 'w' if first else 'a', encoding='utf-8') as file:
+                file.write(''.join(lines))
+            self._written += len(events)
+        except OSError:
+            # O rastreamento nunca deve interromper a aplicação
+            pass
+
+
+def _serializable(value):
+    """
+    Converte um atributo em um valor aceito pelo JSON
+    
+    Returns:
+        object: O próprio valor, se for simples, ou sua representação em texto
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def configure(path):
+    """
+    Habilita o rastreamento, gravando os spans no arquivo informado
+    
+    Args:
+        path (str): Caminho do arquivo de saída (None desabilita o rastreamento)
+    """
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+    _exporter = ChromeTraceExporter(path) if path else None
+
+
+def is_enabled():
+    """
+    Verifica se o rastreamento está habilitado
+    
+    Returns:
+        bool: True se os spans estão sendo exportados
+    """
+    return _exporter is not None
+
+
+def span(name, parent=None, **attributes):
+    """
+    Cria um span filho do span ativo, para uso com "with"
+    
+    Args:
+        name (str): Nome da operação
+        parent (Span): Span pai (opcional, usa o span ativo)
+        attributes: Atributos da operação
+        
+    Returns:
+        Span: Span que se torna o ativo dentro do bloco (um span vazio se desabilitado)
+    """
+    if _exporter is None:
+        return _NOOP_SPAN
+    return Span(name, parent or _current_span.get(), attributes)
+
+
+def start_span(name, **attributes):
+    """
+    Inicia um span que será encerrado manualmente com end()
+    
+    Usado por ações que começam em um método e terminam em outro, como as
+    operações em lote dos controllers, que terminam quando a thread conclui.
+    
+    Args:
+        name (str): Nome da operação
+        attributes: Atributos da operação
+        
+    Returns:
+        Span: Span iniciado (um span vazio se desabilitado)
+    """
+    return span(name, **attributes)
+
+
+def current_span():
+    """
+    Retorna o span ativo no contexto atual
+    
+    Returns:
+        Span ou None: Span ativo
+    """
+    return _current_span.get()
+
+
+def activate(parent):
+    """
+    Torna um span o ativo em outra thread, sem encerrá-lo ao sair do bloco
+    
+    Args:
+        parent (Span): Span criado em outra thread (ou None)
+        
+    Returns:
+        contexto para uso com "with"
+    """
+    return _Activation(parent)
+
+
+class _Activation:
+    """
+    Contexto que define o span ativo sem alterar seu ciclo de vida
+    """
+    
+    __slots__ = ('parent', '_token')
+    
+    def __init__(self, parent):
+        self.parent = parent if isinstance(parent, Span) else None
+        self._token = None
+        
+    def __enter__(self):
+        if self.parent is not None:
+            self._token = _current_span.set(self.parent)
+        return self.parent
+        
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is not None:
+            _current_span.reset(self._token)
+        return False
+
+
+def wrap(fn):
+    """
+    Prende uma função ao contexto atual, para executá-la em outra thread
+    
+    Usado ao enviar tarefas a um ThreadPoolExecutor, cujas threads não herdam o
+    span ativo de quem as criou.
+    
+    Args:
+        fn (callable): Função a executar
+        
+    Returns:
+        callable: A própria função se desabilitado, ou a função presa ao contexto
+    """
+    if _exporter is None:
+        return fn
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def traced(*argument_names, name=None):
+    """
+    Decorador que executa a função dentro de um span
+    
+    Args:
+        argument_names (str): Argumentos da função registrados como atributos do span
+        name (str): Nome do span (opcional, usa Classe.método)
+        
+    Returns:
+        callable: Decorador
+    """
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+        signature = inspect.signature(fn)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _exporter is None:
+                return fn(*args, **kwargs)
+                
+            attributes = {}
+            if argument_names:
+                bound = signature.bind_partial(*args, **kwargs)
+                attributes = {key: bound.arguments[key] for key in argument_names if key in bound.arguments}
+            with Span(span_name, _current_span.get(), attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Exportador ativo; habilitado pela variável de ambiente GITLAB_TRACE_FILE
+_exporter = None
+configure(os.environ.get('GITLAB_TRACE_FILE'))
+atexit.register(lambda: _exporter is not None and _exporter.close())
\ No newline at end of file
@@ -0,0 +1,709 @@
+"""
+Modelo de árvore com carregamento sob demanda para a listagem de branches
+"""
+from bisect import bisect_left, bisect_right
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+from utils.ngram_index import NGramIndex
+
+# Cores usadas na árvore (as mesmas dos itens da antiga QTreeWidget)
+_PROTECTED_STATUS_COLOR = QBrush(QColor("#B22222"))   # Vermelho escuro
+_PROTECTED_NAME_COLOR = QBrush(QColor("#666666"))     # Cinza para o nome
+_PROTECTED_BACKGROUND = QBrush(QColor("#F8F8F8"))
+_NORMAL_STATUS_COLOR = QBrush(QColor("#006400"))      # Verde escuro
+_NORMAL_NAME_COLOR = QBrush(QColor("#333333"))
+_FOLDER_NAME_COLOR = QBrush(QColor("#2B5797"))        # Azul para diretórios
+
+class BranchTreeNode:
+    """
+    Nó da árvore de caminhos das branches: uma pasta ou uma branch (folha)
+    
+    Os filhos ficam em uma lista ordenada pela mesma chave usada na exibição, e o
+    modelo expõe à view apenas os primeiros "fetched" filhos de cada pasta, que
+    crescem à medida que a pasta é expandida ou rolada.
+    """
+    
+    __slots__ = ('name', 'parent', 'branch', 'is_protected', 'key', 'children', 'keys',
+                 'rows', 'row_keys', 'fetched', 'lookup')
+                 
+    def __init__(self, name, parent=None, branch=None, is_protected=False):
+        """
+        Inicializa o nó
+        
+        Args:
+            name (str): Nome exibido (a última parte do caminho)
+            parent (BranchTreeNode): Pasta que contém o nó (None para a raiz)
+            branch (BranchRecord): Branch representada (None para pastas)
+            is_protected (bool): Se a branch é protegida
+        """
+        self.name = name
+        self.parent = parent
+        self.branch = branch
+        self.is_protected = is_protected
+        self.key = None
+        
+        # Todos os filhos e suas chaves de ordenação
+        self.children = []
+        self.keys = []
+        
+        # Filhos visíveis com o filtro atual (as mesmas listas quando não há filtro)
+        self.rows = self.children
+        self.row_keys = self.keys
+        
+        # Quantidade de linhas já entregues à view
+        self.fetched = 0
+        
+        # {(nome, é_branch): nó}, para localizar um filho sem percorrer a lista
+        self.lookup = {}
+        
+    @property
+    def is_leaf(self):
+        """bool: True se o nó representa uma branch"""
+        return self.branch is not None
+        
+    def path(self):
+        """
+        Retorna o caminho completo do nó
+        
+        Returns:
+            str: Nome da branch, para folhas, ou caminho da pasta (ex.: "feature/ui")
+        """
+        if self.branch is not None:
+            return self.branch.name
+        parts = []
+        node = self
+        while node is not None and node.parent is not None:
+            parts.append(node.name)
+            node = node.parent
+        return '/'.join(reversed(parts))
+
+
+class BranchTreeModel(QAbstractItemModel):
+    """
+    Modelo da árvore de branches com linhas criadas sob demanda
+    
+    A estrutura completa fica em nós Python leves (BranchTreeNode); a view só recebe
+    as linhas de uma pasta quando ela é expandida, em lotes de FETCH_BATCH conforme a
+    rolagem (canFetchMore/fetchMore). Assim, abrir um projeto com dezenas de milhares
+    de branches não cria um item de interface por branch.
+    
+    Na raiz, as pastas vêm antes das branches soltas; dentro das pastas, pastas e
+    branches são ordenadas juntas pelo nome.
+    """
+    
+    # Quantidade de linhas entregues à view por vez
+    FETCH_BATCH = 200
+    
+    COLUMNS = ("Nome da Branch", "Status")
+    
+    def __init__(self, parent=None):
+        """
+        Inicializa o modelo vazio
+        
+        Args:
+            parent: Objeto pai
+        """
+        super().__init__(parent)
+        self._root = BranchTreeNode('')
+        self._deletable_count = 0
+        self._selection_model = None
+        
+        # Filtro por nome: índice de trigramas dos nomes (criado na primeira busca) e
+        # nós cujas linhas visíveis foram restringidas pelo filtro atual
+        self._filter_text = ''
+        self._name_index = None
+        self._filtered_nodes = []
+        self._folder_font = None
+        self.branch_icon = None
+        self.branch_selected_icon = None
+        self.lock_icon = None
+        
+    def set_icons(self, branch_icon, branch_selected_icon, lock_icon):
+        """
+        Define os ícones das branches
+        
+        Args:
+            branch_icon (QIcon): Ícone de branch não selecionada
+            branch_selected_icon (QIcon): Ícone de branch selecionada
+            lock_icon (QIcon): Ícone de branch protegida
+        """
+        self.branch_icon = branch_icon
+        self.branch_selected_icon = branch_selected_icon
+        self.lock_icon = lock_icon
+        
+    def set_selection_model(self, selection_model):
+        """
+        Define o modelo de seleção da view, usado para escolher o ícone de cada branch
+        
+        Args:
+            selection_model (QItemSelectionModel): Modelo de seleção da view
+        """
+        self._selection_model = selection_model
+        
+    @property
+    def deletable_count(self):
+        """int: Quantidade de branches não protegidas na árvore"""
+        return self._deletable_count
+        
+    # ------------------------------------------------------------------
+    # Construção da árvore
+    # ------------------------------------------------------------------
+    
+    def clear(self):
+        """Remove todas as branches do modelo"""
+        self.beginResetModel()
+        self._reset_nodes()
+        self.endResetModel()
+        
+    def _reset_nodes(self):
+        """Descarta a árvore atual e o índice de nomes"""
+        self._root = BranchTreeNode('')
+        self._deletable_count = 0
+        self._name_index = None
+        self._filtered_nodes = []
+        
+    def set_tree(self, branch_tree, is_protected_func):
+        """
+        Substitui o conteúdo do modelo
+        
+        Args:
+            branch_tree (dict): Estrutura criada por BranchController.organize_branches_in_tree
+            is_protected_func (callable): Recebe (nome, BranchRecord) e indica se a branch é protegida
+        """
+        self.beginResetModel()
+        self._reset_nodes()
+        self._build(self._root, branch_tree, is_protected_func)
+        if self._filter_text:
+            self._apply_filter()
+        self._root.fetched = min(self.FETCH_BATCH, len(self._root.rows))
+        self.endResetModel()
+        
+    def merge_tree(self, branch_tree, is_protected_func):
+        """
+        Acrescenta branches ao modelo, notificando a view apenas das linhas já exibidas
+        
+        Usado no carregamento progressivo: cada página é mesclada às pastas existentes.
+        
+        Args:
+            branch_tree (dict): Estrutura das novas branches
+            is_protected_func (callable): Recebe (nome, BranchRecord) e indica se a branch é protegida
+        """
+        if self._filter_text:
+            # Com um filtro ativo, as linhas visíveis são recalculadas a partir do índice
+            self.beginResetModel()
+            self._restore_rows()
+            self._build(self._root, branch_tree, is_protected_func)
+            self._apply_filter()
+            self._root.fetched = min(self.FETCH_BATCH, len(self._root.rows))
+            self.endResetModel()
+            return
+        self._merge(self._root, branch_tree, is_protected_func)
+        
+    def _entries(self, branch_dict):
+        """
+        Percorre as entradas de um nível da estrutura de branches
+        
+        Uma chave pode ser, ao mesmo tempo, uma branch e uma pasta (ex.: "release" e
+        "release/1.0"); nesse caso são geradas duas entradas.
+        
+        Returns:
+            generator: (nome, BranchRecord ou None, subestrutura ou None)
+        """
+        for key, value in branch_dict.items():
+            if key == "__branch":
+                continue
+            branch = value.get("__branch")
+            if branch is not None:
+                yield key, branch, None
+            if len(value) > (1 if branch is not None else 0):
+                yield key, None, value
+                
+    def _build(self, node, branch_dict, is_protected_func):
+        """
+        Preenche um nó sem notificar a view (usado dentro de um reset ou em nós ainda não exibidos)
+        """
+        for key, branch, subtree in self._entries(branch_dict):
+            if branch is not None:
+                if (key, True) not in node.lookup:
+                    self._attach(node, self._create_leaf(key, branch, is_protected_func))
+            else:
+                folder = node.lookup.get((key, False))
+                if folder is None:
+                    folder = self._attach(node, BranchTreeNode(key))
+                self._build(folder, subtree, is_protected_func)
+                
+    def _merge(self, node, branch_dict, is_protected_func):
+        """
+        Mescla uma estrutura a um nó, notificando a view das linhas inseridas
+        """
+        for key, branch, subtree in self._entries(branch_dict):
+            if branch is not None:
+                if (key, True) not in node.lookup:
+                    self._insert(node, self._create_leaf(key, branch, is_protected_func))
+                continue
+                
+            folder = node.lookup.get((key, False))
+            if folder is not None:
+                self._merge(folder, subtree, is_protected_func)
+            else:
+                # A pasta nova é montada por completo antes de aparecer na view
+                folder = BranchTreeNode(key)
+                self._build(folder, subtree, is_protected_func)
+                self._insert(node, folder)
+                
+    def _create_leaf(self, name, branch, is_protected_func):
+        """
+        Cria o nó de uma branch, registrando-a na contagem de branches removíveis
+        """
+        is_protected = bool(is_protected_func(branch.name, branch))
+        if not is_protected:
+            self._deletable_count += 1
+        return BranchTreeNode(name, branch=branch, is_protected=is_protected)
+        
+    def _attach(self, parent, child):
+        """
+        Adiciona um filho na posição ordenada, sem notificar a view
+        
+        Returns:
+            BranchTreeNode: O filho adicionado
+        """
+        child.parent = parent
+        # Na raiz, as pastas vêm antes das branches soltas
+        if parent is self._root:
+            child.key = (child.is_leaf, child.name)
+        else:
+            child.key = (child.name, child.is_leaf)
+        position = bisect_right(parent.keys, child.key)
+        parent.keys.insert(position, child.key)
+        parent.children.insert(position, child)
+        parent.lookup[(child.name, child.is_leaf)] = child
+        if self._name_index is not None:
+            self._name_index.add(child, child.name)
+        return child
+        
+    def _insert(self, parent, child):
+        """
+        Adiciona um filho na posição ordenada, notificando a view se a linha já estiver exibida
+        
+        Linhas além das já entregues ficam disponíveis para o próximo fetchMore, de modo
+        que pastas grandes continuam sendo carregadas sob demanda.
+        """
+        fully_fetched = parent.fetched == len(parent.rows)
+        key = (child.is_leaf, child.name) if parent is self._root else (child.name, child.is_leaf)
+        position = bisect_right(parent.keys, key)
+        
+        if position < parent.fetched or (fully_fetched and parent.fetched < self.FETCH_BATCH):
+            self.beginInsertRows(self._index_of(parent), position, position)
+            self._attach(parent, child)
+            parent.fetched += 1
+            self.endInsertRows()
+        else:
+            self._attach(parent, child)
+            
+    # ------------------------------------------------------------------
+    # Remoção
+    # ------------------------------------------------------------------
+    
+    def remove_branches(self, branch_names):
+        """
+        Remove branches do modelo, notificando a view apenas das linhas já exibidas
+        
+        Pastas que ficam vazias são removidas em seguida; com um filtro ativo, pastas
+        que deixam de levar a algum resultado são ocultadas. As demais linhas, e o
+        estado de expansão da view, são preservados.
+        
+        Args:
+            branch_names (iterable): Nomes das branches removidas
+            
+        Returns:
+            int: Quantidade de branches encontradas e removidas
+        """
+        removed = 0
+        for name in branch_names:
+            node = self._find_leaf(name)
+            if node is None:
+                continue
+            if not node.is_protected:
+                self._deletable_count -= 1
+            self._remove_row(node)
+            removed += 1
+            
+            folder = node.parent
+            while folder is not self._root:
+                if not folder.children:
+                    self._remove_row(folder)
+                elif (self._filter_text and not folder.rows
+                        and self._filter_text not in folder.name.lower()):
+                    self._remove_row(folder, detach=False)
+                else:
+                    break
+                folder = folder.parent
+        return removed
+        
+    def _find_leaf(self, branch_name):
+        """
+        Localiza o nó de uma branch pelo nome
+        
+        Returns:
+            BranchTreeNode: Nó da branch (None se não estiver no modelo)
+        """
+        node = self._root
+        parts = branch_name.split('/')
+        for part in parts[:-1]:
+            node = node.lookup.get((part, False))
+            if node is None:
+                return None
+        return node.lookup.get((parts[-1], True))
+        
+    def _is_displayed(self, node):
+        """
+        Verifica se a view já recebeu a linha de um nó e de todas as pastas acima dele
+        
+        Returns:
+            bool: True se o nó tiver um índice válido na view
+        """
+        while node.parent is not None:
+            parent = node.parent
+            row = bisect_left(parent.row_keys, node.key)
+            if row >= parent.fetched or parent.rows[row] is not node:
+                return False
+            node = parent
+        return True
+        
+    def _remove_row(self, node, detach=True):
+        """
+        Retira um nó das linhas visíveis da pasta e, com detach, da árvore
+        
+        Args:
+            node (BranchTreeNode): Nó removido
+            detach (bool): Se False, o nó apenas deixa de ser exibido pelo filtro atual
+        """
+        parent = node.parent
+        row = bisect_left(parent.row_keys, node.key)
+        visible = row < len(parent.rows) and parent.rows[row] is node
+        notify = visible and row < parent.fetched and self._is_displayed(parent)
+        
+        if notify:
+            self.beginRemoveRows(self._index_of(parent), row, row)
+        if detach and parent.rows is not parent.children:
+            position = bisect_left(parent.keys, node.key)
+            del parent.keys[position]
+            del parent.children[position]
+        if visible:
+            del parent.row_keys[row]
+            del parent.rows[row]
+            if row < parent.fetched:
+                parent.fetched -= 1
+        if detach:
+            del parent.lookup[(node.name, node.is_leaf)]
+            if self._name_index is not None:
+                self._name_index.discard(node)
+        if notify:
+            self.endRemoveRows()
+            
+    # ------------------------------------------------------------------
+    # Filtro
+    # ------------------------------------------------------------------
+    
+    def set_filter_text(self, text):
+        """
+        Exibe apenas os itens cujo nome contém o texto, e as pastas que os contêm
+        
+        As correspondências vêm do índice de trigramas e só as pastas que levam até
+        elas são recalculadas, de modo que o custo acompanha o número de resultados,
+        e não o tamanho da árvore.
+        
+        Args:
+            text (str): Texto do filtro (vazio remove o filtro)
+        """
+        text = text.lower()
+        if text == self._filter_text:
+            return
+            
+        self.beginResetModel()
+        self._restore_rows()
+        self._filter_text = text
+        if text:
+            self._apply_filter()
+        self._root.fetched = min(self.FETCH_BATCH, len(self._root.rows))
+        self.endResetModel()
+        
+    def _ensure_name_index(self):
+        """
+        Cria o índice de nomes na primeira busca; depois ele é mantido a cada inserção
+        
+        Returns:
+            NGramIndex: Índice dos nomes de todos os nós
+        """
+        if self._name_index is None:
+            self._name_index = NGramIndex()
+            pending = [self._root]
+            while pending:
+                node = pending.pop()
+                for child in node.children:
+                    self._name_index.add(child, child.name)
+                    if not child.is_leaf:
+                        pending.append(child)
+        return self._name_index
+        
+    def _apply_filter(self):
+        """
+        Restringe as linhas visíveis aos nós que correspondem ao filtro e às suas pastas
+        
+        Uma pasta que corresponde ao filtro aparece mesmo sem descendentes visíveis,
+        mas exibe apenas os filhos que também correspondem.
+        """
+        visible_children = {self._root: []}
+        for node in self._ensure_name_index().search(self._filter_text):
+            if not node.is_leaf:
+                visible_children.setdefault(node, [])
+                
+            # Subir até a raiz, parando na primeira pasta que já leva a um resultado
+            child, parent = node, node.parent
+            while parent is not None:
+                siblings = visible_children.get(parent)
+                if siblings is None:
+                    visible_children[parent] = [child]
+                else:
+                    siblings.append(child)
+                    break
+                child, parent = parent, parent.parent
+                
+        for node, children in visible_children.items():
+            children.sort(key=lambda child: child.key)
+            node.rows = children
+            node.row_keys = [child.key for child in children]
+            node.fetched = 0
+        self._filtered_nodes = list(visible_children)
+        
+    def _restore_rows(self):
+        """Volta a exibir todos os filhos das pastas restringidas pelo filtro"""
+        for node in self._filtered_nodes:
+            node.rows, node.row_keys = node.children, node.keys
+            node.fetched = 0
+        self._filtered_nodes = []
+        
+    # ------------------------------------------------------------------
+    # Consultas usadas pela view
+    # ------------------------------------------------------------------
+    
+    def node_from_index(self, index):
+        """
+        Retorna o nó de um índice
+        
+        Returns:
+            BranchTreeNode: Nó do índice (a raiz para um índice inválido)
+        """
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+        
+    def _index_of(self, node, column=0):
+        """
+        Retorna o índice de um nó já exibido
+        
+        Returns:
+            QModelIndex: Índice do nó (inválido para a raiz)
+        """
+        if node is self._root or node.parent is None:
+            return QModelIndex()
+        parent = node.parent
+        row = bisect_right(parent.row_keys, node.key) - 1
+        return self.createIndex(row, column, node)
+        
+    def fetch_all(self, parent=QModelIndex()):
+        """
+        Entrega à view todas as linhas de todas as pastas
+        
+        Usado antes de operações que precisam de todas as branches na view, como
+        selecionar ou expandir todas.
+        
+        Args:
+            parent (QModelIndex): Pasta cujas linhas são entregues (opcional, usa a raiz)
+        """
+        pending = [self.node_from_index(parent)]
+        while pending:
+            node = pending.pop()
+            if node.fetched < len(node.rows):
+                self.fetchMore(self._index_of(node), len(node.rows) - node.fetched)
+            pending.extend(child for child in node.rows if not child.is_leaf)
+            
+    def folder_indexes(self):
+        """
+        Percorre as pastas já exibidas
+        
+        Returns:
+            generator: (caminho da pasta, QModelIndex)
+        """
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            for row in range(node.fetched):
+                child = node.rows[row]
+                if not child.is_leaf:
+                    yield child.path(), self.createIndex(row, 0, child)
+                    pending.append(child)
+                    
+    def index_for_path(self, path, is_leaf=False):
+        """
+        Retorna o índice de um item pelo caminho, entregando à view as linhas necessárias
+        
+        Args:
+            path (str): Caminho da pasta ou nome da branch
+            is_leaf (bool): Se o caminho é de uma branch
+            
+        Returns:
+            QModelIndex: Índice do item (inválido se não estiver visível)
+        """
+        node = self._root
+        parts = path.split('/')
+        for position, part in enumerate(parts):
+            last = position == len(parts) - 1
+            child = node.lookup.get((part, is_leaf and last))
+            if child is None:
+                return QModelIndex()
+            row = bisect_right(node.row_keys, child.key) - 1
+            if row < 0 or node.rows[row] is not child:
+                return QModelIndex()
+            if row >= node.fetched:
+                self.fetchMore(self._index_of(node), row + 1 - node.fetched)
+            node = child
+        return self._index_of(node)
+        
+    def selectable_ranges(self, parent=QModelIndex()):
+        """
+        Agrupa as branches não protegidas exibidas em faixas de linhas consecutivas
+        
+        Args:
+            parent (QModelIndex): Pasta cujas branches são agrupadas (opcional, usa a raiz)
+            
+        Returns:
+            generator: (primeiro_índice, último_índice) de cada faixa
+        """
+        pending = [self.node_from_index(parent)]
+        while pending:
+            node = pending.pop()
+            first = None
+            for row in range(node.fetched):
+                child = node.rows[row]
+                if child.is_leaf and not child.is_protected:
+                    if first is None:
+                        first = row
+                    continue
+                if first is not None:
+                    yield self.createIndex(first, 0, node.rows[first]), self.createIndex(row - 1, 1, node.rows[row - 1])
+                    first = None
+                if not child.is_leaf:
+                    pending.append(child)
+            if first is not None:
+                last = node.fetched - 1
+                yield self.createIndex(first, 0, node.rows[first]), self.createIndex(last, 1, node.rows[last])
+                
+    # ------------------------------------------------------------------
+    # Interface do QAbstractItemModel
+    # ------------------------------------------------------------------
+    
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        if row < 0 or row >= node.fetched or column < 0 or column >= len(self.COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column, node.rows[row])
+        
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+        
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self.node_from_index(parent).fetched
+        
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+        
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        node = self.node_from_index(parent)
+        return not node.is_leaf and bool(node.rows)
+        
+    def canFetchMore(self, parent):
+        if parent.column() > 0:
+            return False
+        node = self.node_from_index(parent)
+        return node.fetched < len(node.rows)
+        
+    def fetchMore(self, parent, count=None):
+        node = self.node_from_index(parent)
+        remaining = len(node.rows) - node.fetched
+        count = min(remaining, count or self.FETCH_BATCH)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, node.fetched, node.fetched + count - 1)
+        node.fetched += count
+        self.endInsertRows()
+        
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+        
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        node = index.internalPointer()
+        if node.is_leaf and node.is_protected:
+            # Branches protegidas não podem ser selecionadas
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return node.name
+            if node.is_leaf:
+                return "Protegida" if node.is_protected else "Normal"
+            return None
+            
+        if role == Qt.ItemDataRole.UserRole:
+            if node.is_leaf:
+                return {'name': node.branch.name, 'is_leaf': True, 'is_protected': node.is_protected}
+            return {'name': node.name, 'is_leaf': False}
+            
+        if not node.is_leaf:
+            if column == 0 and role == Qt.ItemDataRole.ForegroundRole:
+                return _FOLDER_NAME_COLOR
+            if column == 0 and role == Qt.ItemDataRole.FontRole:
+                if self._folder_font is None:
+                    self._folder_font = QFont()
+                    self._folder_font.setBold(True)
+                return self._folder_font
+            return None
+            
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if node.is_protected:
+                return _PROTECTED_NAME_COLOR if column == 0 else _PROTECTED_STATUS_COLOR
+            return _NORMAL_NAME_COLOR if column == 0 else _NORMAL_STATUS_COLOR
+            
+        if role == Qt.ItemDataRole.BackgroundRole and node.is_protected:
+            return _PROTECTED_BACKGROUND
+            
+        if role == Qt.ItemDataRole.DecorationRole and column == 0:
+            if node.is_protected:
+                return self.lock_icon
+            if self._selection_model is not None and self._selection_model.isSelected(index):
+                return self.branch_selected_icon or self.branch_icon
+            return self.branch_icon
+            
+        if role == Qt.ItemDataRole.ToolTipRole and not node.is_protected:
+            return "Clique para selecionar esta branch" if column == 0 else "Branch disponível para remoção"
+            
+        return None
\ No newline at end of file
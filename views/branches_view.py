@@ -3,10 +3,11 @@ View para a tela de gerenciamento de branches
 """
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QPushButton, QCheckBox, QProgressBar, QLineEdit,
-                           QFrame, QTreeWidget, QTreeWidgetItem, QMenu,
+                           QFrame, QTreeView, QMenu,
                            QHeaderView, QAbstractItemView)
-from PyQt6.QtCore import pyqtSignal, Qt
-from PyQt6.QtGui import QColor, QIcon, QFont, QBrush, QAction
+from PyQt6.QtCore import pyqtSignal, Qt, QItemSelection, QItemSelectionModel, QTimer
+from PyQt6.QtGui import QIcon, QFont, QAction
+from views.branch_tree_model import BranchTreeModel
 import sys
 import os
 
@@ -22,6 +23,9 @@ class BranchesView(QWidget):
     back_to_projects_requested = pyqtSignal()  # Novo sinal para voltar
     disable_protected_branches_buttons_requested = pyqtSignal()  # Novo sinal para desabilitar botões em protected_branches_view
     
+    # Intervalo sem digitação (em ms) antes de aplicar o filtro
+    FILTER_DEBOUNCE_MS = 200
+    
     def __init__(self, parent=None):
         """
         Inicializa a view de branches
@@ -33,6 +37,14 @@ class BranchesView(QWidget):
         self.branch_icon = None
         self.branch_selected_icon = None
         self.lock_icon = None
+        self._expanded_before_filter = None
+        
+        # O filtro só é aplicado quando a digitação pausa
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._apply_filter_text)
+        
         self.init_ui()
         
     def get_resource_path(self, relative_path):
@@ -278,8 +290,12 @@ class BranchesView(QWidget):
         tree_layout = QVBoxLayout(tree_frame)
         tree_layout.setContentsMargins(5, 5, 5, 5)
         
-        self.branches_tree = QTreeWidget()
-        self.branches_tree.setHeaderLabels(["Nome da Branch", "Status"])
+        # Árvore baseada em um modelo que cria as linhas sob demanda
+        self.branch_model = BranchTreeModel(self)
+        self.branch_model.set_icons(self.branch_icon, self.branch_selected_icon, self.lock_icon)
+        self.branches_tree = QTreeView()
+        self.branches_tree.setModel(self.branch_model)
+        self.branch_model.set_selection_model(self.branches_tree.selectionModel())
         self.branches_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.branches_tree.setAlternatingRowColors(True)
         self.branches_tree.setAnimated(True)
@@ -395,7 +411,7 @@ class BranchesView(QWidget):
         self.delete_button.clicked.connect(self._on_delete_clicked)
         
         # Conectar evento de seleção para atualizar ícones
-        self.branches_tree.itemSelectionChanged.connect(self._update_selection_icons)
+        self.branches_tree.selectionModel().selectionChanged.connect(self._update_selection_icons)
         
         self.setLayout(layout)
     
@@ -529,84 +545,100 @@ class BranchesView(QWidget):
         return QIcon(pixmap)
     
     def _show_context_menu(self, position):
-        """Mostra o menu de contexto ao clicar com o botão direito em uma branch"""
-        item = self.branches_tree.itemAt(position)
-        if not item:
+        """Mostra o menu de contexto ao clicar com o botão direito em uma branch ou pasta"""
+        index = self.branches_tree.indexAt(position)
+        if not index.isValid():
             return
             
-        # Verificar se é uma branch e não um diretório
-        branch_data = item.data(0, Qt.ItemDataRole.UserRole)
-        if not branch_data or not branch_data.get('is_leaf', False):
+        index = index.siblingAtColumn(0)
+        branch_data = index.data(Qt.ItemDataRole.UserRole)
+        if not branch_data:
             return
+        is_leaf = branch_data.get('is_leaf', False)
             
         # Criar menu
         menu = QMenu(self)
         
         # Ação para selecionar
         select_action = QAction("Selecionar", self)
-        select_action.triggered.connect(lambda: self._select_item(item, True))
+        select_action.triggered.connect(lambda: self._select_item(index, True))
         menu.addAction(select_action)
         
         # Ação para desmarcar
         deselect_action = QAction("Desmarcar", self)
-        deselect_action.triggered.connect(lambda: self._select_item(item, False))
+        deselect_action.triggered.connect(lambda: self._select_item(index, False))
         menu.addAction(deselect_action)
         
         # Separador
         menu.addSeparator()
         
-        # Ação para deletar (se não for protegida)
-        if not branch_data.get('is_protected', False):
+        # Ação para deletar (se for uma branch não protegida)
+        if is_leaf and not branch_data.get('is_protected', False):
             delete_action = QAction("Remover", self)
             delete_action.triggered.connect(lambda: self._delete_single_branch(branch_data.get('name', '')))
             menu.addAction(delete_action)
         
-        # Expandir/Colapsar
-        menu.addSeparator()
-        if item.childCount() > 0:
-            if item.isExpanded():
+        # Expandir/Colapsar a pasta
+        if not is_leaf and self.branch_model.hasChildren(index):
+            if self.branches_tree.isExpanded(index):
                 collapse_action = QAction("Colapsar", self)
-                collapse_action.triggered.connect(item.setExpanded)
+                collapse_action.triggered.connect(lambda: self.branches_tree.collapse(index))
                 menu.addAction(collapse_action)
             else:
                 expand_action = QAction("Expandir", self)
-                expand_action.triggered.connect(lambda: item.setExpanded(True))
+                expand_action.triggered.connect(lambda: self.branches_tree.expand(index))
                 menu.addAction(expand_action)
                 
             expand_all_action = QAction("Expandir Tudo", self)
-            expand_all_action.triggered.connect(lambda: self._expand_recursive(item, True))
+            expand_all_action.triggered.connect(lambda: self._expand_recursive(index, True))
             menu.addAction(expand_all_action)
             
             collapse_all_action = QAction("Colapsar Tudo", self)
-            collapse_all_action.triggered.connect(lambda: self._expand_recursive(item, False))
+            collapse_all_action.triggered.connect(lambda: self._expand_recursive(index, False))
             menu.addAction(collapse_all_action)
             
         # Mostrar menu
         menu.exec(self.branches_tree.viewport().mapToGlobal(position))
     
-    def _select_item(self, item, selected):
-        """Seleciona ou desmarca um item da árvore"""
-        if item is None:
+    def _select_item(self, index, selected):
+        """Seleciona ou desmarca a linha de uma branch, ou todas as branches de uma pasta"""
+        if not index.isValid():
             return
             
-        # Obter dados da branch
-        branch_data = item.data(0, Qt.ItemDataRole.UserRole)
-        if branch_data and branch_data.get('is_leaf', False):
-            item.setSelected(selected)
-        
-        # Aplicar recursivamente a todos os filhos
-        for i in range(item.childCount()):
-            self._select_item(item.child(i), selected)
-    
-    def _expand_recursive(self, item, expand):
-        """Expande ou colapsa um item e todos os seus filhos recursivamente"""
-        if item is None:
-            return
+        command = QItemSelectionModel.SelectionFlag.Select if selected else QItemSelectionModel.SelectionFlag.Deselect
+        branch_data = index.data(Qt.ItemDataRole.UserRole) or {}
+        if branch_data.get('is_leaf', False):
+            self.branches_tree.selectionModel().select(index, command | QItemSelectionModel.SelectionFlag.Rows)
+        else:
+            # Todas as linhas da pasta precisam estar na view para serem selecionadas
+            self.branch_model.fetch_all(index)
+            selection = QItemSelection()
+            for top_left, bottom_right in self.branch_model.selectable_ranges(index):
+                selection.select(top_left, bottom_right)
+            self.branches_tree.selectionModel().select(selection, command)
             
-        item.setExpanded(expand)
+        # Atualizar os ícones de seleção
+        self._update_selection_icons()
         
-        for i in range(item.childCount()):
-            self._expand_recursive(item.child(i), expand)
+    def _expand_recursive(self, index, expand):
+        """Expande ou colapsa uma pasta e todas as suas subpastas"""
+        if not index.isValid():
+            return
+            
+        if expand:
+            self.branch_model.fetch_all(index)
+            self.branches_tree.expandRecursively(index)
+            return
+            
+        # Colapsar as subpastas já exibidas, além da própria pasta
+        pending = [index]
+        while pending:
+            folder = pending.pop()
+            self.branches_tree.collapse(folder)
+            for row in range(self.branch_model.rowCount(folder)):
+                child = self.branch_model.index(row, 0, folder)
+                if self.branch_model.hasChildren(child):
+                    pending.append(child)
     
     def _delete_single_branch(self, branch_name):
         """Remove uma única branch"""
@@ -652,29 +684,24 @@ class BranchesView(QWidget):
         """)
     
     def _on_filter_changed(self, text):
-        """Callback para quando o texto do filtro muda"""
-        self._filter_tree_items(self.branches_tree.invisibleRootItem(), text.lower())
-    
-    def _filter_tree_items(self, parent_item, filter_text):
-        """Filtra os itens da árvore recursivamente"""
-        any_visible = False
-        
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            item_text = child.text(0).lower()
+        """Callback para quando o texto do filtro muda: reinicia a espera pela pausa na digitação"""
+        self._filter_timer.start()
+        
+    def _apply_filter_text(self):
+        """Aplica o texto atual do filtro à árvore, preservando as pastas expandidas"""
+        self._filter_timer.stop()
+        text = self.filter_input.text()
+        expanded = self._expanded_folders()
+        
+        # Guardar as pastas expandidas antes do filtro, para restaurá-las ao limpá-lo
+        if text and self._expanded_before_filter is None:
+            self._expanded_before_filter = expanded
+        elif not text and self._expanded_before_filter is not None:
+            expanded |= self._expanded_before_filter
+            self._expanded_before_filter = None
             
-            # Verificar filhos primeiro (para diretórios)
-            child_visible = self._filter_tree_items(child, filter_text)
-            
-            # Verificar o item atual
-            is_visible = filter_text == "" or filter_text in item_text
-            
-            # Um item é visível se ele próprio ou algum de seus filhos corresponder ao filtro
-            child.setHidden(not (is_visible or child_visible))
-            
-            any_visible = any_visible or is_visible or child_visible
-        
-        return any_visible
+        self.branch_model.set_filter_text(text)
+        self._restore_expanded_folders(expanded)
             
     def _on_select_all_clicked(self):
         """Callback para quando o botão de selecionar todas é clicado"""
@@ -682,7 +709,7 @@ class BranchesView(QWidget):
             return
             
         # Primeiro expandir todos os itens
-        self.branches_tree.expandAll()
+        self._expand_all()
             
         # Depois selecionar todas as branches
         self.select_all_requested.emit()
@@ -736,7 +763,7 @@ class BranchesView(QWidget):
             self._update_buttons_state()
             
             # Garantir que o botão de desmarcar esteja ativo se houver qualquer item na árvore
-            if self.branches_tree.topLevelItemCount() > 0:
+            if self.branch_model.hasChildren():
                 self.deselect_all_button.setEnabled(True)
                 self.deselect_all_button.setStyleSheet("""
                     QPushButton {
@@ -765,8 +792,9 @@ class BranchesView(QWidget):
             
     def clear_branches(self):
         """Limpa a árvore de branches"""
-        self.branches_tree.clear()
+        self.branch_model.clear()
         self.filter_input.clear()
+        self._apply_filter_text()
         
         # Desabilitar botões quando a lista é limpa
         self.select_all_button.setEnabled(False)
@@ -778,90 +806,95 @@ class BranchesView(QWidget):
         self._disable_button_style(self.deselect_all_button)
         self._disable_delete_button_style(self.delete_button)
     
-    def _create_branch_item(self, parent, name, branch=None, is_protected=False):
+    def setup_tree_view(self, branch_tree, is_protected_func):
+        """
+        Configura a visualização em árvore com a estrutura de branches
+        
+        As pastas que estavam expandidas continuam expandidas após a atualização.
+        
+        Args:
+            branch_tree: Estrutura de árvore das branches
+            is_protected_func: Função que recebe (nome, BranchRecord) e indica se a branch é protegida
+        """
+        expanded = self._expanded_folders()
+        self.clear_branches()
+        self.branch_model.set_tree(branch_tree, is_protected_func)
+        self._restore_expanded_folders(expanded)
+        
+        self.finish_tree_update()
+        
+    def append_tree_branches(self, branch_tree, is_protected_func):
         """
-        Cria um item de branch ou diretório na árvore
+        Acrescenta branches à árvore já exibida, sem reconstruí-la
+        
+        Usado no carregamento progressivo: cada página de branches é mesclada às
+        pastas existentes, e só as linhas já exibidas são notificadas à view.
         
         Args:
-            parent: Item pai
-            name: Nome do item
-            branch: Objeto de branch (se for uma branch)
-            is_protected: Se a branch é protegida
+            branch_tree: Estrutura de árvore das novas branches
+            is_protected_func: Função que recebe (nome, BranchRecord) e indica se a branch é protegida
+        """
+        self.branch_model.merge_tree(branch_tree, is_protected_func)
         
-        Returns:
-            QTreeWidgetItem: Novo item criado
+    def remove_branches(self, branch_names):
         """
-        item = QTreeWidgetItem(parent)
-        item.setText(0, name)
-        
-        # Se for uma branch (folha), adicionar dados e estilo
-        if branch:
-            # Armazenar informações úteis no item
-            item.setData(0, Qt.ItemDataRole.UserRole, {
-                'name': branch.name,
-                'is_leaf': True,
-                'is_protected': is_protected
-            })
-            
-            # Definir texto e estilo da segunda coluna
-            if is_protected:
-                item.setText(1, "Protegida")
-                item.setForeground(1, QBrush(QColor("#B22222")))  # Vermelho escuro
-                item.setForeground(0, QBrush(QColor("#666666")))  # Cinza para o nome
-                
-                # Ícone de cadeado para branches protegidas
-                if self.lock_icon:
-                    item.setIcon(0, self.lock_icon)
-                
-                # Desabilitar seleção para branches protegidas
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-                
-                # Adicionar estilo para mostrar que não é selecionável
-                item.setBackground(0, QBrush(QColor("#F8F8F8")))
-                item.setBackground(1, QBrush(QColor("#F8F8F8")))
-            else:
-                item.setText(1, "Normal")
-                item.setForeground(1, QBrush(QColor("#006400")))  # Verde escuro
-                item.setForeground(0, QBrush(QColor("#333333")))  # Cor normal para o nome
-                
-                # Ícone folha para branches normais
-                if self.branch_icon:
-                    item.setIcon(0, self.branch_icon)
-                
-                # Tornar visualmente mais claro que é selecionável
-                item.setToolTip(0, "Clique para selecionar esta branch")
-                item.setToolTip(1, "Branch disponível para remoção")
-        else:
-            # É um diretório
-            item.setData(0, Qt.ItemDataRole.UserRole, {
-                'is_leaf': False,
-                'name': name
-            })
-            # Estilizar nomes de diretórios
-            font = item.font(0)
-            font.setBold(True)
-            item.setFont(0, font)
-            item.setForeground(0, QBrush(QColor("#2B5797")))  # Azul para diretórios
-        
-        return item
+        Remove branches da árvore já exibida, sem reconstruí-la
+        
+        Pastas que ficam vazias desaparecem; as demais linhas mantêm a expansão e a seleção.
+        
+        Args:
+            branch_names (list): Nomes das branches removidas
+        """
+        if self.branch_model.remove_branches(branch_names):
+            self._update_buttons_state()
             
-    def setup_tree_view(self, branch_tree, is_protected_func):
+    def update_tree_branches(self, removed_names, branch_tree, is_protected_func):
         """
-        Configura a visualização em árvore com a estrutura de branches
+        Aplica à árvore já exibida as branches removidas e as novas (ou alteradas)
+        
+        As pastas que estavam expandidas continuam expandidas após a atualização.
         
         Args:
-            branch_tree: Estrutura de árvore das branches
-            is_protected_func: Função para verificar se uma branch é protegida
+            removed_names (list): Nomes das branches que saem da árvore
+            branch_tree: Estrutura de árvore das branches que entram
+            is_protected_func: Função que recebe (nome, BranchRecord) e indica se a branch é protegida
         """
-        self.clear_branches()
+        expanded = self._expanded_folders()
+        self.branch_model.remove_branches(removed_names)
+        self.branch_model.merge_tree(branch_tree, is_protected_func)
+        self._restore_expanded_folders(expanded)
         
-        # Use o método do controller para popular a árvore, se existir
-        if hasattr(is_protected_func, '_populate_tree'):
-            is_protected_func._populate_tree(self.branches_tree.invisibleRootItem(), branch_tree, is_protected_func)
-        else:
-            # Caso contrário, use o método interno
-            self._populate_tree(self.branches_tree.invisibleRootItem(), branch_tree, is_protected_func)
+        self.finish_tree_update()
+        
+    def _expanded_folders(self):
+        """
+        Retorna os caminhos das pastas expandidas
+        
+        Returns:
+            set: Caminhos das pastas expandidas (apenas entre as linhas já exibidas)
+        """
+        return {
+            path for path, index in self.branch_model.folder_indexes()
+            if self.branches_tree.isExpanded(index)
+        }
         
+    def _restore_expanded_folders(self, paths):
+        """
+        Expande novamente as pastas informadas, se ainda existirem
+        
+        Args:
+            paths (set): Caminhos das pastas
+        """
+        # Pais antes dos filhos, para que cada pasta já esteja exibida ao ser expandida
+        for path in sorted(paths, key=lambda path: path.count('/')):
+            index = self.branch_model.index_for_path(path)
+            if index.isValid():
+                self.branches_tree.expand(index)
+                
+    def finish_tree_update(self):
+        """
+        Aplica estilos e atualiza o estado dos botões após alterações na árvore
+        """
         # Aplicar ícones de expandir/recolher via CSS
         self._set_tree_icons()
         
@@ -872,7 +905,7 @@ class BranchesView(QWidget):
         self._update_buttons_state()
         
         # Garantir que o botão de desmarcar todas esteja sempre ativado quando há items
-        if self.branches_tree.topLevelItemCount() > 0:
+        if self.branch_model.hasChildren():
             self.deselect_all_button.setEnabled(True)
             self.deselect_all_button.setStyleSheet("""
                 QPushButton {
@@ -886,64 +919,6 @@ class BranchesView(QWidget):
                     background-color: #2B5797;
                 }
             """)
-    
-    def _populate_tree(self, parent_item, branch_dict, is_protected_func, path=""):
-        """
-        Popula a árvore recursivamente
-        
-        Args:
-            parent_item: Item pai da árvore
-            branch_dict: Dicionário contendo a estrutura de branches
-            is_protected_func: Função para verificar se uma branch é protegida
-            path: Caminho acumulado
-        """
-        # Separar chaves em 2 grupos: diretórios/branches dentro de pastas e branches na raiz
-        folder_keys = []
-        root_branch_keys = []
-        
-        for key in branch_dict.keys():
-            # Pular a chave especial __branch
-            if key == "__branch":
-                continue
-                
-            value = branch_dict[key]
-            # Verificar se é uma folha (branch) ou um diretório
-            is_branch = "__branch" in value
-            
-            if is_branch and not path:  # Branch na raiz
-                root_branch_keys.append(key)
-            else:  # Diretório ou branch dentro de pasta
-                folder_keys.append(key)
-        
-        # Ordenar as chaves em cada grupo para manter a ordem alfabética
-        folder_keys.sort()
-        root_branch_keys.sort()
-        
-        # Primeiro processar pastas e branches dentro de pastas
-        for key in folder_keys:
-            value = branch_dict[key]
-            current_path = path + "/" + key if path else key
-            
-            # Verificar se é uma folha (branch) ou um diretório
-            is_branch = "__branch" in value
-            
-            if is_branch:
-                branch = value["__branch"]
-                is_protected = is_protected_func(branch.name)
-                branch_item = self._create_branch_item(parent_item, key, branch, is_protected)
-            else:
-                # É um diretório, criar item do diretório
-                dir_item = self._create_branch_item(parent_item, key)
-                
-                # Processar recursivamente os itens deste diretório
-                self._populate_tree(dir_item, value, is_protected_func, current_path)
-        
-        # Depois processar branches na raiz (sem pastas)
-        for key in root_branch_keys:
-            value = branch_dict[key]
-            branch = value["__branch"]
-            is_protected = is_protected_func(branch.name)
-            branch_item = self._create_branch_item(parent_item, key, branch, is_protected)
 
     def _set_tree_icons(self):
         """Define os ícones de expandir/recolher na árvore"""
@@ -960,15 +935,15 @@ class BranchesView(QWidget):
             self.closed_icon = QIcon(closed_icon_path)
             self.open_icon = QIcon(open_icon_path)
             
-            # Aplicar estilo corrigido ao QTreeWidget para os branches
+            # Aplicar estilo corrigido ao QTreeView para os branches
             self.branches_tree.setStyleSheet(f"""
-                QTreeWidget {{
+                QTreeView {{
                     background-color: white;
                     alternate-background-color: #F8F8F8;
                     border: none;
                     outline: none;
                 }}
-                QTreeWidget::item {{
+                QTreeView::item {{
                     padding: 6px;
                     min-height: 28px;
                     border-bottom: 1px solid #EEEEEE;
@@ -976,16 +951,16 @@ class BranchesView(QWidget):
                     margin: 2px 0;
                     border-radius: 3px;
                 }}
-                QTreeWidget::item:selected {{
+                QTreeView::item:selected {{
                     background-color: #D0E8FF;
                     color: #2B5797;
                     border: 1px solid #A9CCF3;
                     font-weight: bold;
                 }}
-                QTreeWidget::item:hover:!selected {{
+                QTreeView::item:hover:!selected {{
                     background-color: #F0F5FF;
                 }}
-                QTreeWidget::item:selected:hover {{
+                QTreeView::item:selected:hover {{
                     background-color: #BBD9FF;
                 }}
                 QHeaderView::section {{
@@ -995,31 +970,31 @@ class BranchesView(QWidget):
                     color: #333333;
                     font-weight: bold;
                 }}
-                QTreeWidget::branch {{
+                QTreeView::branch {{
                     background: transparent;
                 }}
-                QTreeWidget::branch:selected {{
+                QTreeView::branch:selected {{
                     background-color: #D0E8FF;
                 }}
                 /* Apenas um único ícone para expandir/recolher */
-                QTreeWidget::branch:has-children:!has-siblings:closed,
-                QTreeWidget::branch:closed:has-children:has-siblings {{
+                QTreeView::branch:has-children:!has-siblings:closed,
+                QTreeView::branch:closed:has-children:has-siblings {{
                     border-image: none;
                     image: url({closed_icon_path});
                 }}
-                QTreeWidget::branch:open:has-children:!has-siblings,
-                QTreeWidget::branch:open:has-children:has-siblings {{
+                QTreeView::branch:open:has-children:!has-siblings,
+                QTreeView::branch:open:has-children:has-siblings {{
                     border-image: none;
                     image: url({open_icon_path});
                 }}
                 /* Correção específica para garantir que não haja faixas pretas na seleção */
-                QTreeWidget::branch:adjoins-item:selected {{
+                QTreeView::branch:adjoins-item:selected {{
                     background-color: #D0E8FF;
                 }}
-                QTreeWidget::branch:has-siblings:adjoins-item:selected {{
+                QTreeView::branch:has-siblings:adjoins-item:selected {{
                     background-color: #D0E8FF;
                 }}
-                QTreeWidget::branch:has-siblings:!adjoins-item:selected {{
+                QTreeView::branch:has-siblings:!adjoins-item:selected {{
                     background-color: #D0E8FF;
                 }}
             """)
@@ -1028,30 +1003,8 @@ class BranchesView(QWidget):
     
     def _update_selection_icons(self):
         """Atualiza os ícones das branches baseado no estado de seleção"""
-        def update_item_icons(parent):
-            for i in range(parent.childCount()):
-                item = parent.child(i)
-                
-                # Verificar se é uma branch (folha)
-                data = item.data(0, Qt.ItemDataRole.UserRole)
-                if data and data.get('is_leaf', True) and not data.get('is_protected', False):
-                    # Se for uma branch não protegida, atualizar ícone baseado na seleção
-                    if item.isSelected() and self.branch_selected_icon:
-                        item.setIcon(0, self.branch_selected_icon)
-                        
-                        # Não precisamos definir background aqui, pois o QTreeWidget::branch:selected
-                        # e QTreeWidget::item:selected já são aplicados automaticamente
-                    elif not item.isSelected() and self.branch_icon:
-                        item.setIcon(0, self.branch_icon)
-                        # Limpar fundos personalizados se houver
-                        item.setBackground(0, QBrush())
-                        item.setBackground(1, QBrush())
-                
-                # Processar recursivamente os filhos
-                update_item_icons(item)
-        
-        # Iniciar o processamento a partir da raiz
-        update_item_icons(self.branches_tree.invisibleRootItem())
+        # O modelo escolhe o ícone de cada branch conforme a seleção; basta redesenhar
+        self.branches_tree.viewport().update()
 
     def get_selected_branches(self):
         """
@@ -1061,45 +1014,23 @@ class BranchesView(QWidget):
             list: Lista de nomes de branches selecionadas
         """
         selected_branches = []
-        
-        # Função recursiva para encontrar todos os itens selecionados
-        def collect_selected(parent):
-            for i in range(parent.childCount()):
-                item = parent.child(i)
-                
-                # Verificar os dados do item
-                data = item.data(0, Qt.ItemDataRole.UserRole)
-                if data and data.get('is_leaf', False) and item.isSelected():
-                    selected_branches.append(data.get('name', ''))
+        for index in self.branches_tree.selectionModel().selectedRows(0):
+            data = index.data(Qt.ItemDataRole.UserRole)
+            if data and data.get('is_leaf', False):
+                selected_branches.append(data.get('name', ''))
                 
-                # Verificar filhos recursivamente
-                collect_selected(item)
-        
-        # Iniciar a busca a partir da raiz invisível
-        collect_selected(self.branches_tree.invisibleRootItem())
-        
-        return selected_branches
+        return sorted(selected_branches)
         
     def select_all_branches(self):
         """Seleciona todas as branches não protegidas"""
-        # Desmarcar tudo primeiro
-        self.branches_tree.clearSelection()
-        
-        # Função recursiva para selecionar itens não protegidos
-        def select_if_not_protected(parent):
-            for i in range(parent.childCount()):
-                item = parent.child(i)
-                
-                # Verificar os dados do item
-                data = item.data(0, Qt.ItemDataRole.UserRole)
-                if data and data.get('is_leaf', False) and not data.get('is_protected', False):
-                    item.setSelected(True)
-                
-                # Aplicar recursivamente aos filhos
-                select_if_not_protected(item)
+        # Todas as linhas precisam estar na view para serem selecionadas
+        self.branch_model.fetch_all()
         
-        # Iniciar a seleção a partir da raiz invisível
-        select_if_not_protected(self.branches_tree.invisibleRootItem())
+        # Selecionar faixas de linhas consecutivas, em vez de uma linha por vez
+        selection = QItemSelection()
+        for top_left, bottom_right in self.branch_model.selectable_ranges():
+            selection.select(top_left, bottom_right)
+        self.branches_tree.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect)
         
         # Atualizar os ícones de seleção
         self._update_selection_icons()
@@ -1118,26 +1049,7 @@ class BranchesView(QWidget):
         Returns:
             int: Número de branches não protegidas
         """
-        deletable_count = 0
-        
-        # Função recursiva para contar branches não protegidas
-        def count_branches(parent):
-            nonlocal deletable_count
-            for i in range(parent.childCount()):
-                item = parent.child(i)
-                
-                # Verificar os dados do item
-                data = item.data(0, Qt.ItemDataRole.UserRole)
-                if data and data.get('is_leaf', False) and not data.get('is_protected', False):
-                    deletable_count += 1
-                
-                # Verificar filhos recursivamente
-                count_branches(item)
-        
-        # Iniciar a contagem a partir da raiz invisível
-        count_branches(self.branches_tree.invisibleRootItem())
-        
-        return deletable_count
+        return self.branch_model.deletable_count
     
     def _update_buttons_state(self):
         """
@@ -1217,6 +1129,7 @@ class BranchesView(QWidget):
         
     def _expand_all(self):
         """Expande todos os items da árvore"""
+        self.branch_model.fetch_all()
         self.branches_tree.expandAll()
         
     def _collapse_all(self):
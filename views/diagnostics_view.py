@@ -0,0 +1,194 @@
+"""
+View para o painel de diagnóstico de desempenho
+"""
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                           QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+class DiagnosticsView(QDialog):
+    """
+    Diálogo que exibe as métricas coletadas pelo registro de métricas
+    
+    Mostra, por operação e por endpoint HTTP, a quantidade de chamadas, as latências
+    estimadas (p50/p95), os bytes recebidos e os erros, com opções para atualizar,
+    limpar e exportar os dados.
+    """
+    
+    # Sinais
+    refresh_requested = pyqtSignal()
+    reset_requested = pyqtSignal()
+    export_requested = pyqtSignal(str)  # Formato: 'json' ou 'prometheus'
+    
+    OPERATION_COLUMNS = ("Operação", "Chamadas", "p50 (s)", "p95 (s)", "Total (s)", "Erros")
+    ENDPOINT_COLUMNS = ("Método", "Endpoint", "Requisições", "p50 (s)", "p95 (s)", "Bytes", "Status", "Erros")
+    
+    def __init__(self, parent=None):
+        """
+        Inicializa o diálogo
+        
+        Args:
+            parent: Widget pai
+        """
+        super().__init__(parent)
+        self.init_ui()
+        
+    def init_ui(self):
+        """Inicializa a interface do usuário"""
+        self.setWindowTitle("Diagnóstico de Desempenho")
+        self.setMinimumSize(900, 600)
+        
+        main_layout = QVBoxLayout(self)
+        
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("color: #333333; font-size: 13px;")
+        main_layout.addWidget(self.summary_label)
+        
+        operations_label = QLabel("<b>Operações</b>")
+        main_layout.addWidget(operations_label)
+        self.operations_table = self._create_table(self.OPERATION_COLUMNS)
+        main_layout.addWidget(self.operations_table)
+        
+        endpoints_label = QLabel("<b>Requisições HTTP por endpoint</b>")
+        main_layout.addWidget(endpoints_label)
+        self.endpoints_table = self._create_table(self.ENDPOINT_COLUMNS)
+        self.endpoints_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        main_layout.addWidget(self.endpoints_table, 1)
+        
+        buttons_layout = QHBoxLayout()
+        
+        self.refresh_button = QPushButton("Atualizar")
+        self.refresh_button.clicked.connect(self.refresh_requested.emit)
+        buttons_layout.addWidget(self.refresh_button)
+        
+        self.reset_button = QPushButton("Limpar")
+        self.reset_button.clicked.connect(self.reset_requested.emit)
+        buttons_layout.addWidget(self.reset_button)
+        
+        buttons_layout.addStretch()
+        
+        self.export_json_button = QPushButton("Exportar JSON")
+        self.export_json_button.clicked.connect(lambda: self.export_requested.emit('json'))
+        buttons_layout.addWidget(self.export_json_button)
+        
+        self.export_prometheus_button = QPushButton("Exportar Prometheus")
+        self.export_prometheus_button.clicked.connect(lambda: self.export_requested.emit('prometheus'))
+        buttons_layout.addWidget(self.export_prometheus_button)
+        
+        self.close_button = QPushButton("Fechar")
+        self.close_button.clicked.connect(self.close)
+        buttons_layout.addWidget(self.close_button)
+        
+        main_layout.addLayout(buttons_layout)
+        
+    def _create_table(self, columns):
+        """
+        Cria uma tabela somente leitura
+        
+        Args:
+            columns (tuple): Títulos das colunas
+            
+        Returns:
+            QTableWidget: Tabela configurada
+        """
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setAlternatingRowColors(True)
+        table.setSortingEnabled(True)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        return table
+        
+    def set_snapshot(self, snapshot):
+        """
+        Exibe as métricas de um snapshot do registro
+        
+        Args:
+            snapshot (dict): Resultado de MetricsRegistry.snapshot()
+        """
+        operations = snapshot['operations']
+        endpoints = snapshot['endpoints']
+        total_requests = sum(endpoint['count'] for endpoint in endpoints)
+        total_bytes = sum(endpoint['bytes'] for endpoint in endpoints)
+        self.summary_label.setText(
+            f"Coleta iniciada há {snapshot['uptime']:.0f} s — "
+            f"{total_requests} requisições HTTP, {self._format_bytes(total_bytes)} recebidos"
+        )
+        
+        self._fill_table(self.operations_table, [
+            (
+                operation,
+                metrics['count'],
+                metrics['p50'],
+                metrics['p95'],
+                round(metrics['sum'], 3),
+                self._format_counts(metrics['errors'])
+            )
+            for operation, metrics in operations.items()
+        ])
+        
+        self._fill_table(self.endpoints_table, [
+            (
+                endpoint['method'],
+                endpoint['endpoint'],
+                endpoint['count'],
+                endpoint['p50'],
+                endpoint['p95'],
+                endpoint['bytes'],
+                self._format_counts(endpoint['statuses']),
+                self._format_counts(endpoint['errors'])
+            )
+            for endpoint in endpoints
+        ])
+        
+    def _fill_table(self, table, rows):
+        """
+        Substitui as linhas de uma tabela
+        
+        Args:
+            table (QTableWidget): Tabela a preencher
+            rows (list): Valores de cada linha, na ordem das colunas
+        """
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                if isinstance(value, (int, float)):
+                    # Guardar o número para que a ordenação da coluna seja numérica
+                    item.setData(Qt.ItemDataRole.DisplayRole, value)
+                else:
+                    item.setText("—" if value is None else str(value))
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+        
+    @staticmethod
+    def _format_counts(counts):
+        """
+        Formata contagens por chave (status ou classe de erro)
+        
+        Args:
+            counts (dict): {chave: contagem}
+            
+        Returns:
+            str: Texto no formato "chave×contagem", separado por vírgulas
+        """
+        return ", ".join(f"{key}×{count}" for key, count in counts.items())
+        
+    @staticmethod
+    def _format_bytes(size):
+        """
+        Formata um tamanho em bytes
+        
+        Args:
+            size (int): Tamanho em bytes
+            
+        Returns:
+            str: Tamanho com a unidade mais adequada
+        """
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
\ No newline at end of file
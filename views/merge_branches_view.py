@@ -411,14 +411,7 @@ class MergeBranchesView(QWidget):
         for branch in sorted(branches):
             # Não adicionar a branch como destino se for a mesma que está selecionada como source
             if branch != current_source:
-                item = QListWidgetItem(branch)
-                
-                # Se for protegida, destacar visualmente
-                if branch in protected_branches:
-                    item.setForeground(QBrush(QColor("#999999")))
-                    item.setToolTip("Branch protegida")
-                
-                self.target_branches_list.addItem(item)
+                self.target_branches_list.addItem(self._create_target_item(branch))
             
         # Conectar eventos para atualizar o estado do botão e a lista de targets
         self.source_branch_combo.currentTextChanged.connect(self._update_button_state)
@@ -454,19 +447,113 @@ class MergeBranchesView(QWidget):
         if hasattr(self, 'original_branches') and hasattr(self, 'protected_branches'):
             for branch in sorted(self.original_branches):
                 if branch != source_branch:
-                    item = QListWidgetItem(branch)
-                    
-                    # Se for protegida, destacar visualmente
-                    if branch in self.protected_branches:
-                        item.setForeground(QBrush(QColor("#999999")))
-                        item.setToolTip("Branch protegida")
-                    
+                    item = self._create_target_item(branch)
                     self.target_branches_list.addItem(item)
                     
                     # Restaurar seleção se estava selecionado antes
                     if branch in current_selections:
                         item.setSelected(True)
-    
+                        
+    def _create_target_item(self, branch):
+        """
+        Cria o item de uma branch na lista de destinos
+        
+        Args:
+            branch (str): Nome da branch
+            
+        Returns:
+            QListWidgetItem: Item da lista (destacado se a branch for protegida)
+        """
+        item = QListWidgetItem(branch)
+        
+        # Se for protegida, destacar visualmente
+        if branch in self.protected_branches:
+            item.setForeground(QBrush(QColor("#999999")))
+            item.setToolTip("Branch protegida")
+        return item
+        
+    def apply_branch_delta(self, added_branches, removed_branches):
+        """
+        Aplica as branches que entraram ou saíram do projeto à lista guardada pelo controller e às listas da tela
+        
+        A lista guardada (usada por refresh_branches_display) e os widgets são
+        atualizados juntos, para que não fiquem divergentes.
+        
+        Args:
+            added_branches (list): Nomes das branches novas
+            removed_branches (list): Nomes das branches que deixaram de existir
+        """
+        if hasattr(self, '_controller_branches'):
+            removed = set(removed_branches)
+            self._controller_branches = [b for b in self._controller_branches if b not in removed] + list(added_branches)
+        self.apply_branch_changes(added_branches, removed_branches)
+        
+    def apply_branch_changes(self, added_branches, removed_branches):
+        """
+        Atualiza as listas de origem e destino sem recriá-las
+        
+        Apenas as branches que entraram ou saíram são inseridas ou removidas, na
+        posição ordenada; a origem e os destinos selecionados são preservados.
+        
+        Args:
+            added_branches (list): Nomes das branches novas
+            removed_branches (list): Nomes das branches que deixaram de existir
+        """
+        if not hasattr(self, 'original_branches') or not hasattr(self, 'protected_branches'):
+            return
+            
+        removed = set(removed_branches)
+        self.original_branches = [b for b in self.original_branches if b not in removed] + list(added_branches)
+        
+        # Combobox de origem (apenas branches desprotegidas)
+        for branch in removed_branches:
+            index = self.source_branch_combo.findText(branch)
+            if index >= 0:
+                self.source_branch_combo.removeItem(index)
+        for branch in added_branches:
+            if branch not in self.protected_branches and self.source_branch_combo.findText(branch) < 0:
+                position = self._sorted_position(self.source_branch_combo.count(), self.source_branch_combo.itemText, branch)
+                self.source_branch_combo.insertItem(position, branch)
+                
+        # Lista de destinos (todas as branches, exceto a origem atual)
+        targets = self.target_branches_list
+        
+        def target_text(row):
+            return targets.item(row).text()
+            
+        current_source = self.source_branch_combo.currentText()
+        for branch in removed_branches:
+            position = self._sorted_position(targets.count(), target_text, branch)
+            if position < targets.count() and target_text(position) == branch:
+                targets.takeItem(position)
+        for branch in added_branches:
+            position = self._sorted_position(targets.count(), target_text, branch)
+            if branch != current_source and (position == targets.count() or target_text(position) != branch):
+                targets.insertItem(position, self._create_target_item(branch))
+                
+        self._update_button_state()
+        
+    def _sorted_position(self, count, text_at, branch):
+        """
+        Localiza, por busca binária, a posição de uma branch em uma lista ordenada de widgets
+        
+        Args:
+            count (int): Quantidade de itens
+            text_at (callable): Recebe a posição e retorna o texto do item
+            branch (str): Nome procurado
+            
+        Returns:
+            int: Primeira posição cujo texto não é menor que o nome
+        """
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if text_at(middle) < branch:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+        
     def set_loading_state(self, is_loading, message=""):
         """
         Configura o estado de carregamento da tela
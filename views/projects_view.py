@@ -397,6 +397,38 @@ class ProjectsView(QWidget):
         # Atualizar a visualização
         self.filter_projects(self.search_input.text())
         
+    def add_projects(self, projects):
+        """
+        Adiciona vários projetos à lista de uma só vez, mantendo a página atual
+        
+        Args:
+            projects (list): Lista de tuplas (project_id, project_name, project_path)
+        """
+        for project_id, project_name, project_path in projects:
+            self.projects.append({
+                'id': project_id,
+                'name': project_name,
+                'path': project_path or project_name
+            })
+            
+        # Atualizar a visualização sem voltar para a primeira página
+        current_page = self.current_page
+        self.filter_projects(self.search_input.text())
+        if current_page:
+            self.current_page = current_page
+            self.update_pagination()
+            self.display_current_page()
+        
+    def replace_projects(self, projects):
+        """
+        Substitui toda a lista de projetos, mantendo a página atual quando possível
+        
+        Args:
+            projects (list): Lista de tuplas (project_id, project_name, project_path)
+        """
+        self.projects = []
+        self.add_projects(projects)
+        
     def filter_projects(self, search_text=""):
         """Filtra projetos com base no texto de busca"""
         search_text = search_text.lower()
@@ -530,20 +530,7 @@ class ProtectedBranchesView(QWidget):
         
         if other_branches:
             for branch_name in other_branches:
-                checkbox = QCheckBox(branch_name)
-                # Não marcar nenhuma branch como selecionada por padrão
-                checkbox.setChecked(False)
-                checkbox.setStyleSheet("""
-                    QCheckBox {
-                        color: #333333;
-                        font-size: 12px;
-                        padding: 4px;
-                    }
-                    QCheckBox:hover {
-                        background-color: #F0F5FF;
-                        border-radius: 3px;
-                    }
-                """)
+                checkbox = self._create_branch_checkbox(branch_name)
                 self.checkboxes[branch_name] = checkbox
                 self.branches_layout.addWidget(checkbox)
             self.branches_layout.addStretch()
@@ -565,6 +552,100 @@ class ProtectedBranchesView(QWidget):
             info_label.setStyleSheet("color: #B71C1C; font-weight: bold;")
             info_label.setWordWrap(True)
             self.branches_layout.addWidget(info_label)
+            
+    def _create_branch_checkbox(self, branch_name):
+        """
+        Cria o checkbox de uma branch que pode ser protegida pelo aplicativo
+        
+        Args:
+            branch_name (str): Nome da branch
+            
+        Returns:
+            QCheckBox: Checkbox desmarcado
+        """
+        checkbox = QCheckBox(branch_name)
+        # Não marcar nenhuma branch como selecionada por padrão
+        checkbox.setChecked(False)
+        checkbox.setStyleSheet("""
+            QCheckBox {
+                color: #333333;
+                font-size: 12px;
+                padding: 4px;
+            }
+            QCheckBox:hover {
+                background-color: #F0F5FF;
+                border-radius: 3px;
+            }
+        """)
+        return checkbox
+        
+    def apply_branch_changes(self, added_branches, removed_branches):
+        """
+        Insere e remove checkboxes das branches alteradas, sem recriar a lista
+        
+        As marcações e o filtro do usuário são preservados. Se a lista estava vazia
+        ou ficaria vazia, ela é recriada por refresh_branches, que exibe as mensagens
+        adequadas.
+        
+        Args:
+            added_branches (list): Nomes das branches novas
+            removed_branches (list): Nomes das branches que deixaram de existir
+        """
+        removed = set(removed_branches)
+        project_branches = [b for b in self.project_branches if b not in removed]
+        project_branches.extend(added_branches)
+        
+        gitlab_protected = self.gitlab_protected_branches
+        added = [b for b in added_branches if b not in gitlab_protected and b not in self.checkboxes]
+        remaining = sum(1 for name in self.checkboxes if name not in removed)
+        if not self.checkboxes or remaining + len(added) == 0:
+            self.refresh_branches(project_branches, gitlab_protected)
+            return
+            
+        self.project_branches = project_branches
+        for branch_name in removed_branches:
+            checkbox = self.checkboxes.pop(branch_name, None)
+            if checkbox is not None:
+                self.branches_layout.removeWidget(checkbox)
+                checkbox.deleteLater()
+                
+        # Os checkboxes seguem a ordem alfabética da listagem do GitLab, seguidos do espaçador final
+        filter_text = self.filter_input.text().lower()
+        for branch_name in added:
+            low, high = 0, len(self.checkboxes)
+            while low < high:
+                middle = (low + high) // 2
+                if self.branches_layout.itemAt(middle).widget().text() < branch_name:
+                    low = middle + 1
+                else:
+                    high = middle
+            checkbox = self._create_branch_checkbox(branch_name)
+            self.checkboxes[branch_name] = checkbox
+            self.branches_layout.insertWidget(low, checkbox)
+            checkbox.setVisible(filter_text in branch_name.lower())
+            
+    def refresh_branches(self, project_branches, gitlab_protected_branches):
+        """
+        Atualiza as branches exibidas preservando as seleções e o filtro do usuário
+        
+        Args:
+            project_branches (list): Lista de todas as branches do projeto
+            gitlab_protected_branches (list): Lista de branches protegidas pelo GitLab
+        """
+        selected_branches = self.get_selected_branches()['protected_by_app']
+        
+        # Descartar os checkboxes antigos antes de recriá-los
+        self.checkboxes.clear()
+        self.gitlab_protected_checkboxes.clear()
+        self.set_branches(project_branches, gitlab_protected_branches)
+        
+        # Restaurar as branches que o usuário já havia marcado
+        for branch_name in selected_branches:
+            checkbox = self.checkboxes.get(branch_name)
+            if checkbox:
+                checkbox.setChecked(True)
+        
+        self._on_filter_changed()
     
     def _clear_layout(self, layout):
         """